@@ -0,0 +1,79 @@
+"""Startup import cost of the bot entrypoint (``python -X importtime``).
+
+Runs the import in a fresh interpreter, like a spawned worker would, and
+reports the total, the slowest modules and which heavy dependencies got
+loaded. ``--max-ms`` turns it into a regression gate::
+
+    python -m benchmarks.import_time --top 15 --max-ms 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+# Dependencies that must stay out of the startup path (imported on first use).
+HEAVY_MODULES = ("cv2", "numpy", "yaml")
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+    timings: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        timings[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def measure_imports(module: str = "bot.main", top: int = 15) -> dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"falha ao importar {module}: {proc.stderr.strip().splitlines()[-1:]}")
+    timings = parse_importtime(proc.stderr)
+    slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": round(timings.get(module, (0, 0))[1] / 1000, 1),
+        "heavy_loaded": [name for name in HEAVY_MODULES if name in timings],
+        "slowest": [(name, round(cumulative / 1000, 1)) for name, (_, cumulative) in slowest],
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de import do entrypoint do bot")
+    parser.add_argument("--module", default="bot.main")
+    parser.add_argument("--top", type=int, default=15, help="módulos mais lentos listados")
+    parser.add_argument("--max-ms", type=float, default=0.0, help="falha (exit 1) acima deste total")
+    parser.add_argument("--output", default="", help="grava o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    report = measure_imports(args.module, args.top)
+    print(f"import {report['module']}: {report['total_ms']:.1f} ms")
+    for name, cumulative_ms in report["slowest"]:
+        print(f"  {cumulative_ms:8.1f} ms  {name}")
+    if report["heavy_loaded"]:
+        print(f"dependências pesadas carregadas no import: {', '.join(report['heavy_loaded'])}")
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+
+    over_budget = args.max_ms and report["total_ms"] > args.max_ms
+    return 1 if over_budget or report["heavy_loaded"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
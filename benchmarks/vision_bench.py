@@ -0,0 +1,186 @@
+"""Vision micro-benchmarks on synthetic, realistic-resolution screens.
+
+Runs offline (only OpenCV/NumPy) and writes a JSON baseline that later runs
+can be compared against::
+
+    python -m benchmarks.vision_bench --output bench/vision_baseline.json
+    python -m benchmarks.vision_bench --compare bench/vision_baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from bot.core.frames import decode_screencap
+from bot.core.vision import Vision, cv2
+from tests.support.mock_images import create_benchmark_fixture, encode_raw_screencap
+
+DEFAULT_RESOLUTIONS = ("720p", "1080p", "1440p")
+
+
+def _parse_resolution(value: str) -> str | tuple[int, int]:
+    if "x" in value:
+        w, h = value.lower().split("x", 1)
+        return int(w), int(h)
+    return value
+
+
+def _time_op(fn: Callable[[], Any], repeats: int, warmup: int = 1) -> dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    samples.sort()
+    return {
+        "n": repeats,
+        "median_ms": round(statistics.median(samples), 4),
+        "p90_ms": round(samples[min(len(samples) - 1, int(0.9 * len(samples)))], 4),
+        "min_ms": round(samples[0], 4),
+    }
+
+
+def _cases(fixture: dict[str, Any]) -> dict[str, Callable[[], Any]]:
+    templates_dir = str(fixture["templates_dir"])
+    screen_path = str(fixture["screen"])
+    frame = cv2.imread(screen_path, cv2.IMREAD_COLOR)
+    present = list(fixture["present"])
+    absent = list(fixture["absent"])
+    every = present + absent
+    hit, miss = present[0], absent[0]
+    png_bytes = Path(screen_path).read_bytes()
+    raw_bytes = encode_raw_screencap(frame)
+
+    plain = Vision(templates_dir, frame_cache_size=0, roi_learning=False, color_prefilter=False)
+    cached = Vision(templates_dir, roi_learning=False, color_prefilter=False)
+    prefilter = Vision(templates_dir, roi_learning=False)
+    parallel = Vision(templates_dir, frame_cache_size=0, roi_learning=False, color_prefilter=False, match_workers=4)
+    fft = Vision(templates_dir, frame_cache_size=0, roi_learning=False, color_prefilter=False, match_backend="fft")
+    learned = Vision(templates_dir)
+    learned.find_best(frame, hit, threshold=0.9)
+    cascade_cfg = {"scale": 0.5, "channels": "gray", "candidates": 3}
+    cascade = Vision(templates_dir, roi_learning=False, templates_cascade={name: cascade_cfg for name in every})
+    for name in every:
+        plain.load_template(name)
+        cached.load_template(name)
+        cascade.load_template(name)
+        prefilter.load_template(name)
+        parallel.load_template(name)
+        fft.find_best(frame, name)
+
+    def wait_for_static() -> None:
+        vision = Vision(templates_dir, roi_learning=False)
+        vision.load_template(miss)
+        try:
+            vision.wait_for(lambda: frame, miss, timeout_s=0.2, interval_s=0.02, threshold=0.9)
+        except Exception:  # noqa: BLE001 - timeout is the expected outcome
+            pass
+
+    return {
+        "decode_png": lambda: cv2.imread(screen_path, cv2.IMREAD_COLOR),
+        "decode_png_bytes": lambda: decode_screencap(png_bytes),
+        "decode_raw": lambda: decode_screencap(raw_bytes),
+        "find_best_file": lambda: plain.find_best(screen_path, hit),
+        "find_best_file_cached": lambda: cached.find_best(screen_path, miss),
+        "find_best_frame": lambda: plain.find_best(frame, hit),
+        "find_best_learned_roi": lambda: learned.find_best(frame, hit, threshold=0.9),
+        "find_best_cascade": lambda: cascade.find_best(frame, hit, threshold=0.9),
+        "find_best_fft": lambda: fft.find_best(frame.copy(), hit),
+        "exists_negative": lambda: plain.exists(frame, miss, threshold=0.9),
+        "exists_negative_prefilter": lambda: prefilter.exists(frame, miss, threshold=0.9),
+        "match_many_all": lambda: plain.match_many(frame, every, threshold=0.9),
+        "match_many_all_parallel": lambda: parallel.match_many(frame, every, threshold=0.9),
+        "match_many_all_fft": lambda: fft.match_many(frame.copy(), every, threshold=0.9),
+        "classify_first_hit": lambda: plain.classify(frame, every, threshold=0.9),
+        "wait_for_static_200ms": wait_for_static,
+    }
+
+
+def run_benchmarks(
+    resolutions: tuple[str | tuple[int, int], ...] = DEFAULT_RESOLUTIONS,
+    templates_count: int = 8,
+    repeats: int = 5,
+    only: Optional[set[str]] = None,
+) -> dict[str, Any]:
+    if cv2 is None:
+        raise RuntimeError("opencv-python é necessário para rodar os benchmarks")
+
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for resolution in resolutions:
+            label = resolution if isinstance(resolution, str) else f"{resolution[0]}x{resolution[1]}"
+            fixture = create_benchmark_fixture(Path(tmp) / label, resolution, templates_count)
+            for case, fn in _cases(fixture).items():
+                if only and case not in only:
+                    continue
+                case_repeats = max(1, repeats // 5) if case.startswith("wait_for") else repeats
+                results[f"{label}/{case}"] = _time_op(fn, case_repeats)
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": getattr(cv2, "__version__", "?"),
+            "templates_count": templates_count,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[tuple[str, float, float, float]]:
+    """Rows of (case, baseline_ms, current_ms, ratio) for cases present in both runs."""
+    rows = []
+    for case, stats in current["results"].items():
+        previous = baseline.get("results", {}).get(case)
+        if not previous or not previous.get("median_ms"):
+            continue
+        ratio = stats["median_ms"] / previous["median_ms"]
+        rows.append((case, previous["median_ms"], stats["median_ms"], ratio))
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks da Vision")
+    parser.add_argument("--resolutions", default=",".join(DEFAULT_RESOLUTIONS), help="ex.: 720p,1080p ou 640x360")
+    parser.add_argument("--templates", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", default="", help="casos separados por vírgula")
+    parser.add_argument("--output", default="", help="grava o resultado em JSON")
+    parser.add_argument("--compare", default="", help="JSON de baseline para comparar")
+    args = parser.parse_args(argv)
+
+    resolutions = tuple(_parse_resolution(item) for item in args.resolutions.split(",") if item)
+    only = {item for item in args.only.split(",") if item} or None
+    report = run_benchmarks(resolutions, args.templates, args.repeats, only)
+
+    for case, stats in report["results"].items():
+        print(f"{case:40s} median={stats['median_ms']:9.3f}ms p90={stats['p90_ms']:9.3f}ms")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"Baseline gravado em {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print("\nComparação com baseline (ratio < 1 = mais rápido):")
+        for case, before, after, ratio in compare(report, baseline):
+            print(f"{case:40s} {before:9.3f}ms -> {after:9.3f}ms  x{ratio:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+"""Throughput of the vision server versus one Vision per worker process.
+
+Every worker process runs ``--requests`` ``match_many`` calls (all fixture
+templates) on a synthetic screen; the report has requests/s and the peak RSS
+of the workers for both models::
+
+    python -m benchmarks.vision_server_bench --workers 4 --requests 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import tempfile
+import time
+from multiprocessing import Process, Queue
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.vision_bench import _parse_resolution
+from bot.core.vision import Vision, cv2
+from bot.core.vision_server import RemoteVision, VisionClient, start_vision_server
+from tests.support.mock_images import create_benchmark_fixture
+
+
+def _worker(
+    templates_dir: str,
+    screen_path: str,
+    names: list[str],
+    requests: int,
+    results: Queue,
+    client: Optional[VisionClient],
+) -> None:
+    kwargs = {"templates_dir": templates_dir, "roi_learning": False, "color_prefilter": False}
+    vision = RemoteVision(client, **kwargs) if client is not None else Vision(**kwargs)
+    frame = cv2.imread(screen_path, cv2.IMREAD_COLOR)
+    vision.match_many(frame, names, threshold=0.9)  # warm-up: template decode / first connection
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        vision.match_many(frame, names, threshold=0.9)
+    elapsed = time.perf_counter() - started
+    results.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def _run_model(fixture: dict[str, Any], workers: int, requests: int, server_mode: bool) -> dict[str, float]:
+    names = list(fixture["present"]) + list(fixture["absent"])
+    server = None
+    if server_mode:
+        kwargs = {"templates_dir": str(fixture["templates_dir"]), "roi_learning": False, "color_prefilter": False}
+        server = start_vision_server(kwargs, workers)
+    results: Queue = Queue()
+    started = time.perf_counter()
+    try:
+        processes = [
+            Process(
+                target=_worker,
+                args=(
+                    str(fixture["templates_dir"]),
+                    str(fixture["screen"]),
+                    names,
+                    requests,
+                    results,
+                    server.client(index) if server is not None else None,
+                ),
+            )
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        samples = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        if server is not None:
+            server.stop()
+    wall = time.perf_counter() - started
+    return {
+        "workers": workers,
+        "requests": workers * requests,
+        "requests_per_s": round(workers * requests / max(elapsed for elapsed, _ in samples), 2),
+        "wall_s": round(wall, 3),
+        "worker_max_rss_kb": max(rss for _, rss in samples),
+    }
+
+
+def run_server_benchmark(
+    workers: int = 4,
+    requests: int = 40,
+    resolution: str | tuple[int, int] = "720p",
+    templates_count: int = 8,
+) -> dict[str, Any]:
+    if cv2 is None:
+        raise RuntimeError("opencv-python é necessário para rodar os benchmarks")
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture = create_benchmark_fixture(Path(tmp), resolution, templates_count)
+        local = _run_model(fixture, workers, requests, server_mode=False)
+        server = _run_model(fixture, workers, requests, server_mode=True)
+    return {
+        "per_process": local,
+        "server": server,
+        "speedup": round(server["requests_per_s"] / local["requests_per_s"], 3) if local["requests_per_s"] else None,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput do vision server vs. Vision por processo")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=40, help="match_many por worker")
+    parser.add_argument("--resolution", default="720p", help="ex.: 720p ou 640x360")
+    parser.add_argument("--templates", type=int, default=8)
+    parser.add_argument("--output", default="", help="grava o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    report = run_server_benchmark(args.workers, args.requests, _parse_resolution(args.resolution), args.templates)
+    for model in ("per_process", "server"):
+        stats = report[model]
+        print(
+            f"{model:12s} {stats['requests_per_s']:9.2f} req/s  wall={stats['wall_s']:.2f}s  "
+            f"rss_worker_max={stats['worker_max_rss_kb']}KB"
+        )
+    print(f"speedup (server / per_process): x{report['speedup']}")
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
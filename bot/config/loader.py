@@ -13,7 +13,7 @@ class BotConfig:
     templates_dir: str = "bot/assets/templates"
     logs_dir: str = "logs"
     templates: dict[str, str] | None = None
-    default_confidence: float = 0.90
+    default_confidence: float = 0.88
     templates_confidence: dict[str, float] | None = None
     chrome_package: str = "com.android.chrome"
     vpn_package: str = "com.vpn.app"
@@ -31,6 +31,49 @@ class BotConfig:
     shutdown_retry_delay_s: float = 0.3
     chrome_activity: str = "com.google.android.apps.chrome.Main"
     bonus_url: str = "https://example.com/bonus"
+    capture_mode: str = "frame"
+    screencap_format: str = "png"
+    frame_stream: bool = False
+    frame_stream_interval_ms: float = 0.0
+    frame_cache_size: int = 4
+    templates_roi: dict[str, list[int]] | None = None
+    roi_padding_px: int = 24
+    roi_learning: bool = True
+    templates_cascade: dict[str, dict[str, Any]] | None = None
+    template_pack: str = ""
+    skip_unchanged_frames: bool = False
+    unchanged_tolerance: float = 6.0
+    snapshot_format: str = "png"
+    artifact_queue_size: int = 32
+    artifact_drop_policy: str = "drop_newest"
+    artifact_flush_timeout_s: float = 5.0
+    template_stats: bool = True
+    multi_scale: bool = False
+    scale_anchor: str = "home.tela_home"
+    scale_sweep: list[float] | None = None
+    scale_store: str = "runtime/device_scales.json"
+    appearance_store: str = "runtime/appearance_history.json"
+    color_prefilter: bool = False
+    prefilter_presence_ratio: float = 0.5
+    prefilter_audit_rate: float = 0.02
+    match_backend: str = "opencv"
+    templates_backend: dict[str, str] | None = None
+    calibrated_thresholds: str = ""
+    template_cache_mb: float = 64.0
+    pinned_templates: list[str] | None = None
+    match_workers: int = 0
+    vision_server: bool = False
+    vision_server_batch_max: int = 8
+    vision_server_batch_window_ms: float = 2.0
+    vision_server_slot_mb: float = 12.0
+    hot_reload: bool = False
+    adb_shell_session: bool = False
+    adb_shell_timeout_s: float = 10.0
+    adb_socket: bool = False
+    adb_server_host: str = "127.0.0.1"
+    adb_server_port: int = 5037
+    adb_pool_size: int = 2
+    reload_interval_s: float = 2.0
 
     @classmethod
     def from_dict(cls, raw: dict[str, Any]) -> "BotConfig":
@@ -39,7 +82,7 @@ class BotConfig:
             templates_dir=raw.get("templates_dir", "bot/assets/templates"),
             logs_dir=raw.get("logs_dir", "logs"),
             templates=raw.get("templates", {}) or {},
-            default_confidence=float(raw.get("default_confidence", 0.90)),
+            default_confidence=float(raw.get("default_confidence", 0.88)),
             templates_confidence=raw.get("templates_confidence", {}) or {},
             chrome_package=raw.get("chrome_package", "com.android.chrome"),
             vpn_package=raw.get("vpn_package", "com.vpn.app"),
@@ -57,6 +100,49 @@ class BotConfig:
             shutdown_retry_delay_s=float(raw.get("shutdown_retry_delay_s", 0.3)),
             chrome_activity=raw.get("chrome_activity", "com.google.android.apps.chrome.Main"),
             bonus_url=raw.get("bonus_url", "https://example.com/bonus"),
+            capture_mode=str(raw.get("capture_mode", "frame")),
+            screencap_format=str(raw.get("screencap_format", "png")),
+            frame_stream=bool(raw.get("frame_stream", False)),
+            frame_stream_interval_ms=float(raw.get("frame_stream_interval_ms", 0.0)),
+            frame_cache_size=int(raw.get("frame_cache_size", 4)),
+            templates_roi=raw.get("templates_roi", {}) or {},
+            roi_padding_px=int(raw.get("roi_padding_px", 24)),
+            roi_learning=bool(raw.get("roi_learning", True)),
+            templates_cascade=raw.get("templates_cascade", {}) or {},
+            template_pack=str(raw.get("template_pack", "") or ""),
+            skip_unchanged_frames=bool(raw.get("skip_unchanged_frames", False)),
+            unchanged_tolerance=float(raw.get("unchanged_tolerance", 6.0)),
+            snapshot_format=str(raw.get("snapshot_format", "png")),
+            artifact_queue_size=int(raw.get("artifact_queue_size", 32)),
+            artifact_drop_policy=str(raw.get("artifact_drop_policy", "drop_newest")),
+            artifact_flush_timeout_s=float(raw.get("artifact_flush_timeout_s", 5.0)),
+            template_stats=bool(raw.get("template_stats", True)),
+            multi_scale=bool(raw.get("multi_scale", False)),
+            scale_anchor=str(raw.get("scale_anchor", "home.tela_home")),
+            scale_sweep=[float(s) for s in raw.get("scale_sweep") or []] or None,
+            scale_store=str(raw.get("scale_store", "runtime/device_scales.json")),
+            appearance_store=str(raw.get("appearance_store", "runtime/appearance_history.json") or ""),
+            color_prefilter=bool(raw.get("color_prefilter", False)),
+            prefilter_presence_ratio=float(raw.get("prefilter_presence_ratio", 0.5)),
+            prefilter_audit_rate=float(raw.get("prefilter_audit_rate", 0.02)),
+            match_backend=str(raw.get("match_backend", "opencv")),
+            templates_backend=raw.get("templates_backend", {}) or {},
+            calibrated_thresholds=str(raw.get("calibrated_thresholds", "") or ""),
+            template_cache_mb=float(raw.get("template_cache_mb", 64.0)),
+            pinned_templates=[str(name) for name in raw.get("pinned_templates") or []] or None,
+            match_workers=int(raw.get("match_workers", 0)),
+            vision_server=bool(raw.get("vision_server", False)),
+            vision_server_batch_max=int(raw.get("vision_server_batch_max", 8)),
+            vision_server_batch_window_ms=float(raw.get("vision_server_batch_window_ms", 2.0)),
+            vision_server_slot_mb=float(raw.get("vision_server_slot_mb", 12.0)),
+            hot_reload=bool(raw.get("hot_reload", False)),
+            adb_shell_session=bool(raw.get("adb_shell_session", False)),
+            adb_shell_timeout_s=float(raw.get("adb_shell_timeout_s", 10.0)),
+            adb_socket=bool(raw.get("adb_socket", False)),
+            adb_server_host=str(raw.get("adb_server_host", "127.0.0.1")),
+            adb_server_port=int(raw.get("adb_server_port", 5037)),
+            adb_pool_size=int(raw.get("adb_pool_size", 2)),
+            reload_interval_s=float(raw.get("reload_interval_s", 2.0)),
         )
 
 
@@ -3,11 +3,155 @@
 from __future__ import annotations
 
 import subprocess
-from dataclasses import dataclass
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Iterator
 
 from bot.core.exceptions import CriticalFail
 from bot.core.adb_interface import IAdb
+from bot.core.frames import decode_screencap
+
+# ``exec-out`` commands per ``screencap_format``; raw skips PNG encode/decode.
+SCREENCAP_COMMANDS = {
+    "png": "screencap -p",
+    "raw": "screencap",
+    "raw_gzip": "screencap | gzip -1",
+}
+
+
+@dataclass(slots=True)
+class CommandResult:
+    command: str
+    status: int
+    output: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 0
+
+
+class CommandBatch:
+    """Shell commands queued inside ``ADBClient.batch()``.
+
+    The methods mirror ``ADBClient``'s shell commands; on exit the whole list
+    runs as one shell invocation and ``results`` holds one
+    :class:`CommandResult` per command, in order. Each command's stderr is
+    merged into its output. A failing command does not stop the ones after it
+    unless ``stop_on_error`` is set; the commands it skips are reported with
+    status -1.
+    """
+
+    SKIPPED = "skipped: an earlier command in the batch failed"
+
+    def __init__(self, stop_on_error: bool = False) -> None:
+        self.stop_on_error = stop_on_error
+        self.commands: list[str] = []
+        self.results: list[CommandResult] = []
+
+    def add(self, *args: str) -> None:
+        self.commands.append(" ".join(args))
+
+    def tap(self, x: int, y: int) -> None:
+        self.add("input", "tap", str(x), str(y))
+
+    def keyevent(self, keycode: int) -> None:
+        self.add("input", "keyevent", str(keycode))
+
+    def start_app(self, package: str, activity: str) -> None:
+        self.add("am", "start", "-n", f"{package}/{activity}")
+
+    def stop_app(self, package: str) -> None:
+        self.add("am", "force-stop", package)
+
+    def input_text(self, text: str) -> None:
+        self.add("input", "text", text.replace(" ", "%s"))
+
+    def open_url(self, url: str) -> None:
+        self.add("am", "start", "-a", "android.intent.action.VIEW", "-d", url)
+
+    def raise_for_status(self) -> None:
+        """Raise ``CriticalFail`` for the first command that did not exit 0."""
+        for result in self.results:
+            if not result.ok:
+                raise CriticalFail(f"ADB command failed ({result.status}): {result.command}\n{result.output}")
+
+    def script(self, marker: str) -> str:
+        """One shell line running every command, each followed by ``<marker> <index> <status>``."""
+        steps = [
+            f'{command} 2>&1; __rc=$?; echo; echo "{marker} {index} $__rc";' for index, command in enumerate(self.commands)
+        ]
+        if not self.stop_on_error:
+            return " ".join(steps)
+        # ``__ok`` turns non-zero at the first failure and guards the rest.
+        return "__ok=0; " + " ".join(f'if [ "$__ok" = 0 ]; then {step} __ok=$__rc; fi;' for step in steps)
+
+    def parse(self, output: str, marker: str) -> list[CommandResult]:
+        results: list[CommandResult] = []
+        lines: list[str] = []
+        for line in output.replace("\r\n", "\n").split("\n"):
+            if not line.startswith(marker):
+                lines.append(line)
+                continue
+            index, _, status = line[len(marker) :].strip().partition(" ")
+            text = "\n".join(lines).rstrip("\n")
+            results.append(CommandResult(self.commands[int(index)], int(status or -1), text))
+            lines = []
+        if self.stop_on_error and results and not results[-1].ok:
+            results.extend(CommandResult(command, -1, self.SKIPPED) for command in self.commands[len(results) :])
+        if len(results) != len(self.commands):
+            raise CriticalFail(f"ADB batch reported {len(results)} of {len(self.commands)} commands\n{output}")
+        return results
+
+
+class SequentialBatch(CommandBatch):
+    """``CommandBatch`` for clients without ``batch()``: runs each call right away."""
+
+    def __init__(self, adb: Any, stop_on_error: bool = False) -> None:
+        super().__init__(stop_on_error)
+        self._adb = adb
+
+    def _call(self, name: str, *args: Any) -> None:
+        command = " ".join([name, *map(str, args)])
+        if self.stop_on_error and any(not result.ok for result in self.results):
+            self.results.append(CommandResult(command, -1, self.SKIPPED))
+            return
+        try:
+            getattr(self._adb, name)(*args)
+        except Exception as exc:  # noqa: BLE001 - reported per command, like a real batch
+            self.results.append(CommandResult(command, -1, str(exc)))
+        else:
+            self.results.append(CommandResult(command, 0))
+
+    def tap(self, x: int, y: int) -> None:
+        self._call("tap", x, y)
+
+    def keyevent(self, keycode: int) -> None:
+        self._call("keyevent", keycode)
+
+    def start_app(self, package: str, activity: str) -> None:
+        self._call("start_app", package, activity)
+
+    def stop_app(self, package: str) -> None:
+        self._call("stop_app", package)
+
+    def input_text(self, text: str) -> None:
+        self._call("input_text", text)
+
+    def open_url(self, url: str) -> None:
+        self._call("open_url", url)
+
+
+@contextmanager
+def adb_batch(adb: Any, stop_on_error: bool = False) -> Iterator[CommandBatch]:
+    """``adb.batch()`` when the client has one, otherwise a :class:`SequentialBatch`."""
+    batch = getattr(adb, "batch", None)
+    if callable(batch):
+        with batch(stop_on_error=stop_on_error) as commands:
+            yield commands
+    else:
+        yield SequentialBatch(adb, stop_on_error)
 
 
 @dataclass(slots=True)
@@ -16,6 +160,8 @@ class ADBClient(IAdb):
 
     serial: str
     adb_bin: str = "adb"
+    screencap_format: str = "png"
+    _batch_marker: str = field(default_factory=lambda: f"__BOT_BATCH_{uuid.uuid4().hex}__", init=False, repr=False)
 
     def _run_text(self, *args: str, timeout: int = 30) -> subprocess.CompletedProcess[str]:
         cmd = [self.adb_bin, "-s", self.serial, *args]
@@ -50,6 +196,24 @@ class ADBClient(IAdb):
     def connect(self) -> None:
         self._run_text("wait-for-device")
 
+    def _run_script(self, script: str) -> str:
+        """Output of ``script`` run by one device shell (its own exit status is not checked)."""
+        return self._run_text("shell", script).stdout
+
+    @contextmanager
+    def batch(self, stop_on_error: bool = False) -> Iterator[CommandBatch]:
+        """Queue commands and run them in a single shell when the block exits.
+
+        Per-command exit statuses end up in ``batch.results``; nothing runs if
+        the block raises. With ``stop_on_error`` the commands after the first
+        failure are skipped.
+        """
+        commands = CommandBatch(stop_on_error)
+        yield commands
+        if commands.commands:
+            output = self._run_script(commands.script(self._batch_marker))
+            commands.results = commands.parse(output, self._batch_marker)
+
     def tap(self, x: int, y: int) -> None:
         self._run_text("shell", "input", "tap", str(x), str(y))
 
@@ -79,3 +243,14 @@ class ADBClient(IAdb):
         raw = self._run_bytes("exec-out", "screencap", "-p", timeout=60)
         destination.write_bytes(raw.stdout)
         return destination
+
+    def _frame_command(self) -> str:
+        try:
+            return SCREENCAP_COMMANDS[self.screencap_format]
+        except KeyError:
+            raise CriticalFail(f"Unknown screencap_format: {self.screencap_format}") from None
+
+    def capture_frame(self):
+        """Capture the screen straight into a decoded BGR array (no file round trip)."""
+        raw = self._run_bytes("exec-out", self._frame_command(), timeout=60)
+        return decode_screencap(raw.stdout)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Protocol
+from typing import Any, Protocol
 
 
 class IAdb(Protocol):
@@ -24,3 +24,5 @@ class IAdb(Protocol):
     def open_url(self, url: str) -> None: ...
 
     def screencap(self, output_path: str) -> Path: ...
+
+    def capture_frame(self) -> Any: ...
@@ -0,0 +1,185 @@
+"""ADB client that keeps one ``adb shell`` open per device.
+
+``ADBClient`` forks ``adb -s <serial> shell ...`` for every tap; here input
+and ``am`` commands are written to a long-lived shell instead. Each command is
+followed by an ``echo`` of a unique marker carrying its exit status, so the
+output of consecutive commands can be told apart on the shared stdout.
+Screen captures keep using ``exec-out`` (binary output does not survive the
+line-based protocol).
+"""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from bot.core.adb import ADBClient
+from bot.core.exceptions import CriticalFail
+
+
+class ShellSession:
+    """A shell process multiplexing commands through sentinel-delimited output.
+
+    The session is (re)spawned on demand: after the process dies, or after a
+    timeout left unread output behind, the next ``run`` starts a fresh one.
+    """
+
+    def __init__(self, argv: list[str], timeout_s: float = 10.0) -> None:
+        self.argv = list(argv)
+        self.timeout_s = float(timeout_s)
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen[bytes]] = None
+        self._lines: Optional[queue.Queue[Optional[bytes]]] = None
+        self._token = uuid.uuid4().hex
+        self._sequence = itertools.count(1)
+        self.counters = {"commands": 0, "spawns": 0, "respawns": 0, "timeouts": 0}
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _spawn(self) -> None:
+        self._kill()
+        if self.counters["spawns"]:
+            self.counters["respawns"] += 1
+        process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        lines: queue.Queue[Optional[bytes]] = queue.Queue()
+        threading.Thread(target=self._pump, args=(process, lines), name="adb-shell-reader", daemon=True).start()
+        self._process, self._lines = process, lines
+        self.counters["spawns"] += 1
+        # Error messages of the commands belong to their output.
+        self._write(b"exec 2>&1\n")
+
+    @staticmethod
+    def _pump(process: subprocess.Popen[bytes], lines: queue.Queue[Optional[bytes]]) -> None:
+        for line in iter(process.stdout.readline, b""):
+            lines.put(line)
+        lines.put(None)
+
+    def _write(self, data: bytes) -> None:
+        self._process.stdin.write(data)
+        self._process.stdin.flush()
+
+    def run(self, command: str, timeout: Optional[float] = None) -> tuple[int, str]:
+        """Run ``command`` in the session; returns ``(exit status, output)``."""
+        timeout = self.timeout_s if timeout is None else float(timeout)
+        with self._lock:
+            if not self.alive:
+                self._spawn()
+            marker = f"__BOT_{self._token}_{next(self._sequence)}__"
+            # The extra ``echo`` ends output that lacks a trailing newline;
+            # trailing newlines are not part of the returned output.
+            framed = f'{command}\n__rc=$?; echo; echo "{marker} $__rc"\n'.encode()
+            try:
+                self._write(framed)
+            except (BrokenPipeError, OSError):
+                # Nothing was delivered, so replaying on a fresh shell is safe.
+                self._spawn()
+                self._write(framed)
+            self.counters["commands"] += 1
+            return self._read_until(marker, command, timeout)
+
+    def _read_until(self, marker: str, command: str, timeout: float) -> tuple[int, str]:
+        deadline = time.monotonic() + timeout
+        prefix = marker.encode()
+        output: list[bytes] = []
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._lines.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                # Output of this command could still arrive and be taken for
+                # the next one's: drop the session instead of reusing it.
+                self.counters["timeouts"] += 1
+                self._kill()
+                raise CriticalFail(f"ADB shell timeout ({timeout:.1f}s): {command}") from None
+            if line is None:
+                self._kill()
+                raise CriticalFail(f"ADB shell session ended during: {command}")
+            if line.startswith(prefix):
+                status = int(line[len(prefix) :].strip() or -1)
+                return status, b"".join(output).decode(errors="replace").rstrip("\n")
+            output.append(line)
+
+    def _kill(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        if process.poll() is None:
+            process.kill()
+        process.wait(timeout=5)
+
+    def close(self) -> None:
+        with self._lock:
+            self._kill()
+
+
+@dataclass(slots=True)
+class ShellADBClient(ADBClient):
+    """``ADBClient`` sending shell commands through one persistent ``adb shell``.
+
+    ``shell_argv`` replaces the ``adb -s <serial> shell`` command line (tests
+    use a local ``/bin/sh``).
+    """
+
+    shell_timeout_s: float = 10.0
+    shell_argv: Optional[list[str]] = None
+    _session: Optional[ShellSession] = field(default=None, init=False, repr=False)
+
+    @property
+    def session(self) -> ShellSession:
+        if self._session is None:
+            argv = self.shell_argv or [self.adb_bin, "-s", self.serial, "shell"]
+            self._session = ShellSession(argv, self.shell_timeout_s)
+        return self._session
+
+    def _shell(self, *args: str, timeout: Optional[float] = None) -> str:
+        # ``adb shell a b c`` also joins its arguments with spaces.
+        command = " ".join(args)
+        status, output = self.session.run(command, timeout)
+        if status != 0:
+            raise CriticalFail(f"ADB shell command failed ({status}): {command}\n{output}")
+        return output
+
+    def tap(self, x: int, y: int) -> None:
+        self._shell("input", "tap", str(x), str(y))
+
+    def keyevent(self, keycode: int) -> None:
+        self._shell("input", "keyevent", str(keycode))
+
+    def start_app(self, package: str, activity: str) -> None:
+        self._shell("am", "start", "-n", f"{package}/{activity}")
+
+    def stop_app(self, package: str) -> None:
+        self._shell("am", "force-stop", package)
+
+    def input_text(self, text: str) -> None:
+        self._shell("input", "text", text.replace(" ", "%s"))
+
+    def open_url(self, url: str) -> None:
+        self._shell("am", "start", "-a", "android.intent.action.VIEW", "-d", url)
+
+    def _run_script(self, script: str) -> str:
+        return self.session.run(script)[1]
+
+    def shell_stats(self) -> dict[str, int]:
+        return dict(self._session.counters) if self._session is not None else {}
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,282 @@
+"""ADB client speaking the adb server's host protocol over TCP (no ``adb`` process).
+
+Every request is a 4-hex-digit length plus an ASCII payload; the server
+answers ``OKAY`` or ``FAIL`` followed by a length-prefixed message. A
+connection is first bound to a device with ``host:transport:<serial>`` and
+then consumed by exactly one service (``shell:<cmd>`` / ``exec:<cmd>``),
+whose output streams until the server closes the socket.
+
+Because a service consumes its connection, the pool keeps connections that
+are already bound to the device and refills itself in the background: a tap
+costs one request/response on an open socket instead of fork/exec of
+``adb`` plus the client/server handshake.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from bot.core.adb import ADBClient
+from bot.core.exceptions import CriticalFail
+from bot.core.frames import decode_screencap
+
+DEFAULT_ADB_PORT = 5037
+_RECV_CHUNK = 256 * 1024
+
+
+def encode_request(payload: str) -> bytes:
+    data = payload.encode()
+    return f"{len(data):04x}".encode() + data
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if not count:
+            raise ConnectionError("adb server closed the connection")
+        received += count
+    return bytes(buffer)
+
+
+def read_status(sock: socket.socket, request: str) -> None:
+    """Consume an ``OKAY``; raise ``CriticalFail`` with the server's message on ``FAIL``."""
+    status = _recv_exact(sock, 4)
+    if status == b"OKAY":
+        return
+    if status == b"FAIL":
+        length = int(_recv_exact(sock, 4), 16)
+        message = _recv_exact(sock, length).decode(errors="replace")
+        raise CriticalFail(f"ADB server refused '{request}': {message}")
+    raise ConnectionError(f"unexpected adb server reply {status!r} to '{request}'")
+
+
+def read_stream(sock: socket.socket) -> bytearray:
+    """Everything the service writes until the server closes the socket."""
+    buffer = bytearray(_RECV_CHUNK)
+    size = 0
+    while True:
+        if size == len(buffer):
+            buffer.extend(bytes(len(buffer)))
+        count = sock.recv_into(memoryview(buffer)[size:])
+        if not count:
+            del buffer[size:]
+            return buffer
+        size += count
+
+
+class AdbConnectionPool:
+    """Connections to the adb server already bound to one device's transport."""
+
+    def __init__(
+        self,
+        serial: str,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_ADB_PORT,
+        size: int = 2,
+        timeout_s: float = 10.0,
+    ) -> None:
+        self.serial = serial
+        self.host = host
+        self.port = int(port)
+        self.size = max(0, int(size))
+        self.timeout_s = float(timeout_s)
+        self._idle: deque[socket.socket] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._refiller: Optional[threading.Thread] = None
+        self.counters = {"opened": 0, "pooled_hits": 0, "stale": 0}
+
+    def open_host(self) -> socket.socket:
+        """A raw connection to the adb server (no transport selected)."""
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout_s)
+        except OSError as exc:
+            raise CriticalFail(f"ADB server unreachable at {self.host}:{self.port} ({exc})") from exc
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _open_transport(self) -> socket.socket:
+        sock = self.open_host()
+        request = f"host:transport:{self.serial}"
+        try:
+            sock.sendall(encode_request(request))
+            read_status(sock, request)
+        except (OSError, CriticalFail):
+            sock.close()
+            raise
+        with self._cond:
+            self.counters["opened"] += 1
+        return sock
+
+    def _take(self) -> tuple[socket.socket, bool]:
+        with self._cond:
+            if self._idle:
+                self.counters["pooled_hits"] += 1
+                sock = self._idle.popleft()
+                self._cond.notify_all()
+                return sock, True
+        self._ensure_refiller()
+        return self._open_transport(), False
+
+    def _ensure_refiller(self) -> None:
+        with self._cond:
+            if self.size and self._refiller is None and not self._closed:
+                self._refiller = threading.Thread(target=self._refill, name=f"adb-pool-{self.serial}", daemon=True)
+                self._refiller.start()
+
+    def _refill(self) -> None:
+        backoff_s = 0.0
+        while True:
+            with self._cond:
+                while not self._closed and len(self._idle) >= self.size:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            if backoff_s:
+                time.sleep(backoff_s)
+            try:
+                sock = self._open_transport()
+            except (OSError, CriticalFail):
+                # Device offline/unknown: requests will report it; retry slowly.
+                backoff_s = min(2.0, max(0.1, backoff_s * 2))
+                continue
+            backoff_s = 0.0
+            with self._cond:
+                if self._closed:
+                    sock.close()
+                    return
+                self._idle.append(sock)
+
+    def service(self, request: str) -> bytearray:
+        """Run one device service (``shell:...``/``exec:...``) and return its output."""
+        sock, pooled = self._take()
+        try:
+            try:
+                sock.sendall(encode_request(request))
+                read_status(sock, request)
+            except (OSError, ConnectionError):
+                if not pooled:
+                    raise
+                # The server dropped an idle connection (device reconnect, ...);
+                # the request was not accepted, so it is safe to resend it.
+                sock.close()
+                with self._cond:
+                    self.counters["stale"] += 1
+                sock = self._open_transport()
+                sock.sendall(encode_request(request))
+                read_status(sock, request)
+            return read_stream(sock)
+        except socket.timeout as exc:
+            raise CriticalFail(f"ADB service timeout ({self.timeout_s:.1f}s): {request}") from exc
+        except OSError as exc:
+            raise CriticalFail(f"ADB service failed: {request} ({exc})") from exc
+        finally:
+            sock.close()
+            self._ensure_refiller()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.popleft().close()
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {**self.counters, "idle": len(self._idle)}
+
+
+@dataclass(slots=True)
+class SocketADBClient(ADBClient):
+    """``ADBClient`` talking to the adb server socket instead of running ``adb``.
+
+    Shell commands report their exit status through a trailing marker line
+    (the legacy ``shell:`` service has no status channel), so failures still
+    raise ``CriticalFail`` like the subprocess client.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = DEFAULT_ADB_PORT
+    pool_size: int = 2
+    timeout_s: float = 10.0
+    _pool: Optional[AdbConnectionPool] = field(default=None, init=False, repr=False)
+    _marker: str = field(default_factory=lambda: f"__BOT_RC_{uuid.uuid4().hex}__", init=False, repr=False)
+
+    @property
+    def pool(self) -> AdbConnectionPool:
+        if self._pool is None:
+            self._pool = AdbConnectionPool(self.serial, self.host, self.port, self.pool_size, self.timeout_s)
+        return self._pool
+
+    def connect(self) -> None:
+        request = f"host-serial:{self.serial}:wait-for-any-device"
+        sock = self.pool.open_host()
+        try:
+            sock.sendall(encode_request(request))
+            read_status(sock, request)  # request accepted
+            read_status(sock, request)  # device online
+        except OSError as exc:
+            raise CriticalFail(f"ADB wait-for-device failed for {self.serial} ({exc})") from exc
+        finally:
+            sock.close()
+
+    def _shell(self, *args: str) -> str:
+        # ``adb shell a b c`` also joins its arguments with spaces.
+        command = " ".join(args)
+        raw = self.pool.service(f'shell:{command}; __rc=$?; echo; echo "{self._marker} $__rc"')
+        text = raw.decode(errors="replace").replace("\r\n", "\n").rstrip("\n")
+        output, _, status_line = text.rpartition("\n")
+        if not status_line.startswith(self._marker):
+            raise CriticalFail(f"ADB shell output without exit status: {command}\n{text}")
+        status = int(status_line[len(self._marker) :].strip() or -1)
+        if status != 0:
+            raise CriticalFail(f"ADB command failed ({status}): {command}\n{output}")
+        return output.rstrip("\n")
+
+    def tap(self, x: int, y: int) -> None:
+        self._shell("input", "tap", str(x), str(y))
+
+    def keyevent(self, keycode: int) -> None:
+        self._shell("input", "keyevent", str(keycode))
+
+    def start_app(self, package: str, activity: str) -> None:
+        self._shell("am", "start", "-n", f"{package}/{activity}")
+
+    def stop_app(self, package: str) -> None:
+        self._shell("am", "force-stop", package)
+
+    def input_text(self, text: str) -> None:
+        self._shell("input", "text", text.replace(" ", "%s"))
+
+    def open_url(self, url: str) -> None:
+        self._shell("am", "start", "-a", "android.intent.action.VIEW", "-d", url)
+
+    def _run_script(self, script: str) -> str:
+        return self.pool.service(f"shell:{script}").decode(errors="replace")
+
+    def screencap(self, output_path: str) -> Path:
+        destination = Path(output_path)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(self.pool.service("exec:screencap -p"))
+        return destination
+
+    def capture_frame(self):
+        """Capture the screen straight into a decoded BGR array (no file round trip)."""
+        return decode_screencap(self.pool.service(f"exec:{self._frame_command()}"))
+
+    def pool_stats(self) -> dict[str, int]:
+        return self.pool.stats()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
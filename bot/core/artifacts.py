@@ -0,0 +1,144 @@
+"""Per-process background writer for debug boxes, failure snapshots and screenshots."""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from bot.core.lazy_import import LazyModule
+
+cv2 = LazyModule("cv2")
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+
+class ArtifactWriter:
+    """Bounded queue plus one worker thread that encodes and writes frames.
+
+    ``submit`` never blocks the caller: when the queue is full the artifact is
+    dropped according to ``drop_policy`` (``drop_newest`` rejects the incoming
+    one, ``drop_oldest`` discards the oldest pending one). ``render`` callbacks
+    run on the worker against a private copy of the frame, so callers can pass
+    shared (cached) frames. ``on_done(path, error)`` reports the outcome of an
+    accepted artifact: ``error`` is ``None`` once written, or the exception
+    that failed or dropped it.
+    """
+
+    def __init__(self, max_queue: int = 32, drop_policy: str = DROP_NEWEST) -> None:
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"drop_policy inválida: {drop_policy}")
+        self.drop_policy = drop_policy
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._lock = threading.Lock()
+        self._counters = {"written": 0, "dropped": 0, "failed": 0}
+        self._thread = threading.Thread(target=self._worker, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        path: str | Path,
+        frame: Any,
+        render: Optional[Callable[[Any], Any]] = None,
+        on_done: Optional[Callable[[Path, Optional[Exception]], None]] = None,
+    ) -> bool:
+        item = (Path(path), frame, render, on_done)
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        if self.drop_policy == DROP_OLDEST:
+            try:
+                evicted = self._queue.get_nowait()
+                self._queue.task_done()
+                self._count("dropped")
+                self._notify(evicted[0], evicted[3], RuntimeError("descartado: fila de artefatos cheia"))
+                self._queue.put_nowait(item)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+        self._count("dropped")
+        return False
+
+    def flush(self, timeout_s: float = 5.0) -> bool:
+        """Wait until every queued artifact is written (or ``timeout_s`` expires)."""
+        deadline = time.monotonic() + timeout_s
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._counters, "pending": self._queue.qsize()}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    @staticmethod
+    def _notify(
+        path: Path, on_done: Optional[Callable[[Path, Optional[Exception]], None]], error: Optional[Exception]
+    ) -> None:
+        if on_done is None:
+            return
+        try:
+            on_done(path, error)
+        except Exception as exc:  # noqa: BLE001 - a callback must not stop the worker
+            logging.getLogger(__name__).warning("Callback de artefato falhou para %s: %s", path, exc)
+
+    def _worker(self) -> None:
+        while True:
+            path, frame, render, on_done = self._queue.get()
+            try:
+                self._write(path, frame, render)
+                self._count("written")
+                self._notify(path, on_done, None)
+            except Exception as exc:  # noqa: BLE001 - artifacts are best effort
+                self._count("failed")
+                logging.getLogger(__name__).warning("Falha ao gravar artefato %s: %s", path, exc)
+                self._notify(path, on_done, exc)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(path: Path, frame: Any, render: Optional[Callable[[Any], Any]]) -> None:
+        if not cv2:
+            raise RuntimeError("opencv-python is required to write artifacts")
+        image = render(frame.copy()) if render is not None else frame
+        path.parent.mkdir(parents=True, exist_ok=True)
+        params = [cv2.IMWRITE_WEBP_QUALITY, 90] if path.suffix.lower() == ".webp" else []
+        if not cv2.imwrite(str(path), image, params):
+            raise RuntimeError(f"cv2.imwrite não gravou {path}")
+
+
+_writer: Optional[ArtifactWriter] = None
+_writer_pid: Optional[int] = None
+_writer_lock = threading.Lock()
+
+
+def get_artifact_writer(max_queue: int = 32, drop_policy: str = DROP_NEWEST) -> ArtifactWriter:
+    """Return this process' writer, creating it on first use (settings apply then)."""
+    global _writer, _writer_pid
+    with _writer_lock:
+        if _writer is None or _writer_pid != os.getpid():
+            _writer = ArtifactWriter(max_queue=max_queue, drop_policy=drop_policy)
+            _writer_pid = os.getpid()
+        return _writer
+
+
+def flush_artifacts(timeout_s: float = 5.0) -> bool:
+    """Flush this process' writer if one was ever started; ``True`` when nothing is pending."""
+    with _writer_lock:
+        writer = _writer if _writer_pid == os.getpid() else None
+    return writer.flush(timeout_s) if writer is not None else True
@@ -0,0 +1,192 @@
+"""Offline threshold calibration over a corpus of labelled screenshots.
+
+The corpus is described by one or more label files mapping screenshots (or
+glob patterns, relative to the label file) to the templates present on them;
+every other template counts as absent::
+
+    good/home_01.png: [home.tela_home, home.botao_home]
+    "../../logs/snapshots/**/*step_04*.png": [amigos.tela_amigos]
+
+Run it with::
+
+    python -m bot.core.calibration --labels calib/labels.yaml --output runtime/calibrated_thresholds.yaml
+
+The output holds ``templates_confidence`` (suggested thresholds) plus the
+per-template score distributions behind them; point ``calibrated_thresholds``
+in ``bot.yaml`` at it to apply the thresholds at runtime.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import logging
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from bot.core.exceptions import SoftFail
+from bot.core.vision import Vision
+
+
+def load_labels(labels_path: str | Path) -> list[tuple[Path, set[str]]]:
+    """Expand a label file into ``(screenshot, present templates)`` samples."""
+    from bot.config.loader import load_yaml
+
+    labels_path = Path(labels_path)
+    samples: list[tuple[Path, set[str]]] = []
+    for pattern, present in load_yaml(labels_path).items():
+        full = Path(pattern) if Path(pattern).is_absolute() else labels_path.parent / pattern
+        matches = sorted(glob.glob(str(full), recursive=True)) if glob.has_magic(str(pattern)) else [str(full)]
+        for match in matches:
+            samples.append((Path(match), set(present or [])))
+    return samples
+
+
+def suggest_threshold(
+    present: list[float],
+    absent: list[float],
+    floor: float = 0.75,
+    ceiling: float = 0.99,
+) -> Optional[dict[str, Any]]:
+    """Threshold separating present from absent scores.
+
+    ``None`` without both positive and negative samples: with only "present"
+    scores nothing says how low the threshold can go without false positives,
+    so such templates are left uncalibrated.
+
+    Separable distributions get the midpoint of the gap (``margin`` is half of
+    it). Overlapping ones get the threshold with the fewest misclassified
+    samples; ties go to fewer missed appearances, then to the highest value.
+    Their ``margin`` is negative.
+    """
+    if not present or not absent:
+        return None
+    present_min = min(present)
+    absent_max = max(absent)
+    if present_min > absent_max:
+        margin = (present_min - absent_max) / 2.0
+        threshold = absent_max + margin
+    else:
+        def cost(t: float) -> tuple[int, int, float]:
+            missed = sum(s < t for s in present)
+            return missed + sum(s >= t for s in absent), missed, -t
+
+        threshold = min(sorted(set(present) | {value + 1e-3 for value in absent}), key=cost)
+        margin = (present_min - absent_max) / 2.0
+
+    return {
+        "threshold": round(min(ceiling, max(floor, threshold)), 3),
+        "margin": round(margin, 3),
+        "present_min": round(present_min, 4),
+        "absent_max": round(absent_max, 4),
+        "present": len(present),
+        "absent": len(absent),
+        "overlap": present_min <= absent_max,
+    }
+
+
+def score_corpus(
+    vision: Vision,
+    samples: Iterable[tuple[Path, set[str]]],
+    template_ids: list[str],
+) -> dict[str, dict[str, list[float]]]:
+    """Best score of every template on every screenshot, split by label."""
+    scores = {name: {"present": [], "absent": []} for name in template_ids}
+    for screen, present in samples:
+        try:
+            matches = vision.match_many(str(screen), template_ids, threshold=1.0)
+        except SoftFail as exc:
+            logging.getLogger(__name__).warning("Ignorando %s: %s", screen, exc)
+            continue
+        for name, result in matches.results.items():
+            scores[name]["present" if name in present else "absent"].append(float(result["score"]))
+    return scores
+
+
+def calibrate(
+    vision: Vision,
+    samples: list[tuple[Path, set[str]]],
+    template_ids: Optional[list[str]] = None,
+    floor: float = 0.75,
+) -> dict[str, Any]:
+    """Score the corpus and return suggested thresholds plus their distributions.
+
+    Templates lacking present or absent samples are listed under ``uncalibrated``.
+    """
+    if template_ids is None:
+        template_ids = sorted({name for _, present in samples for name in present})
+    scores = score_corpus(vision, samples, template_ids)
+    calibration: dict[str, Any] = {}
+    uncalibrated: list[str] = []
+    for name in template_ids:
+        suggestion = suggest_threshold(scores[name]["present"], scores[name]["absent"], floor=floor)
+        if suggestion is None:
+            uncalibrated.append(name)
+        else:
+            calibration[name] = suggestion
+    return {
+        "templates_confidence": {name: entry["threshold"] for name, entry in calibration.items()},
+        "calibration": calibration,
+        "uncalibrated": uncalibrated,
+        "screens": len(samples),
+    }
+
+
+def write_thresholds(report: dict[str, Any], output_path: str | Path) -> Path:
+    import yaml
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(yaml.safe_dump(report, sort_keys=True, allow_unicode=True), encoding="utf-8")
+    return output_path
+
+
+def load_calibrated_thresholds(path: str | Path) -> dict[str, float]:
+    """``templates_confidence`` of a calibration output; empty when the file is missing."""
+    from bot.config.loader import load_yaml
+
+    if not path or not Path(path).exists():
+        return {}
+    raw = load_yaml(path).get("templates_confidence") or {}
+    return {str(name): float(value) for name, value in raw.items()}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from bot.config.loader import load_bot_config
+
+    parser = argparse.ArgumentParser(description="Calibra thresholds dos templates a partir de screenshots rotulados")
+    parser.add_argument("--bot-config", default="bot/config/bot.yaml")
+    parser.add_argument("--labels", action="append", required=True, help="YAML screenshot/glob -> templates presentes")
+    parser.add_argument("--templates", default="", help="IDs separados por vírgula (padrão: os rotulados)")
+    parser.add_argument("--floor", type=float, default=0.75, help="Threshold mínimo sugerido")
+    parser.add_argument("--output", default="runtime/calibrated_thresholds.yaml")
+    args = parser.parse_args(argv)
+
+    bot_config = load_bot_config(args.bot_config)
+    vision = Vision(
+        bot_config.templates_dir,
+        template_map=bot_config.templates or {},
+        frame_cache_size=0,
+        roi_learning=False,
+        color_prefilter=False,
+        template_stats=False,
+    )
+    samples = [sample for labels in args.labels for sample in load_labels(labels)]
+    template_ids = [item for item in args.templates.split(",") if item] or None
+    report = calibrate(vision, samples, template_ids, floor=args.floor)
+    output = write_thresholds(report, args.output)
+
+    for name, entry in sorted(report["calibration"].items()):
+        flag = "  SOBREPOSIÇÃO" if entry["overlap"] else ""
+        print(
+            f"{name:40s} threshold={entry['threshold']:.3f} margem={entry['margin']:+.3f} "
+            f"presente>={entry['present_min']:.3f} ausente<={entry['absent_max']}{flag}"
+        )
+    if report["uncalibrated"]:
+        print(f"Sem amostras presentes e ausentes (não calibrados): {', '.join(report['uncalibrated'])}")
+    print(f"Thresholds gravados em {output} ({report['screens']} screenshots)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+"""Coarse color-histogram signatures that flag templates likely absent from a frame.
+
+A template is normally present only if the frame holds at least as many pixels
+of each of its dominant colors as the template itself. This is a heuristic,
+not a proof: a brightness shift or colors crossing a bin boundary move pixels
+to other bins while ``TM_CCOEFF_NORMED`` (which normalises mean and contrast)
+still matches. Comparing a handful of bins of a 4x4x4 BGR histogram is
+microseconds, versus a full ``cv2.matchTemplate`` pass; ``presence_ratio``
+leaves slack for compression noise and anti-aliasing pushing pixels into
+neighbouring bins.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from bot.core.lazy_import import LazyModule
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+
+BINS_PER_CHANNEL = 4
+
+
+def color_histogram(image) -> Any:
+    """Flat ``BINS_PER_CHANNEL**3`` pixel-count histogram of a BGR image."""
+    bins = [BINS_PER_CHANNEL] * 3
+    return cv2.calcHist([image], [0, 1, 2], None, bins, [0, 256, 0, 256, 0, 256]).reshape(-1)
+
+
+@dataclass(slots=True)
+class ColorSignature:
+    """Dominant histogram bins of a template and their pixel counts."""
+
+    bins: Any
+    counts: Any
+
+    @classmethod
+    def from_template(cls, template, min_bin_fraction: float = 0.05) -> "ColorSignature":
+        hist = color_histogram(template)
+        dominant = np.flatnonzero(hist >= hist.sum() * min_bin_fraction)
+        return cls(bins=dominant, counts=hist[dominant])
+
+    def may_be_in(self, frame_hist, presence_ratio: float = 0.5) -> bool:
+        """``False`` only when the frame lacks enough pixels of a dominant color."""
+        return bool(np.all(frame_hist[self.bins] >= self.counts * presence_ratio))
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
+from bot.core.lazy_import import module_available
+
+RUNTIME_DEPENDENCIES = (("PyYAML", "yaml"), ("opencv-python", "cv2"), ("numpy", "numpy"))
+
 
 def validate_runtime_dependencies() -> None:
-    missing: list[str] = []
-    for package, module in (("PyYAML", "yaml"), ("opencv-python", "cv2"), ("numpy", "numpy")):
-        try:
-            __import__(module)
-        except ImportError:
-            missing.append(package)
+    # find_spec only locates the packages: importing cv2/numpy here would cost
+    # every (spawned) process a few hundred ms before any work starts.
+    missing = [package for package, module in RUNTIME_DEPENDENCIES if not module_available(module)]
 
     if missing:
         formatted = ", ".join(missing)
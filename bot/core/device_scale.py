@@ -0,0 +1,81 @@
+"""Per-device template scale factors, detected once and persisted as JSON."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+# Common emulator profiles relative to 1080p-cut templates (540p, 720p, 810p,
+# 900p, native, 1350p, 1440p, 1620p).
+DEFAULT_SCALE_SWEEP = (0.5, 0.667, 0.75, 0.833, 1.0, 1.25, 1.333, 1.5)
+
+
+class DeviceScaleStore:
+    """``{device_id: scale}`` map shared by every worker through one JSON file.
+
+    Writes hold an exclusive lock on a sidecar ``<name>.lock`` file across
+    the read-modify-write and replace the JSON atomically, so instances
+    persisting their scale at the same time do not drop each other's entries.
+    Readers never see a partially written file.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def _read(self) -> dict[str, float]:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logging.getLogger(__name__).warning("Ignoring unreadable scale store %s: %s", self.path, exc)
+            return {}
+        return {str(key): float(value) for key, value in raw.items()} if isinstance(raw, dict) else {}
+
+    def get(self, device_id: str) -> Optional[float]:
+        return self._read().get(device_id)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f"{self.path.name}.lock"), "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:  # pragma: no cover - Windows
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:  # pragma: no cover - Windows
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def set(self, device_id: str, scale: float) -> None:
+        with self._locked():
+            entries = self._read()
+            entries[device_id] = round(float(scale), 4)
+            self._write(entries)
+
+    def _write(self, entries: dict[str, float]) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(entries, handle, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable
 
+from bot.core.frames import decode_image
+
 
 @dataclass(slots=True)
 class FakeADB:
@@ -62,3 +64,12 @@ class FakeADB:
         destination.write_bytes(source.read_bytes())
         self.advance_screen()
         return destination
+
+    def capture_frame(self):
+        self.calls.append(("capture_frame", ()))
+        if not self.screens:
+            return decode_image(b"")
+
+        source = self.screens[min(self.current_screen, len(self.screens) - 1)]
+        self.advance_screen()
+        return decode_image(source.read_bytes())
@@ -0,0 +1,62 @@
+"""Bounded LRU of decoded screenshots keyed by file identity."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+
+class FrameCache:
+    """Keep the last few decoded screenshots so repeated checks skip ``imread``.
+
+    Entries are keyed by ``(path, mtime_ns, size)``: rewriting the capture file
+    invalidates the entry on the next lookup. Cached frames are shared, so
+    callers must copy before drawing on them.
+    """
+
+    def __init__(self, max_entries: int = 4) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._entries: OrderedDict[tuple[str, int, int], Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.decode_s = 0.0
+
+    def get_or_decode(self, path: str | Path, decode: Callable[[str], Any]) -> Any:
+        path_str = str(path)
+        try:
+            stat = os.stat(path_str)
+        except OSError:
+            return decode(path_str)
+        key = (os.path.abspath(path_str), stat.st_mtime_ns, stat.st_size)
+
+        frame = self._entries.get(key)
+        if frame is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return frame
+
+        self.misses += 1
+        started = time.perf_counter()
+        frame = decode(path_str)
+        self.decode_s += time.perf_counter() - started
+        if frame is not None and self.max_entries > 0:
+            self._entries[key] = frame
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return frame
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        avg_decode_s = self.decode_s / self.misses if self.misses else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "decode_s": round(self.decode_s, 4),
+            "saved_s_estimate": round(avg_decode_s * self.hits, 4),
+        }
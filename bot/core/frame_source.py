@@ -0,0 +1,177 @@
+"""Continuous per-device capture with latest-frame semantics.
+
+A :class:`FrameSource` keeps pulling frames from a capture function (any ADB
+backend's ``capture_frame``) on a background thread and holds only the newest
+one. Calling the source returns that frame at once and sets ``sequence``, so
+``Vision.wait_for`` can tell a new frame from one it already rejected
+instead of paying a capture round trip per poll.
+
+Input sent after a frame was captured makes it stale: :func:`with_frame_barrier`
+wraps the ADB client so every gesture/command raises a barrier, and the next
+call waits for a frame whose capture started after it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Optional
+
+from bot.core.exceptions import SoftFail
+
+# ADB methods that change what is on screen.
+_INPUT_METHODS = frozenset({"tap", "keyevent", "input_text", "start_app", "launch_app", "stop_app", "open_url"})
+
+
+class FrameSource:
+    """Background capture loop exposing the newest frame and its sequence number."""
+
+    def __init__(
+        self,
+        capture_fn: Callable[[], Any],
+        min_interval_s: float = 0.0,
+        wait_timeout_s: float = 5.0,
+        max_age_s: float = 3.0,
+        name: str = "frames",
+    ) -> None:
+        self.capture_fn = capture_fn
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.wait_timeout_s = float(wait_timeout_s)
+        self.max_age_s = float(max_age_s)
+        self.name = name
+        # Sequence of the frame returned by the last call (``None`` before any).
+        self.sequence: Optional[int] = None
+        self._cond = threading.Condition()
+        self._frame: Any = None
+        self._frame_sequence = 0
+        self._frame_started = 0.0
+        self._frame_captured = 0.0
+        self._barrier = 0.0
+        self._error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.counters = {"captured": 0, "errors": 0, "served": 0, "repeated": 0, "barrier_waits": 0}
+
+    def start(self) -> "FrameSource":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name=f"frame-source-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def _loop(self) -> None:
+        backoff_s = 0.0
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                frame = self.capture_fn()
+            except Exception as exc:  # noqa: BLE001 - surfaced to callers on timeout
+                with self._cond:
+                    self._error = exc
+                    self.counters["errors"] += 1
+                backoff_s = min(1.0, max(0.05, backoff_s * 2))
+                self._stop.wait(backoff_s)
+                continue
+            backoff_s = 0.0
+            with self._cond:
+                self._frame = frame
+                self._frame_sequence += 1
+                self._frame_started = started
+                self._frame_captured = time.monotonic()
+                self._error = None
+                self.counters["captured"] += 1
+                self._cond.notify_all()
+            if self.min_interval_s:
+                self._stop.wait(max(0.0, self.min_interval_s - (time.monotonic() - started)))
+
+    def _usable(self) -> bool:
+        return self._frame is not None and self._frame_started >= self._barrier
+
+    def __call__(self) -> Any:
+        """Newest frame (waiting only for the first one or after a barrier)."""
+        with self._cond:
+            if not self._usable():
+                self.counters["barrier_waits"] += self._frame is not None
+                if not self._cond.wait_for(self._usable, timeout=self.wait_timeout_s):
+                    raise SoftFail(f"No frame from {self.name} within {self.wait_timeout_s:.1f}s: {self._error}")
+            if time.monotonic() - self._frame_captured > self.max_age_s:
+                raise SoftFail(f"Frame stream {self.name} stalled: {self._error}")
+            self.counters["served"] += 1
+            self.counters["repeated"] += self._frame_sequence == self.sequence
+            self.sequence = self._frame_sequence
+            return self._frame
+
+    def barrier(self) -> None:
+        """Frames whose capture started before now are stale from here on."""
+        with self._cond:
+            self._barrier = time.monotonic()
+
+    def stop(self, timeout_s: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+            self._thread = None
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return dict(self.counters)
+
+
+class FakeFrameSource:
+    """Deterministic stand-in: serves each frame ``repeat`` times with one sequence number."""
+
+    def __init__(self, frames: Iterable[Any], repeat: int = 1) -> None:
+        self.frames = list(frames)
+        self.repeat = max(1, int(repeat))
+        self.sequence: Optional[int] = None
+        self.calls = 0
+        self.barriers = 0
+
+    def __call__(self) -> Any:
+        if not self.frames:
+            raise SoftFail("FakeFrameSource has no frames")
+        index = min(self.calls // self.repeat, len(self.frames) - 1)
+        self.calls += 1
+        self.sequence = index + 1
+        return self.frames[index]
+
+    def barrier(self) -> None:
+        self.barriers += 1
+
+
+class _BarrierADB:
+    """Delegates to the wrapped ADB client, raising the source's barrier after input."""
+
+    def __init__(self, adb: Any, source: Any) -> None:
+        self._adb = adb
+        self._source = source
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._adb, name)
+        if name == "batch" and callable(attr):
+            return self._batch(attr)
+        if name not in _INPUT_METHODS or not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._source.barrier()
+
+        return call
+
+    def _batch(self, batch: Callable[[], Any]) -> Callable[[], Any]:
+        @contextmanager
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            try:
+                with batch(*args, **kwargs) as commands:
+                    yield commands
+            finally:
+                self._source.barrier()
+
+        return wrapped
+
+
+def with_frame_barrier(adb: Any, source: Any) -> Any:
+    return _BarrierADB(adb, source)
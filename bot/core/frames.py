@@ -0,0 +1,91 @@
+"""Helpers for turning raw screencap bytes into in-memory frames."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from dataclasses import dataclass
+
+from bot.core.exceptions import SoftFail
+from bot.core.lazy_import import LazyModule
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+
+
+def decode_image(data: bytes):
+    """Decode encoded image bytes (PNG/JPEG/WebP) into a BGR NumPy array."""
+    if not cv2 or not np:
+        raise SoftFail("opencv-python is required for in-memory frames")
+    if not data:
+        raise SoftFail("Empty screencap payload")
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise SoftFail("Unable to decode screencap payload")
+    return frame
+
+
+# ``screencap`` without ``-p`` writes a little-endian header followed by the
+# framebuffer: width, height and pixel format (u32 each), plus a colour space
+# word since Android 9 (12- or 16-byte header).
+_RAW_CHANNELS = {1: 4, 2: 4, 3: 3, 5: 4}  # RGBA_8888, RGBX_8888, RGB_888, BGRA_8888
+_PNG_MAGIC = b"\x89PNG"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(slots=True, frozen=True)
+class RawHeader:
+    width: int
+    height: int
+    pixel_format: int
+    header_size: int
+
+
+def parse_raw_header(data) -> RawHeader:
+    """Read the raw screencap header, telling the 12/16-byte layouts apart by payload size."""
+    if len(data) < 12:
+        raise SoftFail("Raw screencap payload too short")
+    width, height, pixel_format = struct.unpack_from("<III", data, 0)
+    channels = _RAW_CHANNELS.get(pixel_format)
+    if channels is None:
+        raise SoftFail(f"Unsupported raw screencap pixel format: {pixel_format}")
+    pixels = width * height * channels
+    for header_size in (16, 12):
+        if len(data) - header_size == pixels:
+            return RawHeader(width, height, pixel_format, header_size)
+    raise SoftFail(f"Raw screencap size mismatch: {len(data)} bytes for {width}x{height} format {pixel_format}")
+
+
+def raw_pixels(data):
+    """``(header, HxWxC view)`` over the payload, without copying it."""
+    header = parse_raw_header(data)
+    channels = _RAW_CHANNELS[header.pixel_format]
+    view = np.frombuffer(data, dtype=np.uint8, count=header.width * header.height * channels, offset=header.header_size)
+    return header, view.reshape(header.height, header.width, channels)
+
+
+def decode_raw_screencap(data):
+    """Convert a raw framebuffer dump to a BGR frame; the colour conversion is the only copy."""
+    if not cv2 or not np:
+        raise SoftFail("opencv-python is required for in-memory frames")
+    header, pixels = raw_pixels(data)
+    if header.pixel_format == 5:
+        return cv2.cvtColor(pixels, cv2.COLOR_BGRA2BGR)
+    if header.pixel_format == 3:
+        return cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(pixels, cv2.COLOR_RGBA2BGR)
+
+
+def decode_screencap(data):
+    """Decode any ``screencap`` output: PNG (``-p``), raw, or raw piped through ``gzip``."""
+    if not data:
+        raise SoftFail("Empty screencap payload")
+    head = bytes(data[:4])
+    if head.startswith(_PNG_MAGIC):
+        return decode_image(data)
+    if head.startswith(_GZIP_MAGIC):
+        try:
+            data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+        except zlib.error as exc:
+            raise SoftFail(f"Unable to decompress screencap payload: {exc}") from exc
+    return decode_raw_screencap(data)
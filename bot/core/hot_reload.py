@@ -0,0 +1,67 @@
+"""Cheap change detection for template files and the bot config (polling, no deps)."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Optional
+
+Snapshot = dict[Path, tuple[int, int]]
+
+
+def _stat(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """Compare ``(mtime_ns, size)`` of every template and of the config file.
+
+    ``poll`` rescans at most once per ``interval_s`` so it can be called before
+    every match; between scans it returns "nothing changed" immediately.
+    """
+
+    def __init__(
+        self,
+        templates_dir: str | Path,
+        config_path: Optional[str | Path] = None,
+        interval_s: float = 2.0,
+        pattern: str = "*.png",
+    ) -> None:
+        self.templates_dir = Path(templates_dir)
+        self.config_path = Path(config_path) if config_path else None
+        self.interval_s = max(0.0, float(interval_s))
+        self.pattern = pattern
+        self._templates = self._scan_templates()
+        self._config = _stat(self.config_path) if self.config_path else None
+        self._next_scan = time.monotonic() + self.interval_s
+
+    def _scan_templates(self) -> Snapshot:
+        snapshot: Snapshot = {}
+        if self.templates_dir.is_dir():
+            for path in self.templates_dir.rglob(self.pattern):
+                stat = _stat(path)
+                if stat is not None:
+                    snapshot[path] = stat
+        return snapshot
+
+    def poll(self) -> tuple[set[Path], bool]:
+        """Template files added/changed/removed since the last scan, and whether the config changed."""
+        now = time.monotonic()
+        if now < self._next_scan:
+            return set(), False
+        self._next_scan = now + self.interval_s
+
+        current = self._scan_templates()
+        changed = {path for path in current.keys() | self._templates.keys() if current.get(path) != self._templates.get(path)}
+        self._templates = current
+
+        config_changed = False
+        if self.config_path is not None:
+            config = _stat(self.config_path)
+            config_changed = config != self._config
+            self._config = config
+        return changed, config_changed
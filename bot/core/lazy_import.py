@@ -0,0 +1,69 @@
+"""Deferred imports for heavy optional dependencies (``cv2``, ``numpy``).
+
+Importing OpenCV and NumPy costs a few hundred milliseconds, paid again by
+every spawned worker. Modules bind them through :class:`LazyModule` so the
+import happens on first use instead of at ``import bot.main``.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any, Optional
+
+_UNSET = object()
+
+
+def module_available(name: str) -> bool:
+    """Whether ``name`` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    Truthiness tells whether the module is installed (and imports it), so
+    optional-dependency guards read ``if not cv2:`` instead of ``cv2 is None``.
+    Attributes are copied onto the proxy once fetched, so hot paths pay the
+    indirection only on the first call. The proxy defines no public names of
+    its own (``np.load`` must stay NumPy's); use :func:`resolve` and
+    :func:`is_loaded` to inspect it.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = _UNSET
+
+    def __bool__(self) -> bool:
+        return resolve(self) is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        module = resolve(self)
+        if module is None:
+            raise ImportError(f"{self._lazy_name} is not installed")
+        value = getattr(module, attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __repr__(self) -> str:
+        state = "loaded" if is_loaded(self) else "deferred"
+        return f"<LazyModule {self._lazy_name} ({state})>"
+
+
+def resolve(lazy: LazyModule) -> Optional[ModuleType]:
+    """The real module behind ``lazy`` (importing it now), or ``None`` when not installed."""
+    state = lazy.__dict__
+    if state["_lazy_module"] is _UNSET:
+        try:
+            state["_lazy_module"] = importlib.import_module(state["_lazy_name"])
+        except ImportError:
+            state["_lazy_module"] = None
+    return state["_lazy_module"]
+
+
+def is_loaded(lazy: LazyModule) -> bool:
+    return lazy.__dict__["_lazy_module"] is not _UNSET
@@ -0,0 +1,191 @@
+"""Template matching backends used by :class:`bot.core.vision.Vision`.
+
+Every backend computes the same ``TM_CCOEFF_NORMED`` score and returns
+``(score, top_left)`` for the best location; they only differ in cost:
+
+* ``opencv``: ``cv2.matchTemplate`` (the historical behaviour);
+* ``fft``: correlation in the frequency domain with each template's spectrum
+  and normalisation terms cached per frame size, plus the spectrum of the last
+  frame, so several templates checked on the same screen share one forward FFT.
+
+``select_backend`` times the candidates on a real frame and keeps the fastest
+one whose score agrees with ``opencv``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Protocol
+
+from bot.core.lazy_import import LazyModule
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+
+Match = tuple[float, tuple[int, int]]
+
+
+class MatchBackend(Protocol):
+    name: str
+
+    def match(self, frame, template, key: Any) -> Match: ...
+
+
+class OpenCVBackend:
+    name = "opencv"
+
+    def match(self, frame, template, key: Any = None) -> Match:
+        result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return float(max_val), (int(max_loc[0]), int(max_loc[1]))
+
+
+@dataclass(slots=True)
+class _TemplateSpectrum:
+    spectra: list[Any]
+    sq_norm: float
+    size: tuple[int, int]
+    fft_shape: tuple[int, int]
+
+
+class FFTBackend:
+    """Frequency-domain ``TM_CCOEFF_NORMED`` for fixed-size frames.
+
+    ``key`` identifies the template (name and scale); spectra are cached per
+    ``(key, frame shape)`` in a bounded LRU, so matches on same-sized frames
+    only pay for the frame side of the computation.
+    """
+
+    name = "fft"
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._spectra: OrderedDict[tuple[Any, tuple[int, ...]], _TemplateSpectrum] = OrderedDict()
+        self._frame_fft: Optional[tuple[Any, tuple[int, int], list[Any]]] = None
+        self._frame_integrals: Optional[tuple[Any, list[tuple[Any, Any]]]] = None
+        self.spectrum_hits = 0
+        self.spectrum_misses = 0
+        self._lock = threading.Lock()
+
+    def _template_spectrum(self, template, key: Any, frame_shape: tuple[int, ...]) -> _TemplateSpectrum:
+        cache_key = (key, frame_shape)
+        with self._lock:
+            cached = self._spectra.get(cache_key)
+            if cached is not None:
+                self._spectra.move_to_end(cache_key)
+                self.spectrum_hits += 1
+                return cached
+            self.spectrum_misses += 1
+
+        fft_shape = (cv2.getOptimalDFTSize(frame_shape[0]), cv2.getOptimalDFTSize(frame_shape[1]))
+        planes = self._planes(template)
+        centered = [plane - plane.mean() for plane in planes]
+        spectra = [np.conj(np.fft.rfft2(plane, s=fft_shape)) for plane in centered]
+        sq_norm = float(sum((plane * plane).sum() for plane in centered))
+        entry = _TemplateSpectrum(spectra, sq_norm, template.shape[:2], fft_shape)
+        with self._lock:
+            self._spectra[cache_key] = entry
+            if len(self._spectra) > self.max_entries:
+                self._spectra.popitem(last=False)
+        return entry
+
+    def _frame_spectra(self, frame, planes: list[Any], fft_shape: tuple[int, int]) -> list[Any]:
+        cached = self._frame_fft
+        if cached is not None and cached[0] is frame and cached[1] == fft_shape:
+            return cached[2]
+        spectra = [np.fft.rfft2(plane, s=fft_shape) for plane in planes]
+        self._frame_fft = (frame, fft_shape, spectra)
+        return spectra
+
+    def _integrals(self, frame, planes: list[Any]) -> list[tuple[Any, Any]]:
+        """Per-channel integral images of ``I`` and ``I^2`` for the last frame."""
+        cached = self._frame_integrals
+        if cached is not None and cached[0] is frame:
+            return cached[1]
+        integrals = [
+            (
+                np.pad(plane, ((1, 0), (1, 0))).cumsum(0).cumsum(1),
+                np.pad(plane * plane, ((1, 0), (1, 0))).cumsum(0).cumsum(1),
+            )
+            for plane in planes
+        ]
+        self._frame_integrals = (frame, integrals)
+        return integrals
+
+    @staticmethod
+    def _planes(image) -> list[Any]:
+        image = image.astype(np.float64)
+        return [image] if image.ndim == 2 else [image[:, :, c] for c in range(image.shape[2])]
+
+    @staticmethod
+    def _window_energy(integrals: list[tuple[Any, Any]], h: int, w: int) -> Any:
+        """Sum over channels of ``sum(I^2) - sum(I)^2 / n`` for every ``h x w`` window."""
+        n = float(h * w)
+        energy = 0.0
+        for s, sq in integrals:
+            win_sum = s[h:, w:] - s[:-h, w:] - s[h:, :-w] + s[:-h, :-w]
+            win_sq = sq[h:, w:] - sq[:-h, w:] - sq[h:, :-w] + sq[:-h, :-w]
+            energy = energy + (win_sq - win_sum * win_sum / n)
+        return energy
+
+    def match(self, frame, template, key: Any) -> Match:
+        spectrum = self._template_spectrum(template, key, frame.shape)
+        h, w = spectrum.size
+        planes = self._planes(frame)
+        frame_spectra = self._frame_spectra(frame, planes, spectrum.fft_shape)
+
+        product = sum(fs * ts for fs, ts in zip(frame_spectra, spectrum.spectra))
+        corr = np.fft.irfft2(product, s=spectrum.fft_shape)
+        out_h, out_w = frame.shape[0] - h + 1, frame.shape[1] - w + 1
+        numerator = corr[:out_h, :out_w]
+        energy = np.maximum(self._window_energy(self._integrals(frame, planes), h, w), 0.0)
+        denominator = np.sqrt(energy * spectrum.sq_norm)
+        scores = np.where(denominator > 1e-6, numerator / np.where(denominator > 1e-6, denominator, 1.0), 0.0)
+        y, x = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        return float(min(1.0, scores[y, x])), (int(x), int(y))
+
+    def discard(self, predicate: Callable[[Any], bool]) -> None:
+        """Forget cached spectra whose template ``key`` satisfies ``predicate``."""
+        with self._lock:
+            for cache_key in [cache_key for cache_key in self._spectra if predicate(cache_key[0])]:
+                del self._spectra[cache_key]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"spectra": len(self._spectra), "hits": self.spectrum_hits, "misses": self.spectrum_misses}
+
+
+def build_backends() -> dict[str, MatchBackend]:
+    return {"opencv": OpenCVBackend(), "fft": FFTBackend()}
+
+
+def select_backend(
+    backends: dict[str, MatchBackend],
+    frame,
+    template,
+    key: Any,
+    repeats: int = 3,
+    tolerance: float = 1e-3,
+) -> str:
+    """Name of the fastest backend (median of ``repeats``) agreeing with ``opencv``.
+
+    Each backend runs once untimed first so cached template-side work does not
+    count against it.
+    """
+    reference, _ = backends["opencv"].match(frame, template, key)
+    timings: dict[str, float] = {}
+    for name, backend in backends.items():
+        score, _ = backend.match(frame, template, key)
+        if abs(score - reference) > tolerance:
+            continue
+        samples = []
+        # Fresh copies so per-frame caches (e.g. the frame spectrum) are paid each run.
+        for copy in [frame.copy() for _ in range(max(1, repeats))]:
+            started = time.perf_counter()
+            backend.match(copy, template, key)
+            samples.append(time.perf_counter() - started)
+        timings[name] = sorted(samples)[len(samples) // 2]
+    return min(timings, key=timings.get) if timings else "opencv"
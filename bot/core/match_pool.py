@@ -0,0 +1,40 @@
+"""Per-process thread pool shared by every Vision for parallel template matching.
+
+``cv2.matchTemplate`` releases the GIL, so a few threads let one poll score
+several templates (or ROIs) on several cores.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def _mark_worker() -> None:
+    _worker_state.active = True
+
+
+def in_match_pool() -> bool:
+    """``True`` on a pool thread; nested fan-out from there could starve the pool."""
+    return getattr(_worker_state, "active", False)
+
+
+def get_match_pool(workers: int) -> ThreadPoolExecutor:
+    """Return this process' pool, creating it with ``workers`` threads on first use."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, int(workers)),
+                thread_name_prefix="vision-match",
+                initializer=_mark_worker,
+            )
+            _pool_pid = os.getpid()
+        return _pool
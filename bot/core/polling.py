@@ -0,0 +1,191 @@
+"""Poll schedules used by ``Vision.wait_for`` / ``wait_and_click``.
+
+A schedule answers "how long to sleep before the next capture" given how many
+polls already ran and how long the wait has lasted. Steps select one through
+the ``poll`` key of their ``step_XX`` config, e.g.::
+
+    step_05:
+      poll: {mode: backoff, initial_s: 0.1, factor: 1.6, max_s: 1.2}
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional, Protocol, Union
+
+from bot.core.device_scale import DeviceScaleStore
+
+
+class PollSchedule(Protocol):
+    def interval(self, attempt: int, elapsed_s: float) -> float: ...
+
+
+@dataclass(slots=True)
+class FixedSchedule:
+    """Constant interval (the historical ``interval_s`` behaviour)."""
+
+    interval_s: float = 0.5
+
+    def interval(self, attempt: int, elapsed_s: float) -> float:
+        return self.interval_s
+
+
+@dataclass(slots=True)
+class BackoffSchedule:
+    """Exponential backoff: ``initial_s * factor**attempt`` capped at ``max_s``."""
+
+    initial_s: float = 0.1
+    factor: float = 2.0
+    max_s: float = 2.0
+
+    def interval(self, attempt: int, elapsed_s: float) -> float:
+        return min(self.max_s, self.initial_s * (self.factor ** max(0, attempt)))
+
+
+@dataclass(slots=True)
+class HotStartSchedule:
+    """Poll fast right after an action, then settle on a slower interval."""
+
+    fast_s: float = 0.1
+    fast_window_s: float = 1.5
+    slow_s: float = 0.8
+
+    def interval(self, attempt: int, elapsed_s: float) -> float:
+        return self.fast_s if elapsed_s < self.fast_window_s else self.slow_s
+
+
+class AppearanceStore(DeviceScaleStore):
+    """``{instance: {template: [elapsed_s, ...]}}`` persisted like the device-scale store."""
+
+    def _read(self) -> dict[str, Any]:  # type: ignore[override]
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logging.getLogger(__name__).warning("Ignoring unreadable appearance store %s: %s", self.path, exc)
+            return {}
+        return raw if isinstance(raw, dict) else {}
+
+    def load(self, key: str) -> dict[str, list[float]]:
+        entry = self._read().get(key)
+        if not isinstance(entry, dict):
+            return {}
+        return {str(name): [float(s) for s in samples] for name, samples in entry.items() if isinstance(samples, list)}
+
+    def save(self, key: str, samples: dict[str, list[float]]) -> None:
+        with self._locked():
+            entries = self._read()
+            entries[key] = {name: [round(s, 3) for s in values] for name, values in samples.items()}
+            self._write(entries)
+
+
+class AppearanceHistory:
+    """Bounded per-template record of how long templates took to appear.
+
+    With a ``store`` the samples are loaded for ``key`` (the instance) on
+    creation and written back on every record, so ``HistorySchedule`` keeps
+    its distribution across runs instead of starting cold each time.
+    """
+
+    def __init__(self, max_samples: int = 50, store: Optional[AppearanceStore] = None, key: str = "") -> None:
+        self.max_samples = max_samples
+        self.store = store
+        self.key = key
+        self._samples: dict[str, deque[float]] = {}
+        if store is not None:
+            for name, samples in store.load(key).items():
+                self._samples[name] = deque(samples, maxlen=max_samples)
+
+    def record(self, template_name: str, elapsed_s: float) -> None:
+        samples = self._samples.setdefault(template_name, deque(maxlen=self.max_samples))
+        samples.append(float(elapsed_s))
+        if self.store is not None:
+            try:
+                self.store.save(self.key, {name: list(values) for name, values in self._samples.items()})
+            except OSError as exc:
+                logging.getLogger(__name__).warning("Could not persist appearance history: %s", exc)
+
+    def count(self, template_name: str) -> int:
+        return len(self._samples.get(template_name, ()))
+
+    def quantile(self, template_name: str, q: float) -> Optional[float]:
+        samples = sorted(self._samples.get(template_name, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, round(q * (len(samples) - 1))))
+        return samples[index]
+
+
+@dataclass(slots=True)
+class HistorySchedule:
+    """Poll densely inside the template's usual appearance window.
+
+    Before the 10th percentile of past appearance times the schedule sleeps
+    towards it (bounded by ``max_s``); between p10 and p90 it polls every
+    ``min_s``; after p90 it backs off to ``max_s``. With fewer than
+    ``min_samples`` observations it behaves like ``fallback``.
+    """
+
+    history: AppearanceHistory
+    template_name: str
+    min_s: float = 0.1
+    max_s: float = 1.0
+    min_samples: int = 3
+    fallback: PollSchedule = field(default_factory=HotStartSchedule)
+
+    def interval(self, attempt: int, elapsed_s: float) -> float:
+        if self.history.count(self.template_name) < self.min_samples:
+            return self.fallback.interval(attempt, elapsed_s)
+        early = self.history.quantile(self.template_name, 0.1) or 0.0
+        late = self.history.quantile(self.template_name, 0.9) or 0.0
+        if elapsed_s < early:
+            return max(self.min_s, min(self.max_s, early - elapsed_s))
+        if elapsed_s <= late:
+            return self.min_s
+        return self.max_s
+
+
+ScheduleSpec = Union[None, str, dict[str, Any], PollSchedule]
+
+
+def build_schedule(
+    spec: ScheduleSpec,
+    interval_s: float,
+    history: Optional[AppearanceHistory] = None,
+    template_name: str = "",
+) -> PollSchedule:
+    """Turn a ``poll`` config entry (mode name or dict) into a schedule."""
+    if spec is None:
+        return FixedSchedule(interval_s)
+    if not isinstance(spec, (str, dict)):
+        return spec
+
+    options = {"mode": spec} if isinstance(spec, str) else dict(spec)
+    mode = str(options.pop("mode", "fixed"))
+    if mode == "fixed":
+        return FixedSchedule(float(options.get("interval_s", interval_s)))
+    if mode == "backoff":
+        return BackoffSchedule(
+            initial_s=float(options.get("initial_s", 0.1)),
+            factor=float(options.get("factor", 2.0)),
+            max_s=float(options.get("max_s", 2.0)),
+        )
+    if mode == "hot_start":
+        return HotStartSchedule(
+            fast_s=float(options.get("fast_s", 0.1)),
+            fast_window_s=float(options.get("fast_window_s", 1.5)),
+            slow_s=float(options.get("slow_s", 0.8)),
+        )
+    if mode == "history":
+        return HistorySchedule(
+            history=history or AppearanceHistory(),
+            template_name=template_name,
+            min_s=float(options.get("min_s", 0.1)),
+            max_s=float(options.get("max_s", 1.0)),
+            min_samples=int(options.get("min_samples", 3)),
+        )
+    raise ValueError(f"Modo de polling desconhecido: {mode}")
@@ -0,0 +1,109 @@
+"""Byte-budgeted LRU for decoded templates and their derived variants."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+
+def template_of(key: Hashable) -> str:
+    """Template name of a cache key: the key itself or the first item of a tuple key."""
+    return key[0] if isinstance(key, tuple) else key
+
+
+class TemplateCache:
+    """LRU of template arrays bounded by ``max_bytes`` (``0`` = unbounded).
+
+    Keys are a template name for the native image or ``(name, kind, ...)`` for
+    variants (scaled, coarse, ...). Every entry of a pinned template is kept
+    regardless of the budget. Entries stored with ``size=0`` (memory-mapped
+    pack views, whose pages are shared between processes) are not counted
+    and never evicted.
+    """
+
+    def __init__(self, max_bytes: int = 0, pinned: Optional[Iterable[str]] = None) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.pinned = set(pinned or ())
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def keys(self) -> list[Hashable]:
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> Any:
+        size = int(getattr(value, "nbytes", 0)) if size is None else int(size)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            self._evict(keep=key)
+        return value
+
+    def get_or_create(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, create())
+        return value
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key satisfies ``predicate``; returns how many."""
+        with self._lock:
+            doomed = [key for key in self._entries if predicate(key)]
+            for key in doomed:
+                self.bytes -= self._entries.pop(key)[1]
+            return len(doomed)
+
+    def count(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            return sum(1 for key in self._entries if predicate(key))
+
+    def _evict(self, keep: Hashable) -> None:
+        if not self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self.bytes <= self.max_bytes:
+                break
+            _, size = self._entries[key]
+            if key == keep or size == 0 or template_of(key) in self.pinned:
+                continue
+            del self._entries[key]
+            self.bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+                "pinned": sum(1 for key in self._entries if template_of(key) in self.pinned),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,170 @@
+"""Precompiled template pack: one memory-mappable blob plus a JSON index.
+
+Build once per release with::
+
+    python -m bot.core.template_pack --bot-config bot/config/bot.yaml --output runtime/templates.pack.npy
+
+Every worker process then opens the same ``.npy`` with ``mmap_mode="r"`` so
+template pixels are shared through the OS page cache instead of being decoded
+again by each ``Vision``. The index records each source PNG's path, size and
+mtime; entries whose PNG changed since the build are reported as stale.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from bot.core import template_ids as template_ids_module
+from bot.core.lazy_import import LazyModule
+from bot.core.vision import resolve_template_path
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+
+PACK_VERSION = 2
+_ALIGNMENT = 64
+
+
+def index_path_for(pack_path: str | Path) -> Path:
+    pack_path = Path(pack_path)
+    return pack_path.with_suffix(".index.json")
+
+
+def known_template_ids(template_map: Optional[dict[str, str]] = None) -> list[str]:
+    """All IDs declared in ``bot.core.template_ids`` plus any extra ``templates`` keys."""
+    declared = [
+        value
+        for name, value in vars(template_ids_module).items()
+        if name.startswith("T_") and isinstance(value, str)
+    ]
+    extra = [name for name in (template_map or {}) if name not in declared]
+    return declared + extra
+
+
+def build_template_pack(
+    templates_dir: str | Path,
+    template_map: Optional[dict[str, str]],
+    output_path: str | Path,
+    ids: Optional[Iterable[str]] = None,
+) -> dict[str, Any]:
+    """Decode every template once and write ``output_path`` plus its index.
+
+    Returns a report with the packed and missing IDs.
+    """
+    if not cv2 or not np:
+        raise RuntimeError("opencv-python e numpy são necessários para gerar o template pack")
+
+    template_map = template_map or {}
+    names = list(ids) if ids is not None else known_template_ids(template_map)
+    entries: dict[str, dict[str, Any]] = {}
+    chunks: list[Any] = []
+    missing: list[str] = []
+    offset = 0
+    for name in names:
+        path = resolve_template_path(templates_dir, template_map, name)
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR) if path.exists() else None
+        if image is None:
+            missing.append(name)
+            continue
+        padding = (-offset) % _ALIGNMENT
+        if padding:
+            chunks.append(np.zeros(padding, dtype=np.uint8))
+            offset += padding
+        data = np.ascontiguousarray(image).reshape(-1)
+        stat = path.stat()
+        entries[name] = {
+            "offset": offset,
+            "shape": list(image.shape),
+            "source": str(path.resolve()),
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+        }
+        chunks.append(data)
+        offset += data.size
+
+    blob = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
+    output_path = Path(output_path)
+    if output_path.suffix != ".npy":
+        output_path = output_path.with_name(f"{output_path.name}.npy")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(output_path, blob, allow_pickle=False)
+    index = {"version": PACK_VERSION, "templates": entries}
+    index_path_for(output_path).write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+    return {"path": str(output_path), "packed": sorted(entries), "missing": missing, "bytes": int(blob.size)}
+
+
+@dataclass(slots=True)
+class TemplatePack:
+    """Read-only view over a pack built by :func:`build_template_pack`."""
+
+    path: Path
+    blob: Any
+    index: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def open(cls, pack_path: str | Path) -> "TemplatePack":
+        if not np:
+            raise ValueError("numpy é necessário para abrir o template pack")
+        pack_path = Path(pack_path)
+        raw_index = json.loads(index_path_for(pack_path).read_text(encoding="utf-8"))
+        if raw_index.get("version") != PACK_VERSION:
+            raise ValueError(f"Versão de template pack incompatível: {raw_index.get('version')}")
+        blob = np.load(pack_path, mmap_mode="r", allow_pickle=False)
+        return cls(path=pack_path, blob=blob, index=raw_index.get("templates", {}))
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def get(self, name: str):
+        entry = self.index[name]
+        shape = tuple(entry["shape"])
+        size = 1
+        for dim in shape:
+            size *= dim
+        start = int(entry["offset"])
+        return self.blob[start : start + size].reshape(shape)
+
+    def stale_reason(self, name: str, source: Path) -> Optional[str]:
+        """Why the entry for ``name`` no longer matches ``source`` (``None`` when it is current)."""
+        entry = self.index[name]
+        source = Path(source).resolve()
+        if str(source) != entry.get("source"):
+            return f"source changed from {entry.get('source')} to {source}"
+        try:
+            stat = source.stat()
+        except OSError:
+            return f"{source} no longer exists"
+        if (stat.st_size, stat.st_mtime_ns) != (entry.get("source_size"), entry.get("source_mtime_ns")):
+            return f"{source} was modified after the pack was built"
+        return None
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from bot.config.loader import load_bot_config
+
+    parser = argparse.ArgumentParser(description="Gera o template pack memory-mapped")
+    parser.add_argument("--bot-config", default="bot/config/bot.yaml")
+    parser.add_argument("--output", default="runtime/templates.pack.npy")
+    parser.add_argument("--allow-missing", action="store_true", help="Não falha quando algum template não existe")
+    args = parser.parse_args(argv)
+
+    bot_config = load_bot_config(args.bot_config)
+    report = build_template_pack(bot_config.templates_dir, bot_config.templates or {}, args.output)
+    print(f"Template pack gerado em {report['path']}: {len(report['packed'])} templates, {report['bytes']} bytes")
+    if report["missing"]:
+        print(f"Templates ausentes: {', '.join(report['missing'])}")
+        if not args.allow_missing:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
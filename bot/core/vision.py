@@ -5,16 +5,86 @@ from __future__ import annotations
 import time
 import random
 import os
+import threading
+from datetime import datetime
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Optional, TypeVar, Union
 import logging
+from dataclasses import dataclass, field
 
+from bot.core.artifacts import get_artifact_writer
+from bot.core.color_prefilter import ColorSignature, color_histogram
+from bot.core.device_scale import DEFAULT_SCALE_SWEEP, DeviceScaleStore
 from bot.core.exceptions import SoftFail
+from bot.core.frame_cache import FrameCache
+from bot.core.hot_reload import FileWatcher
+from bot.core.lazy_import import LazyModule, resolve
+from bot.core.match_backends import build_backends, select_backend
+from bot.core.match_pool import get_match_pool, in_match_pool
+from bot.core.polling import AppearanceHistory, AppearanceStore, PollSchedule, ScheduleSpec, build_schedule
+from bot.core.template_cache import TemplateCache, template_of
+from bot.core.vision_stats import TemplateStats
 
-try:
-    import cv2
-except ImportError:  # pragma: no cover - dependency may be optional in bootstrap phase
-    cv2 = None
+# Internal handle; ``from bot.core.vision import cv2`` still yields the module
+# (or ``None``) through ``__getattr__`` below.
+_cv2 = LazyModule("cv2")
+
+T = TypeVar("T")
+
+
+def __getattr__(name: str) -> Any:
+    if name == "cv2":
+        return resolve(_cv2)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# A screen is either a screenshot path on disk or an already decoded BGR frame.
+Screen = Union[str, Path, Any]
+
+# Thumbnail size for frame-change detection: ~30x30 px cells on a 1080p frame,
+# so a button appearing still moves at least one cell well past the tolerance.
+_SIGNATURE_SIZE = (64, 36)
+
+
+def resolve_template_path(templates_dir: str | Path, template_map: dict[str, str], name: str) -> Path:
+    """Map a logical template ID (or relative file name) to its PNG path."""
+    templates_dir = Path(templates_dir)
+    if name in template_map:
+        return templates_dir / template_map[name]
+
+    explicit = templates_dir / name
+    if explicit.exists():
+        return explicit
+
+    logical = templates_dir / f"{name.replace('.', '/')}.png"
+    return logical
+
+
+@dataclass(slots=True)
+class ScreenMatches:
+    """Scores of several templates evaluated against the same decoded frame.
+
+    ``results`` keeps evaluation order; with ``first_hit`` only the templates
+    evaluated up to (and including) the first hit are present.
+    """
+
+    results: dict[str, dict[str, object]] = field(default_factory=dict)
+
+    def hit(self, template_name: str) -> bool:
+        result = self.results.get(template_name)
+        return bool(result and result["matched"])
+
+    def score(self, template_name: str) -> float:
+        result = self.results.get(template_name)
+        return float(result["score"]) if result else 0.0
+
+    @property
+    def hits(self) -> list[str]:
+        return [name for name, result in self.results.items() if result["matched"]]
+
+    @property
+    def first_hit(self) -> Optional[str]:
+        return next((name for name, result in self.results.items() if result["matched"]), None)
 
 
 class Vision:
@@ -22,104 +92,700 @@ class Vision:
         self,
         templates_dir: str,
         template_map: Optional[dict[str, str]] = None,
-        default_confidence: float = 0.90,
+        default_confidence: float = 0.88,
         templates_confidence: Optional[dict[str, float]] = None,
+        frame_cache_size: int = 4,
+        templates_roi: Optional[dict[str, list[int]]] = None,
+        roi_padding_px: int = 24,
+        roi_learning: bool = True,
+        templates_cascade: Optional[dict[str, dict[str, object]]] = None,
+        template_pack: Optional[str] = None,
+        skip_unchanged_frames: bool = False,
+        unchanged_tolerance: float = 6.0,
+        debug_format: str = "png",
+        template_stats: bool = True,
+        multi_scale: bool = False,
+        scale_anchor: str = "home.tela_home",
+        scale_sweep: Optional[list[float]] = None,
+        scale_store: Optional[str] = None,
+        appearance_store: Optional[str] = None,
+        device_id: str = "",
+        color_prefilter: bool = False,
+        prefilter_presence_ratio: float = 0.5,
+        prefilter_audit_rate: float = 0.02,
+        match_backend: str = "opencv",
+        templates_backend: Optional[dict[str, str]] = None,
+        calibrated_confidence: Optional[dict[str, float]] = None,
+        template_cache_bytes: int = 0,
+        pinned_templates: Optional[list[str]] = None,
+        match_workers: int = 0,
+        template_cache: Optional[TemplateCache] = None,
+        hot_reload: bool = False,
+        config_path: Optional[str] = None,
+        reload_interval_s: float = 2.0,
     ) -> None:
         self.templates_dir = Path(templates_dir)
+        # Guards counters updated from match pool threads.
+        self._stats_lock = threading.Lock()
+        self.match_workers = max(0, int(match_workers))
+        self._parallel_counters = {"fanouts": 0, "cancelled": 0}
         self.template_map = template_map or {}
         self.default_confidence = float(default_confidence)
         self.templates_confidence = templates_confidence or {}
-        self._templates: dict[str, object] = {}
+        self.calibrated_confidence = calibrated_confidence or {}
+        # Native templates plus their scaled/coarse variants, under one byte budget;
+        # a cache passed in is shared with other Vision instances (vision server).
+        self._templates = template_cache or TemplateCache(template_cache_bytes, pinned_templates or [scale_anchor])
+        self._frame_cache = FrameCache(frame_cache_size)
+        self.templates_roi = templates_roi or {}
+        self.roi_padding_px = max(0, int(roi_padding_px))
+        self.roi_learning = bool(roi_learning)
+        self._learned_rois: dict[str, tuple[int, int, int, int]] = {}
+        self._roi_counters = {"roi_hits": 0, "roi_misses": 0, "full_frame": 0}
+        self.templates_cascade = templates_cascade or {}
+        self.skip_unchanged_frames = bool(skip_unchanged_frames)
+        self.unchanged_tolerance = float(unchanged_tolerance)
+        self._wait_counters = {"matches": 0, "skipped_matches": 0}
+        self.appearance_history = AppearanceHistory(
+            store=AppearanceStore(appearance_store) if appearance_store and device_id else None, key=device_id
+        )
+        self.debug_format = debug_format.lstrip(".").lower()
+        self.collect_template_stats = bool(template_stats)
+        self._template_stats: dict[str, TemplateStats] = {}
+        self.multi_scale = bool(multi_scale)
+        self.scale_anchor = scale_anchor
+        self.scale_sweep = tuple(float(s) for s in (scale_sweep or DEFAULT_SCALE_SWEEP))
+        self.device_id = device_id
+        self._scale_store = DeviceScaleStore(scale_store) if self.multi_scale and scale_store and device_id else None
+        self.device_scale: Optional[float] = self._scale_store.get(device_id) if self._scale_store else None
+        self.color_prefilter = bool(color_prefilter)
+        self.prefilter_presence_ratio = float(prefilter_presence_ratio)
+        self.prefilter_audit_rate = max(0.0, min(1.0, float(prefilter_audit_rate)))
+        self._color_signatures: dict[tuple[str, Optional[float]], ColorSignature] = {}
+        self._frame_histogram: Optional[tuple[object, object]] = None
+        # Cascade: (frame, {(scale, gray): downscaled frame}) for the last full frame.
+        self._coarse_frames: Optional[tuple[object, dict[tuple[float, bool], object]]] = None
+        self._prefilter_counters = {"checked": 0, "rejected": 0, "audited": 0, "false_rejects": 0}
+        self._backends = build_backends()
+        self.match_backend = match_backend
+        self.templates_backend = templates_backend or {}
+        self._selected_backends: dict[str, str] = {}
+        for name in {match_backend, *self.templates_backend.values()} - {"auto"}:
+            if name not in self._backends:
+                raise ValueError(f"Unknown match backend: {name}")
+        self.template_pack = None
+        if template_pack:
+            self._preload_pack(template_pack)
+        # Bumped once per applied reload; callers can compare it to detect a swap.
+        self.generation = 0
+        # Held by every public match for its whole duration and by the reload
+        # swap, so one match only ever sees a single generation of templates
+        # and config. Pending reloads are applied before the lock is taken.
+        self._reload_lock = threading.RLock()
+        self._reload_counters = {"reloads": 0, "templates_reloaded": 0, "config_reloads": 0, "rejected": 0}
+        self.config_path = config_path
+        self._watcher = FileWatcher(self.templates_dir, config_path, reload_interval_s) if hot_reload else None
 
     def _ensure_cv2(self) -> None:
-        if cv2 is None:
+        if not _cv2:
             raise SoftFail("opencv-python is required for vision operations")
 
     def _resolve_template_path(self, name: str) -> Path:
-        if name in self.template_map:
-            return self.templates_dir / self.template_map[name]
+        return resolve_template_path(self.templates_dir, self.template_map, name)
+
+    def _preload_pack(self, pack_path: str) -> None:
+        """Register every current template of a prebuilt pack as a zero-copy memmap view.
 
-        explicit = self.templates_dir / name
-        if explicit.exists():
-            return explicit
+        Entries whose PNG was edited, removed or remapped since the build are
+        skipped (with a warning) and load from the PNG instead.
+        """
+        from bot.core.template_pack import TemplatePack
 
-        logical = self.templates_dir / f"{name.replace('.', '/')}.png"
-        return logical
+        try:
+            self.template_pack = TemplatePack.open(pack_path)
+        except (OSError, ValueError) as exc:
+            logging.getLogger(__name__).warning("Template pack unavailable (%s); loading PNGs on demand", exc)
+            return
+        for name in self.template_pack.names:
+            reason = self.template_pack.stale_reason(name, self._resolve_template_path(name))
+            if reason is not None:
+                logging.getLogger(__name__).warning("Stale template pack entry %s (%s); loading the PNG", name, reason)
+                continue
+            # Shared memmap pages: not charged to this process' budget.
+            self._templates.put(name, self.template_pack.get(name), size=0)
 
     def load_template(self, name: str):
         self._ensure_cv2()
-        if name in self._templates:
-            return self._templates[name]
+        template = self._templates.get(name)
+        if template is not None:
+            return template
 
         path = self._resolve_template_path(name)
         if not path.exists():
             raise SoftFail(f"Template not found: {path}")
-        template = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        template = _cv2.imread(str(path), _cv2.IMREAD_COLOR)
         if template is None:
             raise SoftFail(f"Unable to read template: {path}")
-        self._templates[name] = template
-        return template
+        return self._templates.put(name, template)
 
     def _resolve_threshold(self, template_name: str, threshold: Optional[float]) -> float:
+        # An explicit call-site threshold is deliberate; otherwise calibrated
+        # values (measured score distributions) beat the configured ones.
         if threshold is not None:
             return float(threshold)
+        if template_name in self.calibrated_confidence:
+            return float(self.calibrated_confidence[template_name])
         if template_name in self.templates_confidence:
             return float(self.templates_confidence[template_name])
         return self.default_confidence
 
-    def _save_debug_bbox(self, screen_path: str, best_match: dict[str, object], template_name: str) -> None:
-        if os.getenv("DEBUG_VISION") != "1" or cv2 is None:
-            return
-        screen = cv2.imread(screen_path, cv2.IMREAD_COLOR)
-        if screen is None:
+    @staticmethod
+    def _screen_label(screen: Screen) -> str:
+        if isinstance(screen, (str, Path)):
+            return Path(screen).stem
+        return f"frame_{datetime.now().strftime('%H%M%S_%f')}"
+
+    def _load_screen(self, screen: Screen):
+        """Return a decoded BGR frame, reading from disk only when given a path."""
+        if isinstance(screen, (str, Path)):
+            frame = self._frame_cache.get_or_decode(screen, lambda path: _cv2.imread(path, _cv2.IMREAD_COLOR))
+            if frame is None:
+                raise SoftFail(f"Unable to read screenshot: {screen}")
+            return frame
+        if screen is None or getattr(screen, "size", 0) == 0:
+            raise SoftFail("Unable to read screenshot: empty frame")
+        return screen
+
+    def frame_cache_stats(self) -> dict[str, float]:
+        """Hit/miss counters and decode time of the screenshot cache."""
+        return self._frame_cache.stats()
+
+    def _save_debug_bbox(self, screen: Screen, frame, best_match: dict[str, object], template_name: str) -> None:
+        if os.getenv("DEBUG_VISION") != "1" or not _cv2:
             return
         p1 = best_match["top_left"]
         p2 = best_match["bottom_right"]
-        cv2.rectangle(screen, p1, p2, (0, 255, 0), 2)
-        cv2.putText(
-            screen,
-            f"{template_name} {best_match['score']:.3f}",
-            (p1[0], max(12, p1[1] - 6)),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.4,
-            (0, 255, 0),
-            1,
-            cv2.LINE_AA,
-        )
+        label = f"{template_name} {best_match['score']:.3f}"
+
+        def render(canvas):
+            _cv2.rectangle(canvas, p1, p2, (0, 255, 0), 2)
+            _cv2.putText(
+                canvas,
+                label,
+                (p1[0], max(12, p1[1] - 6)),
+                _cv2.FONT_HERSHEY_SIMPLEX,
+                0.4,
+                (0, 255, 0),
+                1,
+                _cv2.LINE_AA,
+            )
+            return canvas
+
         debug_dir = Path("runtime") / "vision_debug"
-        debug_dir.mkdir(parents=True, exist_ok=True)
-        debug_path = debug_dir / f"{Path(screen_path).stem}_{template_name.replace('.', '_')}.png"
-        cv2.imwrite(str(debug_path), screen)
+        debug_path = debug_dir / f"{self._screen_label(screen)}_{template_name.replace('.', '_')}.{self.debug_format}"
+        get_artifact_writer().submit(debug_path, frame, render)
 
-    def exists(self, screen_path: str, template_name: str, threshold: Optional[float] = None) -> bool:
+    def exists(self, screen: Screen, template_name: str, threshold: Optional[float] = None) -> bool:
         try:
-            self.match_template(screen_path, template_name, threshold=threshold)
+            self.match_template(screen, template_name, threshold=threshold)
             return True
         except SoftFail:
             return False
 
-    def find_best(self, screen_path: str, template_name: str) -> dict[str, object]:
+    def find_best(self, screen: Screen, template_name: str, threshold: Optional[float] = None) -> dict[str, object]:
         self._ensure_cv2()
-        screen = cv2.imread(screen_path, cv2.IMREAD_COLOR)
-        if screen is None:
-            raise SoftFail(f"Unable to read screenshot: {screen_path}")
+        self.reload_if_changed()
+        with self._reload_lock:
+            return self._find_best(screen, template_name, threshold)
 
-        template = self.load_template(template_name)
-        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    def _find_best(self, screen: Screen, template_name: str, threshold: Optional[float]) -> dict[str, object]:
+        frame, decode_s = self._timed_load(screen)
+        return self._match_frame(screen, frame, template_name, self._resolve_threshold(template_name, threshold), decode_s)
+
+    def _timed_load(self, screen: Screen):
+        started = time.perf_counter()
+        frame = self._load_screen(screen)
+        return frame, time.perf_counter() - started
+
+    def _candidate_rois(self, template_name: str) -> list[tuple[int, int, int, int]]:
+        rois: list[tuple[int, int, int, int]] = []
+        learned = self._learned_rois.get(template_name)
+        if learned is not None:
+            rois.append(learned)
+        static = self.templates_roi.get(template_name)
+        if static:
+            # Static ROIs are written in template (native) coordinates.
+            scale = self.device_scale or 1.0
+            rois.append(tuple(int(round(v * scale)) for v in static))
+        return rois
+
+    def _roi_window(self, roi: tuple[int, int, int, int], frame_shape, template_shape) -> Optional[tuple[int, int, int, int]]:
+        """Pad ``roi`` and clip it to the frame; ``None`` when the template cannot fit."""
+        frame_h, frame_w = frame_shape[:2]
+        tpl_h, tpl_w = template_shape[:2]
+        x, y, w, h = roi
+        pad = self.roi_padding_px
+        x0, y0 = max(0, x - pad), max(0, y - pad)
+        x1, y1 = min(frame_w, x + w + pad), min(frame_h, y + h + pad)
+        if x1 - x0 < tpl_w or y1 - y0 < tpl_h:
+            return None
+        if x0 == 0 and y0 == 0 and x1 == frame_w and y1 == frame_h:
+            return None
+        return x0, y0, x1, y1
+
+    def _match_window(self, frame, template, template_name: str, offset: tuple[int, int] = (0, 0)) -> dict[str, object]:
+        cascade = self._cascade_settings(template_name)
+        if cascade is not None:
+            # ROI windows are fresh slices; only the full frame is worth caching.
+            best = self._match_cascade(frame, template, template_name, cascade, reuse_frame=offset == (0, 0))
+            if best is not None:
+                return self._as_match(best[0], best[1], template, offset)
+
+        backend_key = (template_name, self.device_scale)
+        backend = self._backends[self._backend_name(frame, template, template_name, backend_key)]
+        score, loc = backend.match(frame, template, backend_key)
+        return self._as_match(score, loc, template, offset)
+
+    def _backend_name(self, frame, template, template_name: str, backend_key) -> str:
+        """Configured backend for ``template_name``; ``auto`` is benchmarked on first use."""
+        name = self.templates_backend.get(template_name, self.match_backend)
+        if name != "auto":
+            return name
+        selected = self._selected_backends.get(template_name)
+        if selected is None:
+            selected = select_backend(self._backends, frame, template, backend_key)
+            self._selected_backends[template_name] = selected
+            logging.getLogger(__name__).info("Selected '%s' match backend for %s", selected, template_name)
+        return selected
+
+    def backend_stats(self) -> dict[str, object]:
+        """Backends picked by ``auto`` selection and the FFT spectrum cache counters."""
+        return {"selected": dict(sorted(self._selected_backends.items())), "fft": self._backends["fft"].stats()}
+
+    @staticmethod
+    def _as_match(score: float, loc: tuple[int, int], template, offset: tuple[int, int]) -> dict[str, object]:
         h, w = template.shape[:2]
-        best = {
-            "score": float(max_val),
-            "center": (max_loc[0] + w // 2, max_loc[1] + h // 2),
-            "top_left": max_loc,
-            "bottom_right": (max_loc[0] + w, max_loc[1] + h),
+        top_left = (int(loc[0]) + offset[0], int(loc[1]) + offset[1])
+        return {
+            "score": float(score),
+            "center": (top_left[0] + w // 2, top_left[1] + h // 2),
+            "top_left": top_left,
+            "bottom_right": (top_left[0] + w, top_left[1] + h),
         }
-        self._save_debug_bbox(screen_path, best, template_name)
+
+    def _cascade_settings(self, template_name: str) -> Optional[tuple[float, bool, int]]:
+        raw = self.templates_cascade.get(template_name)
+        if not raw:
+            return None
+        scale = float(raw.get("scale", 0.5))
+        if not 0.0 < scale < 1.0:
+            return None
+        gray = str(raw.get("channels", "gray")) == "gray"
+        candidates = max(1, int(raw.get("candidates", 3)))
+        return scale, gray, candidates
+
+    @staticmethod
+    def _downscale(image, scale: float, gray: bool):
+        if gray and image.ndim == 3:
+            image = _cv2.cvtColor(image, _cv2.COLOR_BGR2GRAY)
+        size = (max(1, round(image.shape[1] * scale)), max(1, round(image.shape[0] * scale)))
+        return _cv2.resize(image, size, interpolation=_cv2.INTER_AREA)
+
+    def _coarse_frame(self, frame, scale: float, gray: bool):
+        """Downscaled ``frame``, computed once per frame and (scale, channels) for every template."""
+        cached = self._coarse_frames
+        if cached is None or cached[0] is not frame:
+            cached = self._coarse_frames = (frame, {})
+        coarse = cached[1].get((scale, gray))
+        if coarse is None:
+            coarse = cached[1][(scale, gray)] = self._downscale(frame, scale, gray)
+        return coarse
+
+    def _match_cascade(
+        self, frame, template, template_name: str, settings: tuple[float, bool, int], reuse_frame: bool = False
+    ) -> Optional[tuple[float, tuple[int, int]]]:
+        """Coarse-to-fine match: downscaled (gray) prefilter, full-res color verify.
+
+        Returns ``(score, top_left)`` in ``frame`` coordinates, or ``None`` when
+        the template is too small to survive the downscale.
+        """
+        scale, gray, candidates = settings
+        coarse_template = self._templates.get_or_create(
+            (template_name, "coarse", scale, gray), lambda: self._downscale(template, scale, gray)
+        )
+        ct_h, ct_w = coarse_template.shape[:2]
+        if ct_h < 4 or ct_w < 4:
+            return None
+
+        coarse_frame = self._coarse_frame(frame, scale, gray) if reuse_frame else self._downscale(frame, scale, gray)
+        if coarse_frame.shape[0] < ct_h or coarse_frame.shape[1] < ct_w:
+            return None
+        coarse = _cv2.matchTemplate(coarse_frame, coarse_template, _cv2.TM_CCOEFF_NORMED)
+
+        frame_h, frame_w = frame.shape[:2]
+        tpl_h, tpl_w = template.shape[:2]
+        radius = int(round(1.0 / scale)) + 2
+        best: Optional[tuple[float, tuple[int, int]]] = None
+        for _ in range(candidates):
+            _, coarse_score, _, coarse_loc = _cv2.minMaxLoc(coarse)
+            if coarse_score <= -1.0:
+                break
+            # Suppress this peak so the next candidate comes from another region.
+            _cv2.rectangle(
+                coarse,
+                (coarse_loc[0] - ct_w // 2, coarse_loc[1] - ct_h // 2),
+                (coarse_loc[0] + ct_w // 2, coarse_loc[1] + ct_h // 2),
+                -1.0,
+                -1,
+            )
+            x = int(round(coarse_loc[0] / scale))
+            y = int(round(coarse_loc[1] / scale))
+            x0, y0 = max(0, x - radius), max(0, y - radius)
+            x1, y1 = min(frame_w, x + tpl_w + radius), min(frame_h, y + tpl_h + radius)
+            if x1 - x0 < tpl_w or y1 - y0 < tpl_h:
+                continue
+            fine = _cv2.matchTemplate(frame[y0:y1, x0:x1], template, _cv2.TM_CCOEFF_NORMED)
+            _, fine_score, _, fine_loc = _cv2.minMaxLoc(fine)
+            if best is None or fine_score > best[0]:
+                best = (float(fine_score), (fine_loc[0] + x0, fine_loc[1] + y0))
         return best
 
-    def match_template(self, screen_path: str, template_name: str, threshold: Optional[float] = None):
-        match_threshold = self._resolve_threshold(template_name, threshold)
-        best = self.find_best(screen_path, template_name)
+    def _match_frame(
+        self, screen: Screen, frame, template_name: str, threshold: float, decode_s: float = 0.0
+    ) -> dict[str, object]:
+        """Match ``template_name`` and record its stats, learned ROI and debug artifact."""
+        best, commit = self._score_frame(screen, frame, template_name, threshold, decode_s)
+        commit()
+        return best
+
+    def _score_frame(
+        self, screen: Screen, frame, template_name: str, threshold: float, decode_s: float = 0.0
+    ) -> tuple[dict[str, object], Callable[[], None]]:
+        """Match inside the learned/static ROIs first, then fall back to the full frame.
+
+        Side effects (ROI counters, learned ROI, template stats, debug image)
+        are returned as ``commit`` instead of applied, so a parallel first-hit
+        ``match_many`` only records the results it actually returns.
+        """
+        started = time.perf_counter()
+        template = self._template_for_frame(frame, template_name, threshold)
+        if self._prefilter_rejects(frame, template, template_name, threshold):
+            best = self._as_match(0.0, (0, 0), template, (0, 0))
+            best["prefiltered"] = True
+            return best, lambda: self._record_template_stats(template_name, best, threshold, decode_s, started)
+
+        def match_roi(window: tuple[int, int, int, int]) -> dict[str, object]:
+            x0, y0, x1, y1 = window
+            return self._match_window(frame[y0:y1, x0:x1], template, template_name, (x0, y0))
+
+        windows = [self._roi_window(roi, frame.shape, template.shape) for roi in self._candidate_rois(template_name)]
+        calls = [(lambda window=window: match_roi(window)) for window in windows if window is not None]
+        roi_counts: list[str] = []
+        best: Optional[dict[str, object]] = None
+        for candidate in self._run_ordered(calls, stop=lambda candidate: candidate["score"] >= threshold):
+            if candidate["score"] >= threshold:
+                roi_counts.append("roi_hits")
+                best = candidate
+                break
+            roi_counts.append("roi_misses")
+
+        if best is None:
+            roi_counts.append("full_frame")
+            best = self._match_window(frame, template, template_name)
+        finished = time.perf_counter()
+
+        def commit() -> None:
+            for key in roi_counts:
+                self._count(self._roi_counters, key)
+            if self.roi_learning and best["score"] >= threshold:
+                h, w = template.shape[:2]
+                self._learned_rois[template_name] = (best["top_left"][0], best["top_left"][1], w, h)
+            self._record_template_stats(template_name, best, threshold, decode_s, started, finished)
+            self._save_debug_bbox(screen, frame, best, template_name)
+
+        return best, commit
+
+    def _record_template_stats(
+        self,
+        template_name: str,
+        best: dict[str, object],
+        threshold: float,
+        decode_s: float,
+        started: float,
+        finished: Optional[float] = None,
+    ) -> None:
+        if not self.collect_template_stats:
+            return
+        elapsed = (finished if finished is not None else time.perf_counter()) - started
+        with self._stats_lock:
+            stats = self._template_stats.get(template_name)
+            if stats is None:
+                stats = self._template_stats[template_name] = TemplateStats()
+            stats.record(best["score"], best["score"] >= threshold, decode_s, elapsed)
+
+    def _count(self, counters: dict[str, int], key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            counters[key] += amount
+
+    def _run_ordered(self, calls: list[Callable[[], T]], stop: Optional[Callable[[T], bool]] = None) -> list[T]:
+        """Run ``calls`` (on the shared match pool when enabled) and return results in call order.
+
+        With ``stop``, the results end at the first one satisfying it and calls
+        not started yet are cancelled, so callers see exactly what a sequential
+        loop with ``break`` would produce.
+        """
+        results: list[T] = []
+        if self.match_workers < 2 or len(calls) < 2 or in_match_pool():
+            for call in calls:
+                results.append(call())
+                if stop is not None and stop(results[-1]):
+                    break
+            return results
+
+        pool = get_match_pool(self.match_workers)
+        futures = [pool.submit(call) for call in calls]
+        self._count(self._parallel_counters, "fanouts")
+        try:
+            for future in futures:
+                results.append(future.result())
+                if stop is not None and stop(results[-1]):
+                    break
+        finally:
+            cancelled = sum(1 for future in futures if future.cancel())
+            if cancelled:
+                self._count(self._parallel_counters, "cancelled", cancelled)
+        return results
+
+    def parallel_stats(self) -> dict[str, int]:
+        """Fan-outs to the match pool and queued matches cancelled by a first hit."""
+        with self._stats_lock:
+            return {**self._parallel_counters, "workers": self.match_workers}
+
+    def _prefilter_rejects(self, frame, template, template_name: str, threshold: float) -> bool:
+        """``True`` when the color signature says ``template`` is likely absent from ``frame``.
+
+        A heuristic (hence opt-in): lighting shifts or colors crossing a bin
+        boundary change the histogram without changing a CCOEFF_NORMED match.
+        A fraction ``prefilter_audit_rate`` of rejections is double-checked with
+        a full match; a template found that way counts as a false reject and is
+        matched normally.
+        """
+        if not self.color_prefilter or frame.ndim != 3 or template.ndim != 3:
+            return False
+        key = (template_name, self.device_scale)
+        signature = self._color_signatures.get(key)
+        if signature is None:
+            signature = self._color_signatures[key] = ColorSignature.from_template(template)
+        if self._frame_histogram is None or self._frame_histogram[0] is not frame:
+            self._frame_histogram = (frame, color_histogram(frame))
+
+        self._count(self._prefilter_counters, "checked")
+        if signature.may_be_in(self._frame_histogram[1], self.prefilter_presence_ratio):
+            return False
+        if self.prefilter_audit_rate and random.random() < self.prefilter_audit_rate:
+            self._count(self._prefilter_counters, "audited")
+            if self._match_window(frame, template, template_name)["score"] >= threshold:
+                self._count(self._prefilter_counters, "false_rejects")
+                logging.getLogger(__name__).warning("Color prefilter wrongly rejected '%s'", template_name)
+                return False
+        self._count(self._prefilter_counters, "rejected")
+        return True
+
+    def prefilter_stats(self) -> dict[str, object]:
+        """How many matches the color prefilter skipped, plus audit results."""
+        counters = self._prefilter_counters
+        reject_rate = counters["rejected"] / counters["checked"] if counters["checked"] else 0.0
+        return {**counters, "reject_rate": round(reject_rate, 3)}
+
+    def _template_for_frame(self, frame, template_name: str, threshold: float):
+        """Native template, or its variant at the device scale in multi-scale mode.
+
+        While the scale is unknown, matching the anchor template runs the scale
+        sweep; every other template is matched natively until then.
+        """
+        template = self.load_template(template_name)
+        if not self.multi_scale:
+            return template
+        if self.device_scale is None:
+            if template_name != self.scale_anchor:
+                return template
+            self._detect_scale(frame, template, threshold)
+            if self.device_scale is None:
+                return template
+        return self._scaled_template(template_name, template, self.device_scale)
+
+    def _scaled_template(self, template_name: str, template, scale: float):
+        if abs(scale - 1.0) < 1e-3:
+            return template
+        h, w = template.shape[:2]
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        interpolation = _cv2.INTER_AREA if scale < 1.0 else _cv2.INTER_LINEAR
+        return self._templates.get_or_create(
+            (template_name, "scaled", scale), lambda: _cv2.resize(template, size, interpolation=interpolation)
+        )
+
+    def _detect_scale(self, frame, template, threshold: float) -> Optional[float]:
+        """Sweep ``scale_sweep`` with the anchor template and keep the best scale."""
+        frame_h, frame_w = frame.shape[:2]
+        best_scale, best_score = None, -1.0
+        for scale in self.scale_sweep:
+            candidate = self._scaled_template(self.scale_anchor, template, scale)
+            h, w = candidate.shape[:2]
+            if h > frame_h or w > frame_w or h < 4 or w < 4:
+                continue
+            _, score, _, _ = _cv2.minMaxLoc(_cv2.matchTemplate(frame, candidate, _cv2.TM_CCOEFF_NORMED))
+            if score > best_score:
+                best_scale, best_score = scale, float(score)
+        if best_scale is None or best_score < threshold:
+            return None
+        logging.getLogger(__name__).info(
+            "Detected template scale %.3f for device %s (score=%.3f)", best_scale, self.device_id or "?", best_score
+        )
+        self.set_device_scale(best_scale)
+        return best_scale
+
+    def set_device_scale(self, scale: float) -> None:
+        """Fix the template scale for this device and persist it when a store is set."""
+        self.device_scale = float(scale)
+        # Geometry learned at another scale no longer applies.
+        self._learned_rois.clear()
+        self._templates.discard(
+            lambda key: isinstance(key, tuple)
+            and (key[1] == "coarse" or (key[1] == "scaled" and key[2] != self.device_scale))
+        )
+        if self._scale_store is not None:
+            try:
+                self._scale_store.set(self.device_id, self.device_scale)
+            except OSError as exc:
+                logging.getLogger(__name__).warning("Unable to persist template scale: %s", exc)
+
+    def scale_stats(self) -> dict[str, object]:
+        """Detected device scale and how many scaled template variants are cached."""
+        variants = self._templates.count(lambda key: isinstance(key, tuple) and key[1] == "scaled")
+        return {"scale": self.device_scale, "variants": variants}
+
+    def template_cache_stats(self) -> dict[str, int]:
+        """Bytes held by cached templates/variants, budget, pins and evictions."""
+        return self._templates.stats()
+
+    def template_stats(self) -> dict[str, dict[str, object]]:
+        """Per-template calls, hit ratio, decode/match time and score histogram."""
+        return {name: stats.as_dict() for name, stats in sorted(self._template_stats.items())}
+
+    def roi_stats(self) -> dict[str, int]:
+        """Counters of ROI hits, ROI misses and full-frame searches."""
+        return {**self._roi_counters, "learned": len(self._learned_rois)}
+
+    def reload_if_changed(self) -> bool:
+        """Apply template/config edits seen by the watcher; ``True`` when something was swapped.
+
+        Cheap between scans (one clock read), so it runs before every match.
+        """
+        if self._watcher is None:
+            return False
+        changed_files, config_changed = self._watcher.poll()
+        if not changed_files and not config_changed:
+            return False
+        return self._apply_reload(changed_files, config_changed)
+
+    def _apply_reload(self, changed_files: set[Path], config_changed: bool) -> bool:
+        logger = logging.getLogger(__name__)
+        config = None
+        if config_changed and self.config_path:
+            from bot.config.loader import load_bot_config
+
+            try:
+                config = load_bot_config(self.config_path)
+            except Exception as exc:  # also YAML syntax errors while the file is being edited
+                logger.warning("Keeping current vision config; unable to reload %s (%s)", self.config_path, exc)
+
+        template_map = (config.templates or {}) if config is not None else self.template_map
+        names = {
+            name
+            for name in template_map.keys() | self.template_map.keys()
+            if template_map.get(name) != self.template_map.get(name)
+        }
+        if changed_files:
+            changed = {path.resolve() for path in changed_files}
+            known = {template_of(key) for key in self._templates.keys()} | template_map.keys()
+            names |= {
+                name
+                for name in known
+                if resolve_template_path(self.templates_dir, template_map, name).resolve() in changed
+            }
+
+        # Decode replacements before touching anything: a half-written or
+        # broken PNG keeps the previous template live.
+        fresh: dict[str, Any] = {}
+        for name in sorted(names):
+            if name not in self._templates:
+                continue
+            path = resolve_template_path(self.templates_dir, template_map, name)
+            image = _cv2.imread(str(path), _cv2.IMREAD_COLOR) if path.exists() else None
+            if image is None:
+                logger.warning("Keeping previous template %s; unable to read %s", name, path)
+                self._reload_counters["rejected"] += 1
+                continue
+            fresh[name] = image
+        stale = {name for name in names if name in fresh or name not in self._templates}
+
+        if config is None and not stale:
+            return False
+        if config is not None:
+            new_confidence = config.templates_confidence or {}
+            shadowed = sorted(
+                name
+                for name in new_confidence.keys() | self.templates_confidence.keys()
+                if name in self.calibrated_confidence and new_confidence.get(name) != self.templates_confidence.get(name)
+            )
+            if shadowed:
+                logger.warning(
+                    "templates_confidence changed for calibrated templates %s; calibrated thresholds still apply",
+                    shadowed,
+                )
+        with self._reload_lock:
+            if config is not None:
+                self.template_map = template_map
+                self.default_confidence = float(config.default_confidence)
+                self.templates_confidence = config.templates_confidence or {}
+                self.templates_roi = config.templates_roi or {}
+                self.templates_cascade = config.templates_cascade or {}
+                self._reload_counters["config_reloads"] += 1
+            self._invalidate_templates(stale)
+            for name, image in fresh.items():
+                self._templates.put(name, image)
+            self._reload_counters["templates_reloaded"] += len(fresh)
+            self._reload_counters["reloads"] += 1
+            self.generation += 1
+        logger.info(
+            "Vision reload #%d: templates=%s config=%s",
+            self.generation,
+            sorted(fresh) or "-",
+            "yes" if config is not None else "no",
+        )
+        return True
+
+    def _invalidate_templates(self, names: set[str]) -> None:
+        """Drop every cached artefact derived from ``names`` (native, variants, signatures, ROIs...)."""
+        if not names:
+            return
+        self._templates.discard(lambda key: template_of(key) in names)
+        self._color_signatures = {key: sig for key, sig in self._color_signatures.items() if key[0] not in names}
+        for name in names:
+            self._learned_rois.pop(name, None)
+            self._selected_backends.pop(name, None)
+        self._backends["fft"].discard(lambda key: key[0] in names)
+
+    def reload_stats(self) -> dict[str, int]:
+        """Current generation and how many hot reloads were applied or rejected."""
+        return {"enabled": self._watcher is not None, "generation": self.generation, **self._reload_counters}
+
+    def match_template(self, screen: Screen, template_name: str, threshold: Optional[float] = None):
+        self._ensure_cv2()
+        self.reload_if_changed()
+        with self._reload_lock:
+            match_threshold = self._resolve_threshold(template_name, threshold)
+            best = self._find_best(screen, template_name, match_threshold)
 
         if best["score"] < match_threshold:
             raise SoftFail(
@@ -127,16 +793,76 @@ class Vision:
             )
         return best
 
+    def match_many(
+        self,
+        screen: Screen,
+        template_names: list[str],
+        threshold: Optional[float] = None,
+        first_hit: bool = False,
+    ) -> ScreenMatches:
+        """Decode ``screen`` once and score every template against it.
+
+        Each result carries the usual ``find_best`` keys plus ``threshold`` and
+        ``matched``. A template that cannot be loaded scores 0.0 (its error is
+        kept under ``error``) instead of aborting the other candidates. With
+        ``first_hit=True`` evaluation stops at the first template (in the given
+        order) that reaches its threshold. With
+        ``match_workers`` > 1 the templates are scored on the shared match pool;
+        results keep the given order either way.
+        """
+        self._ensure_cv2()
+        self.reload_if_changed()
+        with self._reload_lock:
+            return self._match_many(screen, template_names, threshold, first_hit)
+
+    def _match_many(
+        self, screen: Screen, template_names: list[str], threshold: Optional[float], first_hit: bool
+    ) -> ScreenMatches:
+        frame, decode_s = self._timed_load(screen)
+
+        def evaluate(template_name: str, template_decode_s: float) -> tuple[dict[str, object], Callable[[], None]]:
+            match_threshold = self._resolve_threshold(template_name, threshold)
+            commit: Callable[[], None] = lambda: None
+            try:
+                best, commit = self._score_frame(screen, frame, template_name, match_threshold, template_decode_s)
+            except SoftFail as exc:
+                # Missing/unreadable template: absent, as with ``exists``.
+                best = {"score": 0.0, "center": (0, 0), "top_left": (0, 0), "bottom_right": (0, 0), "error": str(exc)}
+            best["threshold"] = match_threshold
+            best["matched"] = best["score"] >= match_threshold
+            return best, commit
+
+        # The single decode is charged to the first template evaluated.
+        calls = [
+            (lambda name=name, index=index: evaluate(name, decode_s if index == 0 else 0.0))
+            for index, name in enumerate(template_names)
+        ]
+        scored = self._run_ordered(calls, stop=(lambda item: item[0]["matched"]) if first_hit else None)
+        # Matches still running past a first hit are dropped by _run_ordered;
+        # only the returned ones record stats and learned ROIs.
+        for _, commit in scored:
+            commit()
+        return ScreenMatches(results={name: best for name, (best, _) in zip(template_names, scored)})
+
+    def classify(
+        self,
+        screen: Screen,
+        candidates: list[str],
+        threshold: Optional[float] = None,
+    ) -> Optional[str]:
+        """Return the first candidate template present on ``screen`` (or ``None``)."""
+        return self.match_many(screen, candidates, threshold=threshold, first_hit=True).first_hit
+
     def click_template(
         self,
-        capture_fn: Callable[[], str],
+        capture_fn: Callable[[], Screen],
         adb: object,
         template_name: str,
         threshold: Optional[float] = None,
         logger: Optional[logging.Logger] = None,
     ) -> dict[str, object]:
-        screen_path = capture_fn()
-        result = self.match_template(screen_path, template_name=template_name, threshold=threshold)
+        screen = capture_fn()
+        result = self.match_template(screen, template_name=template_name, threshold=threshold)
         center_x, center_y = result["center"]
         adb.tap(center_x, center_y)
         (logger or logging.getLogger(__name__)).info(
@@ -150,28 +876,87 @@ class Vision:
 
     def wait_for(
         self,
-        capture_fn: Callable[[], str],
+        capture_fn: Callable[[], Screen],
         template_name: str,
         timeout_s: int = 15,
         interval_s: float = 0.5,
         threshold: Optional[float] = None,
+        schedule: ScheduleSpec = None,
     ) -> dict[str, object]:
-        deadline = time.monotonic() + timeout_s
+        """Poll ``capture_fn`` until ``template_name`` matches or ``timeout_s`` expires.
+
+        ``schedule`` picks the sleep between polls (see ``bot.core.polling``);
+        by default it is a fixed ``interval_s``. When ``capture_fn`` exposes a
+        ``sequence`` (a frame source), a frame already rejected is not matched
+        again.
+        """
+        poll = build_schedule(schedule, interval_s, self.appearance_history, template_name)
+        started = time.monotonic()
+        deadline = started + timeout_s
         last_error: Optional[Exception] = None
+        previous_signature = None
+        previous_sequence = None
+        attempt = 0
 
         while time.monotonic() < deadline:
-            screen_path = capture_fn()
             try:
-                return self.match_template(screen_path, template_name, threshold=threshold)
+                screen = capture_fn()
+                sequence = getattr(capture_fn, "sequence", None)
+                if last_error is not None and sequence is not None and sequence == previous_sequence:
+                    # Same streamed frame as the last negative poll: nothing new to match.
+                    self._wait_counters["skipped_matches"] += 1
+                    self._sleep_poll(poll, attempt, started, deadline)
+                    attempt += 1
+                    continue
+                previous_sequence = sequence
+                signature = None
+                if self.skip_unchanged_frames:
+                    self._ensure_cv2()
+                    signature = self._frame_signature(self._load_screen(screen))
+                    if last_error is not None and self._same_signature(previous_signature, signature):
+                        # Same picture as the last negative poll: reuse that result.
+                        self._wait_counters["skipped_matches"] += 1
+                        self._sleep_poll(poll, attempt, started, deadline)
+                        attempt += 1
+                        continue
+                previous_signature = signature
+                self._wait_counters["matches"] += 1
+                result = self.match_template(screen, template_name, threshold=threshold)
+                self.appearance_history.record(template_name, time.monotonic() - started)
+                return result
             except SoftFail as exc:
                 last_error = exc
-                time.sleep(interval_s)
+                self._sleep_poll(poll, attempt, started, deadline)
+                attempt += 1
 
         raise SoftFail(f"Timeout waiting for template '{template_name}': {last_error}")
 
+    @staticmethod
+    def _sleep_poll(poll: PollSchedule, attempt: int, started: float, deadline: float) -> None:
+        now = time.monotonic()
+        delay = min(poll.interval(attempt, now - started), max(0.0, deadline - now))
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def _frame_signature(frame):
+        """Downsampled grayscale thumbnail used to detect unchanged frames cheaply."""
+        gray = _cv2.cvtColor(frame, _cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return _cv2.resize(gray, _SIGNATURE_SIZE, interpolation=_cv2.INTER_AREA)
+
+    def _same_signature(self, previous, current) -> bool:
+        if previous is None or current is None or previous.shape != current.shape:
+            return False
+        _, max_diff, _, _ = _cv2.minMaxLoc(_cv2.absdiff(previous, current))
+        return max_diff <= self.unchanged_tolerance
+
+    def wait_stats(self) -> dict[str, int]:
+        """How many wait_for polls ran a match vs. reused the previous negative."""
+        return dict(self._wait_counters)
+
     def wait_and_click(
         self,
-        capture_fn: Callable[[], str],
+        capture_fn: Callable[[], Screen],
         adb: object,
         template_name: str,
         timeout_s: int = 15,
@@ -180,6 +965,7 @@ class Vision:
         logger: Optional[logging.Logger] = None,
         jitter_px: int = 0,
         post_sleep_s: float = 0.15,
+        schedule: ScheduleSpec = None,
     ) -> dict[str, object]:
         result = self.wait_for(
             capture_fn,
@@ -187,6 +973,7 @@ class Vision:
             timeout_s=timeout_s,
             interval_s=interval_s,
             threshold=threshold,
+            schedule=schedule,
         )
         center_x, center_y = result["center"]
         if jitter_px > 0:
@@ -0,0 +1,420 @@
+"""Optional host-wide vision server shared by every device worker.
+
+With ``vision_server: true`` the parent process of ``run_parallel`` starts one
+server process that owns the templates (one shared :class:`TemplateCache`) and
+does all matching. Each device worker gets a :class:`VisionClient` and a
+:class:`RemoteVision` that keeps the ``Vision`` API, so steps do not change:
+
+* frames are decoded locally and copied into the worker's shared-memory slot
+  (created by the parent); only a small request tuple goes through the queue;
+* the server drains up to ``batch_max`` requests (waiting at most
+  ``batch_window_s`` after the first one), groups those asking for the same
+  templates and scores them template by template, so each template's data
+  stays hot while it is matched against every frame of the group;
+* results come back on a per-worker response queue.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import time
+from dataclasses import dataclass
+from multiprocessing import Process, Queue
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+from bot.core.artifacts import flush_artifacts
+from bot.core.exceptions import SoftFail
+from bot.core.lazy_import import LazyModule
+from bot.core.template_cache import TemplateCache
+from bot.core.vision import Screen, ScreenMatches, Vision
+
+np = LazyModule("numpy")
+
+# Stats collected from the server-side Vision of a device for ``RemoteVision``.
+_REMOTE_STATS = (
+    "roi_stats",
+    "scale_stats",
+    "prefilter_stats",
+    "backend_stats",
+    "template_cache_stats",
+    "parallel_stats",
+)
+
+
+@dataclass(slots=True)
+class VisionRequest:
+    worker_id: int
+    request_id: int
+    device_id: str
+    op: str
+    template_names: tuple[str, ...] = ()
+    threshold: Optional[float] = None
+    first_hit: bool = False
+    shape: Optional[tuple[int, ...]] = None
+    dtype: str = "|u1"
+    inline: Optional[bytes] = None
+
+
+class VisionClient:
+    """Worker side of the IPC channel; one request in flight at a time.
+
+    A request that timed out may still be read by the server later, so its
+    frame slot stays reserved until the late reply arrives: frames sent
+    meanwhile go inline through the queue instead of overwriting the slot.
+    """
+
+    def __init__(
+        self,
+        worker_id: int,
+        requests: Queue,
+        responses: Queue,
+        slot_name: str,
+        slot_bytes: int,
+        timeout_s: float = 30.0,
+    ) -> None:
+        self.worker_id = worker_id
+        self.requests = requests
+        self.responses = responses
+        self.slot_name = slot_name
+        self.slot_bytes = int(slot_bytes)
+        self.timeout_s = float(timeout_s)
+        self._slot: Optional[SharedMemory] = None
+        self._next_id = 0
+        # Timed-out requests whose frame is in the slot and whose reply is pending.
+        self._slot_pending: set[int] = set()
+        self.counters = {"requests": 0, "inline_frames": 0, "slot_busy": 0, "late_replies": 0, "wait_s": 0.0}
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_slot"] = None
+        return state
+
+    def _slot_buffer(self):
+        if self._slot is None:
+            self._slot = SharedMemory(name=self.slot_name)
+        return self._slot.buf
+
+    def _drop_late(self, request_id: int) -> None:
+        self.counters["late_replies"] += 1
+        self._slot_pending.discard(request_id)
+
+    def _slot_free(self) -> bool:
+        """Collect late replies already queued; ``True`` once no timed-out request holds the slot."""
+        while self._slot_pending:
+            try:
+                request_id, _, _ = self.responses.get_nowait()
+            except queue.Empty:
+                return False
+            self._drop_late(request_id)
+        return True
+
+    def call(
+        self,
+        op: str,
+        device_id: str,
+        frame=None,
+        template_names: tuple[str, ...] = (),
+        threshold: Optional[float] = None,
+        first_hit: bool = False,
+    ) -> Any:
+        self._next_id += 1
+        request = VisionRequest(self.worker_id, self._next_id, device_id, op, tuple(template_names), threshold, first_hit)
+        if frame is not None:
+            frame = np.ascontiguousarray(frame)
+            request.shape, request.dtype = tuple(frame.shape), frame.dtype.str
+            fits = frame.nbytes <= self.slot_bytes
+            if fits and self._slot_free():
+                np.ndarray(frame.shape, dtype=frame.dtype, buffer=self._slot_buffer())[...] = frame
+            else:
+                request.inline = frame.tobytes()
+                self.counters["inline_frames"] += 1
+                self.counters["slot_busy"] += fits
+
+        started = time.perf_counter()
+        self.requests.put(request)
+        self.counters["requests"] += 1
+        deadline = time.monotonic() + self.timeout_s
+        while True:
+            try:
+                request_id, ok, payload = self.responses.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                if request.shape is not None and request.inline is None:
+                    self._slot_pending.add(request.request_id)
+                raise SoftFail(f"Vision server did not answer within {self.timeout_s:.0f}s") from None
+            if request_id == request.request_id:
+                break
+            # A reply to a request that already timed out: drop it.
+            self._drop_late(request_id)
+        self.counters["wait_s"] += time.perf_counter() - started
+        if not ok:
+            raise SoftFail(payload)
+        return payload
+
+    def close(self) -> None:
+        if self._slot is not None:
+            self._slot.close()
+            self._slot = None
+
+
+class RemoteVision(Vision):
+    """``Vision`` whose matching runs on the vision server.
+
+    Screens are decoded (and ``wait_for`` unchanged-frame checks run) in the
+    worker; thresholds resolve locally exactly as in ``Vision``, so the same
+    Vision kwargs must be passed here and to the server.
+    """
+
+    def __init__(self, client: VisionClient, **vision_kwargs: Any) -> None:
+        local = {
+            **vision_kwargs,
+            "template_pack": None,
+            "multi_scale": False,
+            "color_prefilter": False,
+            "template_stats": False,
+            "match_workers": 0,
+        }
+        super().__init__(**local)
+        self.client = client
+
+    # The public find_best/match_many/match_template of ``Vision`` apply
+    # reloads (thresholds resolve here, so config edits must reach this side
+    # too) and hold the reload lock around these.
+    def _find_best(self, screen: Screen, template_name: str, threshold: Optional[float]) -> dict[str, object]:
+        return self._match_many(screen, [template_name], threshold, False).results[template_name]
+
+    def _match_many(
+        self, screen: Screen, template_names: list[str], threshold: Optional[float], first_hit: bool
+    ) -> ScreenMatches:
+        frame = self._load_screen(screen)
+        results = self.client.call("match", self.device_id, frame, tuple(template_names), threshold, first_hit)
+        return ScreenMatches(results=results)
+
+    def template_stats(self) -> dict[str, dict[str, object]]:
+        return self.client.call("stats", self.device_id).get("template", {})
+
+    # Matching happens on the server, so the matching stats come from there
+    # (the local Vision's counters would stay at zero).
+    def _server_stats(self, key: str) -> dict[str, object]:
+        return self.client.call("stats", self.device_id)[key]
+
+    def roi_stats(self) -> dict[str, object]:
+        return self._server_stats("roi")
+
+    def scale_stats(self) -> dict[str, object]:
+        return self._server_stats("scale")
+
+    def prefilter_stats(self) -> dict[str, object]:
+        return self._server_stats("prefilter")
+
+    def backend_stats(self) -> dict[str, object]:
+        return self._server_stats("backend")
+
+    def template_cache_stats(self) -> dict[str, object]:
+        return self._server_stats("template_cache")
+
+    def parallel_stats(self) -> dict[str, object]:
+        return self._server_stats("parallel")
+
+    def remote_stats(self) -> dict[str, object]:
+        """Server counters plus the client's IPC counters."""
+        stats = self.client.call("stats", self.device_id)
+        return {
+            "server": stats["server"],
+            "client": {**self.client.counters, "wait_s": round(self.client.counters["wait_s"], 3)},
+        }
+
+
+class VisionServer:
+    """Owns one Vision per device (sharing a template cache) and answers batches."""
+
+    def __init__(
+        self,
+        vision_kwargs: dict[str, Any],
+        slot_names: Optional[list[str]] = None,
+        batch_max: int = 8,
+        batch_window_s: float = 0.002,
+    ) -> None:
+        self.vision_kwargs = dict(vision_kwargs)
+        self.slot_names = list(slot_names or [])
+        self.batch_max = max(1, int(batch_max))
+        self.batch_window_s = max(0.0, float(batch_window_s))
+        self.templates = TemplateCache(
+            int(self.vision_kwargs.get("template_cache_bytes", 0)),
+            self.vision_kwargs.get("pinned_templates") or [self.vision_kwargs.get("scale_anchor", "home.tela_home")],
+        )
+        self._visions: dict[str, Vision] = {}
+        self._slots: dict[int, SharedMemory] = {}
+        self.counters = {"batches": 0, "requests": 0, "grouped": 0}
+
+    def _vision_for(self, device_id: str) -> Vision:
+        vision = self._visions.get(device_id)
+        if vision is None:
+            vision = Vision(**self.vision_kwargs, device_id=device_id, template_cache=self.templates)
+            self._visions[device_id] = vision
+        return vision
+
+    def _frame(self, request: VisionRequest):
+        dtype = np.dtype(request.dtype)
+        if request.inline is not None:
+            return np.frombuffer(request.inline, dtype=dtype).reshape(request.shape)
+        slot = self._slots.get(request.worker_id)
+        if slot is None:
+            slot = self._slots[request.worker_id] = SharedMemory(name=self.slot_names[request.worker_id])
+        # Copied out of the slot: the Vision keeps frames past the reply (prefilter
+        # histogram, cascade and FFT caches, queued debug images), and a live
+        # view would show the worker's next frame or outlive slot.close().
+        return np.ndarray(request.shape, dtype=dtype, buffer=slot.buf).copy()
+
+    def _stats(self, device_id: str) -> dict[str, Any]:
+        vision = self._vision_for(device_id)
+        stats = {name.removesuffix("_stats"): getattr(vision, name)() for name in _REMOTE_STATS}
+        stats["template"] = vision.template_stats()
+        stats["server"] = dict(self.counters)
+        return stats
+
+    def handle_batch(self, batch: list[VisionRequest]) -> list[tuple[int, tuple[int, bool, Any]]]:
+        """Answer every request of ``batch``; returns ``(worker_id, response)`` pairs."""
+        self.counters["batches"] += 1
+        self.counters["requests"] += len(batch)
+        responses: list[tuple[int, tuple[int, bool, Any]]] = []
+        groups: dict[tuple[str, ...], list[VisionRequest]] = {}
+        for request in batch:
+            if request.op == "stats":
+                responses.append((request.worker_id, (request.request_id, True, self._stats(request.device_id))))
+            elif request.op == "match":
+                groups.setdefault(request.template_names, []).append(request)
+            else:
+                responses.append((request.worker_id, (request.request_id, False, f"Unknown op: {request.op}")))
+
+        for template_names, group in groups.items():
+            if len(group) > 1:
+                self.counters["grouped"] += len(group)
+            frames = {}
+            results: dict[int, dict[str, dict[str, object]]] = {id(request): {} for request in group}
+            errors: dict[int, str] = {}
+            done: set[int] = set()
+            for template_name in template_names:
+                for request in group:
+                    key = id(request)
+                    if key in done:
+                        continue
+                    try:
+                        if key not in frames:
+                            frames[key] = self._frame(request)
+                        vision = self._vision_for(request.device_id)
+                        best = vision.match_many(frames[key], [template_name], threshold=request.threshold)
+                    except SoftFail as exc:
+                        errors[key] = exc.message
+                        done.add(key)
+                        continue
+                    results[key][template_name] = best.results[template_name]
+                    if request.first_hit and best.hit(template_name):
+                        done.add(key)
+            for request in group:
+                key = id(request)
+                if key in errors:
+                    responses.append((request.worker_id, (request.request_id, False, errors[key])))
+                else:
+                    responses.append((request.worker_id, (request.request_id, True, results[key])))
+        return responses
+
+    def serve(self, requests: Queue, responses: list[Queue]) -> None:
+        """Answer requests until a ``None`` sentinel arrives."""
+        running = True
+        while running:
+            first = requests.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.batch_window_s
+            while len(batch) < self.batch_max:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = requests.get(timeout=remaining) if remaining > 0 else requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            try:
+                replies = self.handle_batch(batch)
+            except Exception as exc:  # noqa: BLE001 - never leave a worker waiting
+                logging.getLogger(__name__).exception("Vision server batch failed")
+                replies = [(request.worker_id, (request.request_id, False, str(exc))) for request in batch]
+            for worker_id, reply in replies:
+                responses[worker_id].put(reply)
+        # Debug images are written in the background; finish them before exiting.
+        flush_artifacts()
+        for slot in self._slots.values():
+            slot.close()
+
+
+def _serve(
+    vision_kwargs: dict[str, Any],
+    slot_names: list[str],
+    requests: Queue,
+    responses: list[Queue],
+    batch_max: int,
+    batch_window_s: float,
+) -> None:
+    VisionServer(vision_kwargs, slot_names, batch_max, batch_window_s).serve(requests, responses)
+
+
+class VisionServerHandle:
+    """Parent-side owner of the server process, its queues and the frame slots."""
+
+    def __init__(
+        self,
+        vision_kwargs: dict[str, Any],
+        workers: int,
+        batch_max: int = 8,
+        batch_window_s: float = 0.002,
+        slot_bytes: int = 2560 * 1440 * 3,
+    ) -> None:
+        self.slot_bytes = int(slot_bytes)
+        self.requests: Queue = Queue()
+        self.responses: list[Queue] = [Queue() for _ in range(workers)]
+        self.slots = [SharedMemory(create=True, size=self.slot_bytes) for _ in range(workers)]
+        self.process = Process(
+            target=_serve,
+            args=(vision_kwargs, [slot.name for slot in self.slots], self.requests, self.responses, batch_max, batch_window_s),
+            name="vision-server",
+            daemon=True,
+        )
+
+    def start(self) -> "VisionServerHandle":
+        self.process.start()
+        return self
+
+    def client(self, worker_id: int, timeout_s: float = 30.0) -> VisionClient:
+        return VisionClient(
+            worker_id,
+            self.requests,
+            self.responses[worker_id],
+            self.slots[worker_id].name,
+            self.slot_bytes,
+            timeout_s,
+        )
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        self.requests.put(None)
+        self.process.join(timeout_s)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout_s)
+        for slot in self.slots:
+            slot.close()
+            slot.unlink()
+
+
+def start_vision_server(
+    vision_kwargs: dict[str, Any],
+    workers: int,
+    batch_max: int = 8,
+    batch_window_s: float = 0.002,
+    slot_bytes: int = 2560 * 1440 * 3,
+) -> VisionServerHandle:
+    return VisionServerHandle(vision_kwargs, workers, batch_max, batch_window_s, slot_bytes).start()
@@ -0,0 +1,50 @@
+"""Cheap per-template counters for Vision (calls, timings, score histogram)."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+# Bucket lower edges; denser near the usual 0.85-0.95 thresholds so templates
+# sitting right on their threshold stand out.
+SCORE_BUCKETS = (0.0, 0.5, 0.7, 0.8, 0.85, 0.88, 0.9, 0.92, 0.95, 0.98)
+
+
+def bucket_labels() -> list[str]:
+    labels = ["<0.0"]
+    for index, low in enumerate(SCORE_BUCKETS):
+        high = SCORE_BUCKETS[index + 1] if index + 1 < len(SCORE_BUCKETS) else 1.0
+        labels.append(f"{low:.2f}-{high:.2f}")
+    return labels
+
+
+@dataclass(slots=True)
+class TemplateStats:
+    calls: int = 0
+    hits: int = 0
+    misses: int = 0
+    decode_s: float = 0.0
+    match_s: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(SCORE_BUCKETS) + 1))
+
+    def record(self, score: float, matched: bool, decode_s: float, match_s: float) -> None:
+        self.calls += 1
+        if matched:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.decode_s += decode_s
+        self.match_s += match_s
+        self.histogram[bisect_right(SCORE_BUCKETS, score)] += 1
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / self.calls, 3) if self.calls else 0.0,
+            "decode_ms": round(self.decode_s * 1000.0, 3),
+            "match_ms": round(self.match_s * 1000.0, 3),
+            "avg_match_ms": round(self.match_s * 1000.0 / self.calls, 3) if self.calls else 0.0,
+            "histogram": {label: count for label, count in zip(bucket_labels(), self.histogram) if count},
+        }
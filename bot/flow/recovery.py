@@ -3,20 +3,20 @@
 from __future__ import annotations
 
 import time
-from typing import Callable
+from typing import Any, Callable
 
 from bot.core.exceptions import SoftFail
 from bot.core.template_ids import T_HOME_BUTTON, T_HOME_SCREEN
 from bot.flow.step_base import StepContext
 
 
-def recover_to_home(context: StepContext, capture_fn: Callable[[], str], back_limit: int = 3) -> bool:
+def recover_to_home(context: StepContext, capture_fn: Callable[[], Any], back_limit: int = 3) -> bool:
     context.logger.info("Recovery para home iniciado (limite BACK=%d)", back_limit)
     for _ in range(back_limit):
         context.adb.keyevent(4)  # KEYCODE_BACK
         time.sleep(0.4)
-        screen_path = capture_fn()
-        if context.vision.exists(screen_path, T_HOME_SCREEN, threshold=0.88):
+        screen = capture_fn()
+        if context.vision.exists(screen, T_HOME_SCREEN):
             context.logger.info("Recovery concluiu em home via BACK")
             return True
 
@@ -25,12 +25,11 @@ def recover_to_home(context: StepContext, capture_fn: Callable[[], str], back_li
             capture_fn=capture_fn,
             adb=context.adb,
             template_name=T_HOME_BUTTON,
-            threshold=0.88,
             logger=context.logger,
         )
         time.sleep(0.4)
-        screen_path = capture_fn()
-        if context.vision.exists(screen_path, T_HOME_SCREEN, threshold=0.88):
+        screen = capture_fn()
+        if context.vision.exists(screen, T_HOME_SCREEN):
             context.logger.info("Recovery concluiu em home via botão")
             return True
     except SoftFail:
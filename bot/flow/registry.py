@@ -0,0 +1,33 @@
+"""Production steps in execution order, imported only when the runner reaches them."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Iterator
+
+from bot.flow.step_base import Step
+
+# (module, class) per step; keeping names here instead of imports lets the
+# runner (and every spawned worker) start without loading the whole flow.
+STEP_REGISTRY: tuple[tuple[str, str], ...] = (
+    ("bot.flow.step_01_home", "Step01Home"),
+    ("bot.flow.step_02_roleta", "Step02Roleta"),
+    ("bot.flow.step_03_confirm_home", "Step03ConfirmHome"),
+    ("bot.flow.step_04_amigos", "Step04Amigos"),
+    ("bot.flow.step_05_roleta_principal", "Step05RoletaPrincipal"),
+    ("bot.flow.step_06_noko_box", "Step06NokoBox"),
+    ("bot.flow.step_07_vpn", "Step07VPN"),
+    ("bot.flow.step_08_chrome_bonus", "Step08ChromeBonus"),
+    ("bot.flow.step_09_bonus_collect", "Step09BonusCollect"),
+    ("bot.flow.step_10_finalize", "Step10Finalize"),
+)
+
+
+def load_step(module_name: str, class_name: str) -> type[Step]:
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def iter_steps() -> Iterator[Step]:
+    """Instantiate the registered steps one at a time, importing each on demand."""
+    for module_name, class_name in STEP_REGISTRY:
+        yield load_step(module_name, class_name)()
@@ -8,7 +8,7 @@ import time
 from bot.core.exceptions import CriticalFail, Reason, SoftFail
 from bot.core.template_ids import T_ERROR_APP_CRASH, T_ERROR_CONN, T_HOME_SCREEN
 from bot.flow.recovery import recover_to_home
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step01Home(Step):
@@ -20,9 +20,9 @@ class Step01Home(Step):
         max_attempts = int(step_cfg.get("max_attempts", 3))
         timeout_s = int(step_cfg.get("home_timeout_s", 12))
         retries_back = int(step_cfg.get("recovery_back_limit", 3))
+        poll = step_cfg.get("poll")
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
         for attempt in range(1, max_attempts + 1):
             context.logger.info(
@@ -35,7 +35,7 @@ class Step01Home(Step):
             )
             context.adb.start_app(context.config["app_package"], context.config["app_activity"])
             try:
-                result = context.vision.wait_for(capture, template_name=T_HOME_SCREEN, timeout_s=timeout_s)
+                result = context.vision.wait_for(capture, template_name=T_HOME_SCREEN, timeout_s=timeout_s, schedule=poll)
                 context.logger.info(
                     "[inst=%s][step=%s][attempt=%d] Home detectado com score %.3f em %s",
                     context.instance_id,
@@ -53,8 +53,8 @@ class Step01Home(Step):
                     attempt,
                 )
 
-            screen_path = capture()
-            if context.vision.exists(screen_path, T_ERROR_CONN, threshold=0.88):
+            error_state = context.vision.classify(capture(), [T_ERROR_CONN, T_ERROR_APP_CRASH])
+            if error_state == T_ERROR_CONN:
                 context.logger.warning(
                     "[inst=%s][step=%s][attempt=%d] Popup de erro de conexão detectado; tentando fechar",
                     context.instance_id,
@@ -65,7 +65,7 @@ class Step01Home(Step):
                 time.sleep(0.5)
                 continue
 
-            if context.vision.exists(screen_path, T_ERROR_APP_CRASH, threshold=0.88):
+            if error_state == T_ERROR_APP_CRASH:
                 context.logger.error(
                     "[inst=%s][step=%s][attempt=%d] Crash detectado; relançando app",
                     context.instance_id,
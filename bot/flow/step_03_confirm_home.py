@@ -6,7 +6,7 @@ from pathlib import Path
 
 from bot.core.exceptions import CriticalFail
 from bot.flow.recovery import recover_to_home
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step03ConfirmHome(Step):
@@ -15,8 +15,7 @@ class Step03ConfirmHome(Step):
     def run(self, context: StepContext) -> None:
         screenshot_path = Path("runtime") / context.instance_id / "step_03_confirm_home.png"
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
         back_limit = int(context.config.get("step_03", {}).get("recovery_back_limit", 3))
         if not recover_to_home(context, capture, back_limit=back_limit):
@@ -15,7 +15,7 @@ from bot.core.template_ids import (
     T_HOME_SCREEN,
 )
 from bot.flow.recovery import recover_to_home
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step04Amigos(Step):
@@ -30,28 +30,28 @@ class Step04Amigos(Step):
         max_interactions = int(cfg.get("max_interactions", 20))
         enter_retries = int(cfg.get("enter_retries", 2))
         jitter_px = int(cfg.get("click_jitter_px", 0))
+        poll = cfg.get("poll")
 
         stats = context.metrics.setdefault(
             self.name,
             {"cycles": 0, "collected": 0, "sent": 0, "interactions": 0, "enter_attempts": 0},
         )
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
         for cycle in range(1, cycles + 1):
             stats["cycles"] += 1
             context.logger.info("[inst=%s][step=%s][cycle=%d] Entrando em Amigos", context.instance_id, self.name, cycle)
 
-            if not self._enter_amigos(context, capture, timeout_enter, enter_retries, jitter_px, stats):
+            if not self._enter_amigos(context, capture, timeout_enter, enter_retries, jitter_px, stats, poll):
                 raise SoftFail(f"{self.name}: não foi possível abrir Amigos no ciclo {cycle}")
 
-            self._loop_presentes(context, capture, timeout_loop, max_interactions, jitter_px, stats, cycle)
+            self._loop_presentes(context, capture, timeout_loop, max_interactions, jitter_px, stats, cycle, poll)
 
             if not recover_to_home(context, capture, back_limit=3):
                 raise CriticalFail(f"{self.name}: travado fora da Home após ciclo {cycle}")
 
-    def _enter_amigos(self, context: StepContext, capture, timeout_enter: int, enter_retries: int, jitter_px: int, stats: dict) -> bool:
+    def _enter_amigos(self, context: StepContext, capture, timeout_enter: int, enter_retries: int, jitter_px: int, stats: dict, poll=None) -> bool:
         for attempt in range(1, enter_retries + 1):
             stats["enter_attempts"] += 1
             try:
@@ -60,11 +60,11 @@ class Step04Amigos(Step):
                     context.adb,
                     T_AMIGOS_ENTRAR,
                     timeout_s=timeout_enter,
-                    threshold=0.88,
                     logger=context.logger,
                     jitter_px=jitter_px,
+                    schedule=poll,
                 )
-                context.vision.wait_for(capture, T_AMIGOS_TELA, timeout_s=timeout_enter, threshold=0.88)
+                context.vision.wait_for(capture, T_AMIGOS_TELA, timeout_s=timeout_enter, schedule=poll)
                 context.logger.info(
                     "[inst=%s][step=%s][attempt=%d] Tela Amigos confirmada",
                     context.instance_id,
@@ -83,43 +83,46 @@ class Step04Amigos(Step):
                 recover_to_home(context, capture, back_limit=2)
         return False
 
-    def _loop_presentes(self, context: StepContext, capture, timeout_loop: int, max_interactions: int, jitter_px: int, stats: dict, cycle: int) -> None:
+    def _loop_presentes(self, context: StepContext, capture, timeout_loop: int, max_interactions: int, jitter_px: int, stats: dict, cycle: int, poll=None) -> None:
         deadline = monotonic() + timeout_loop
         while monotonic() < deadline and stats["interactions"] < max_interactions:
-            screen = capture()
-            if context.vision.exists(screen, T_AMIGOS_SEM_PRESENTES, threshold=0.88):
+            state = context.vision.classify(
+                capture(),
+                [T_AMIGOS_SEM_PRESENTES, T_AMIGOS_RECOLHER, T_AMIGOS_ENVIAR, T_HOME_SCREEN],
+            )
+            if state == T_AMIGOS_SEM_PRESENTES:
                 context.logger.info("[inst=%s][step=%s][cycle=%d] Sem presentes restantes", context.instance_id, self.name, cycle)
                 return
 
-            if context.vision.exists(screen, T_AMIGOS_RECOLHER, threshold=0.88):
+            if state == T_AMIGOS_RECOLHER:
                 context.vision.wait_and_click(
                     capture,
                     context.adb,
                     T_AMIGOS_RECOLHER,
                     timeout_s=2,
-                    threshold=0.88,
                     logger=context.logger,
                     jitter_px=jitter_px,
+                    schedule=poll,
                 )
                 stats["collected"] += 1
                 stats["interactions"] += 1
                 continue
 
-            if context.vision.exists(screen, T_AMIGOS_ENVIAR, threshold=0.88):
+            if state == T_AMIGOS_ENVIAR:
                 context.vision.wait_and_click(
                     capture,
                     context.adb,
                     T_AMIGOS_ENVIAR,
                     timeout_s=2,
-                    threshold=0.88,
                     logger=context.logger,
                     jitter_px=jitter_px,
+                    schedule=poll,
                 )
                 stats["sent"] += 1
                 stats["interactions"] += 1
                 continue
 
-            if context.vision.exists(screen, T_HOME_SCREEN, threshold=0.88):
+            if state == T_HOME_SCREEN:
                 raise CriticalFail(f"{self.name}: saiu inesperadamente de Amigos para Home durante loop")
 
             break
@@ -12,7 +12,7 @@ from bot.core.template_ids import (
     T_RULETA_SAIR,
 )
 from bot.flow.recovery import recover_to_home
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step05RoletaPrincipal(Step):
@@ -24,36 +24,36 @@ class Step05RoletaPrincipal(Step):
         spins = int(cfg.get("spins", 2))
         spin_timeout = int(cfg.get("spin_timeout", 6))
         result_timeout = int(cfg.get("result_timeout", 10))
+        poll = cfg.get("poll")
 
         stats = context.metrics.setdefault(
             self.name,
             {"spins_done": 0, "timeouts": 0, "recoveries": 0},
         )
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
         context.logger.info("[inst=%s][step=%s] Entrando na Roleta Principal", context.instance_id, self.name)
-        context.vision.wait_and_click(capture, context.adb, T_RULETA_PRINCIPAL, timeout_s=spin_timeout, logger=context.logger)
-        context.vision.wait_for(capture, T_RULETA_GIRAR, timeout_s=spin_timeout)
+        context.vision.wait_and_click(capture, context.adb, T_RULETA_PRINCIPAL, timeout_s=spin_timeout, logger=context.logger, schedule=poll)
+        context.vision.wait_for(capture, T_RULETA_GIRAR, timeout_s=spin_timeout, schedule=poll)
 
         for spin_idx in range(1, spins + 1):
             try:
                 context.logger.info("[inst=%s][step=%s][spin=%d] Iniciando giro", context.instance_id, self.name, spin_idx)
-                context.vision.wait_and_click(capture, context.adb, T_RULETA_GIRAR, timeout_s=spin_timeout, logger=context.logger)
-                context.vision.wait_for(capture, T_RULETA_RESULTADO, timeout_s=result_timeout)
+                context.vision.wait_and_click(capture, context.adb, T_RULETA_GIRAR, timeout_s=spin_timeout, logger=context.logger, schedule=poll)
+                context.vision.wait_for(capture, T_RULETA_RESULTADO, timeout_s=result_timeout, schedule=poll)
                 stats["spins_done"] += 1
             except SoftFail as exc:
                 stats["timeouts"] += 1
                 context.logger.warning("[inst=%s][step=%s][spin=%d] SoftFail no giro: %s", context.instance_id, self.name, spin_idx, exc)
-                self._leave_roleta(context, capture, stats)
+                self._leave_roleta(context, capture, stats, poll)
                 raise SoftFail(f"{self.name}: giro {spin_idx} falhou ({exc})") from exc
 
-        self._leave_roleta(context, capture, stats)
+        self._leave_roleta(context, capture, stats, poll)
 
-    def _leave_roleta(self, context: StepContext, capture, stats: dict[str, int]) -> None:
+    def _leave_roleta(self, context: StepContext, capture, stats: dict[str, int], poll=None) -> None:
         try:
-            context.vision.wait_and_click(capture, context.adb, T_RULETA_SAIR, timeout_s=3, logger=context.logger)
+            context.vision.wait_and_click(capture, context.adb, T_RULETA_SAIR, timeout_s=3, logger=context.logger, schedule=poll)
         except SoftFail:
             context.logger.info("[inst=%s][step=%s] Botão sair da roleta não encontrado", context.instance_id, self.name)
 
@@ -6,7 +6,7 @@ from pathlib import Path
 
 from bot.core.exceptions import CriticalFail, Reason, SoftFail
 from bot.core.template_ids import T_VPN_CONECTADA, T_VPN_CONECTAR, T_VPN_DESCONECTADA, T_VPN_ERRO
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step07VPN(Step):
@@ -16,22 +16,23 @@ class Step07VPN(Step):
         screenshot_path = Path("runtime") / context.instance_id / f"{self.name}.png"
         cfg = context.config.get("step_07", {})
         timeout_s = int(cfg.get("timeout_connect", 10))
+        poll = cfg.get("poll")
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
         stats = context.metrics.setdefault(self.name, {"already_connected": 0, "connect_clicks": 0})
 
-        if context.vision.exists(capture(), T_VPN_CONECTADA):
+        state = context.vision.classify(capture(), [T_VPN_CONECTADA, T_VPN_DESCONECTADA])
+        if state == T_VPN_CONECTADA:
             stats["already_connected"] += 1
             return
 
-        if context.vision.exists(capture(), T_VPN_DESCONECTADA):
-            context.vision.wait_and_click(capture, context.adb, T_VPN_CONECTAR, timeout_s=timeout_s, logger=context.logger)
+        if state == T_VPN_DESCONECTADA:
+            context.vision.wait_and_click(capture, context.adb, T_VPN_CONECTAR, timeout_s=timeout_s, logger=context.logger, schedule=poll)
             stats["connect_clicks"] += 1
 
         try:
-            context.vision.wait_for(capture, T_VPN_CONECTADA, timeout_s=timeout_s)
+            context.vision.wait_for(capture, T_VPN_CONECTADA, timeout_s=timeout_s, schedule=poll)
         except SoftFail as exc:
             if context.vision.exists(capture(), T_VPN_ERRO):
                 raise CriticalFail(f"{self.name}: erro ao conectar VPN", reason=Reason.VPN_ERROR) from exc
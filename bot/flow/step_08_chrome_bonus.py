@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from bot.core.adb import adb_batch
 from bot.core.exceptions import CriticalFail, Reason, SoftFail
 from bot.core.template_ids import T_CHROME_BARRA_ENDERECO, T_CHROME_CAPTCHA, T_CHROME_PAGINA_BONUS
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step08ChromeBonus(Step):
@@ -18,9 +19,9 @@ class Step08ChromeBonus(Step):
         timeout_s = int(cfg.get("timeout_page", 12))
         bonus_url = str(cfg.get("bonus_url", context.config.get("bonus_url", "https://example.com/bonus")))
         navigation_mode = str(cfg.get("navigation_mode", "intent"))
+        poll = cfg.get("poll")
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
         context.adb.start_app(
             context.config.get("chrome_package", "com.android.chrome"),
@@ -28,14 +29,17 @@ class Step08ChromeBonus(Step):
         )
 
         if navigation_mode == "input_text":
-            context.vision.wait_and_click(capture, context.adb, T_CHROME_BARRA_ENDERECO, timeout_s=timeout_s, logger=context.logger)
-            context.adb.input_text(bonus_url)
-            context.adb.keyevent(66)
+            context.vision.wait_and_click(capture, context.adb, T_CHROME_BARRA_ENDERECO, timeout_s=timeout_s, logger=context.logger, schedule=poll)
+            # ENTER only makes sense once the URL was typed.
+            with adb_batch(context.adb, stop_on_error=True) as batch:
+                batch.input_text(bonus_url)
+                batch.keyevent(66)  # KEYCODE_ENTER
+            batch.raise_for_status()
         else:
             context.adb.open_url(bonus_url)
 
         try:
-            context.vision.wait_for(capture, T_CHROME_PAGINA_BONUS, timeout_s=timeout_s)
+            context.vision.wait_for(capture, T_CHROME_PAGINA_BONUS, timeout_s=timeout_s, schedule=poll)
         except SoftFail as exc:
             if context.vision.exists(capture(), T_CHROME_CAPTCHA):
                 raise CriticalFail(f"{self.name}: captcha detectado", reason=Reason.CAPTCHA_DETECTED) from exc
@@ -7,7 +7,7 @@ from pathlib import Path
 from bot.core.exceptions import SoftFail
 from bot.core.template_ids import T_BONUS_BOTAO_DISPONIVEL, T_BONUS_COLETADO, T_BONUS_INDISPONIVEL
 from bot.flow.recovery import recover_to_home
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step09BonusCollect(Step):
@@ -17,28 +17,30 @@ class Step09BonusCollect(Step):
         screenshot_path = Path("runtime") / context.instance_id / f"{self.name}.png"
         cfg = context.config.get("step_09", {})
         timeout_s = int(cfg.get("timeout_bonus", 8))
+        poll = cfg.get("poll")
 
         stats = context.metrics.setdefault(self.name, {"collected": 0, "unavailable": 0, "softfails": 0})
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
         context.adb.start_app(context.config["app_package"], context.config["app_activity"])
 
         try:
-            if context.vision.exists(capture(), T_BONUS_BOTAO_DISPONIVEL):
+            state = context.vision.classify(capture(), [T_BONUS_BOTAO_DISPONIVEL, T_BONUS_INDISPONIVEL])
+            if state == T_BONUS_BOTAO_DISPONIVEL:
                 context.vision.wait_and_click(
                     capture,
                     context.adb,
                     T_BONUS_BOTAO_DISPONIVEL,
                     timeout_s=timeout_s,
                     logger=context.logger,
+                    schedule=poll,
                 )
-                context.vision.wait_for(capture, T_BONUS_COLETADO, timeout_s=timeout_s)
+                context.vision.wait_for(capture, T_BONUS_COLETADO, timeout_s=timeout_s, schedule=poll)
                 stats["collected"] += 1
                 return
 
-            if context.vision.exists(capture(), T_BONUS_INDISPONIVEL):
+            if state == T_BONUS_INDISPONIVEL:
                 stats["unavailable"] += 1
                 context.logger.info("[inst=%s][step=%s] Bônus indisponível no momento", context.instance_id, self.name)
                 return
@@ -7,7 +7,7 @@ from pathlib import Path
 from bot.core.exceptions import SoftFail
 from bot.core.template_ids import T_HOME_SCREEN
 from bot.flow.recovery import recover_to_home
-from bot.flow.step_base import Step, StepContext
+from bot.flow.step_base import Step, StepContext, make_capture
 
 
 class Step10Finalize(Step):
@@ -16,13 +16,12 @@ class Step10Finalize(Step):
     def run(self, context: StepContext) -> None:
         screenshot_path = Path("runtime") / context.instance_id / f"{self.name}.png"
 
-        def capture() -> str:
-            return str(context.adb.screencap(str(screenshot_path)))
+        capture = make_capture(context, screenshot_path)
 
-        if not context.vision.exists(capture(), T_HOME_SCREEN, threshold=0.88):
+        if not context.vision.exists(capture(), T_HOME_SCREEN):
             recover_to_home(context, capture, back_limit=3)
 
-        if not context.vision.exists(capture(), T_HOME_SCREEN, threshold=0.88):
+        if not context.vision.exists(capture(), T_HOME_SCREEN):
             raise SoftFail(f"{self.name}: não foi possível garantir Home antes de finalizar")
 
         context.adb.stop_app(context.config["app_package"])
@@ -5,7 +5,8 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
 
 from bot.core.adb_interface import IAdb
 
@@ -19,6 +20,7 @@ class StepContext:
     config: dict[str, Any]
     run_id: str = "manual"
     metrics: dict[str, Any] = field(default_factory=dict)
+    frame_source: Any = None
 
 
 class Step(ABC):
@@ -30,3 +32,21 @@ class Step(ABC):
 
     def __str__(self) -> str:
         return self.name
+
+
+def make_capture(context: StepContext, screenshot_path: str | Path) -> Callable[[], Any]:
+    """Build the capture function used by a step.
+
+    With ``capture_mode: frame`` (default) and an ADB backend exposing
+    ``capture_frame``, screens stay in memory as decoded frames (served by the
+    context's frame source when streaming is on); otherwise each capture is
+    written to ``screenshot_path`` and matched from disk.
+    """
+    capture_frame = getattr(context.adb, "capture_frame", None)
+    if context.config.get("capture_mode", "frame") == "frame" and callable(capture_frame):
+        return context.frame_source if context.frame_source is not None else capture_frame
+
+    def capture() -> str:
+        return str(context.adb.screencap(str(screenshot_path)))
+
+    return capture
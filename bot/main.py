@@ -47,6 +47,50 @@ def main() -> int:
         "shutdown_retry_delay_s": bot_config.shutdown_retry_delay_s,
         "chrome_activity": bot_config.chrome_activity,
         "bonus_url": bot_config.bonus_url,
+        "capture_mode": bot_config.capture_mode,
+        "screencap_format": bot_config.screencap_format,
+        "frame_stream": bot_config.frame_stream,
+        "frame_stream_interval_ms": bot_config.frame_stream_interval_ms,
+        "frame_cache_size": bot_config.frame_cache_size,
+        "templates_roi": bot_config.templates_roi or {},
+        "roi_padding_px": bot_config.roi_padding_px,
+        "roi_learning": bot_config.roi_learning,
+        "templates_cascade": bot_config.templates_cascade or {},
+        "template_pack": bot_config.template_pack,
+        "skip_unchanged_frames": bot_config.skip_unchanged_frames,
+        "unchanged_tolerance": bot_config.unchanged_tolerance,
+        "snapshot_format": bot_config.snapshot_format,
+        "artifact_queue_size": bot_config.artifact_queue_size,
+        "artifact_drop_policy": bot_config.artifact_drop_policy,
+        "artifact_flush_timeout_s": bot_config.artifact_flush_timeout_s,
+        "template_stats": bot_config.template_stats,
+        "multi_scale": bot_config.multi_scale,
+        "scale_anchor": bot_config.scale_anchor,
+        "scale_sweep": bot_config.scale_sweep,
+        "scale_store": bot_config.scale_store,
+        "appearance_store": bot_config.appearance_store,
+        "color_prefilter": bot_config.color_prefilter,
+        "prefilter_presence_ratio": bot_config.prefilter_presence_ratio,
+        "prefilter_audit_rate": bot_config.prefilter_audit_rate,
+        "match_backend": bot_config.match_backend,
+        "templates_backend": bot_config.templates_backend or {},
+        "calibrated_thresholds": bot_config.calibrated_thresholds,
+        "template_cache_mb": bot_config.template_cache_mb,
+        "pinned_templates": bot_config.pinned_templates,
+        "match_workers": bot_config.match_workers,
+        "vision_server": bot_config.vision_server,
+        "vision_server_batch_max": bot_config.vision_server_batch_max,
+        "vision_server_batch_window_ms": bot_config.vision_server_batch_window_ms,
+        "vision_server_slot_mb": bot_config.vision_server_slot_mb,
+        "hot_reload": bot_config.hot_reload,
+        "reload_interval_s": bot_config.reload_interval_s,
+        "config_path": args.bot_config,
+        "adb_shell_session": bot_config.adb_shell_session,
+        "adb_shell_timeout_s": bot_config.adb_shell_timeout_s,
+        "adb_socket": bot_config.adb_socket,
+        "adb_server_host": bot_config.adb_server_host,
+        "adb_server_port": bot_config.adb_server_port,
+        "adb_pool_size": bot_config.adb_pool_size,
         "step_01": bot_config.step_01 or {},
         "step_03": bot_config.step_03 or {},
         "step_04": bot_config.step_04 or {},
@@ -9,61 +9,69 @@ from typing import Any, Iterable
 from uuid import uuid4
 
 from bot.config.loader import InstanceConfig
-from bot.core.adb import ADBClient
+from bot.core.adb import ADBClient, adb_batch
+from bot.core.adb_shell import ShellADBClient
+from bot.core.adb_socket import SocketADBClient
+from bot.core.artifacts import ArtifactWriter, flush_artifacts, get_artifact_writer
+from bot.core.calibration import load_calibrated_thresholds
 from bot.core.exceptions import CriticalFail, SoftFail
+from bot.core.frame_source import FrameSource, with_frame_barrier
 from bot.core.logger import setup_instance_logger
 from bot.core.vision import Vision
-from bot.flow.step_01_home import Step01Home
-from bot.flow.step_02_roleta import Step02Roleta
-from bot.flow.step_03_confirm_home import Step03ConfirmHome
-from bot.flow.step_04_amigos import Step04Amigos
-from bot.flow.step_05_roleta_principal import Step05RoletaPrincipal
-from bot.flow.step_06_noko_box import Step06NokoBox
-from bot.flow.step_07_vpn import Step07VPN
-from bot.flow.step_08_chrome_bonus import Step08ChromeBonus
-from bot.flow.step_09_bonus_collect import Step09BonusCollect
-from bot.flow.step_10_finalize import Step10Finalize
+from bot.core.vision_server import RemoteVision
+from bot.flow.registry import iter_steps
 from bot.flow.step_base import Step, StepContext
 
 
 def default_steps() -> Iterable[Step]:
-    return [
-        Step01Home(),
-        Step02Roleta(),
-        Step03ConfirmHome(),
-        Step04Amigos(),
-        Step05RoletaPrincipal(),
-        Step06NokoBox(),
-        Step07VPN(),
-        Step08ChromeBonus(),
-        Step09BonusCollect(),
-        Step10Finalize(),
-    ]
+    return iter_steps()
 
 
 def _snapshot_failure(context: StepContext, step_name: str, attempt: int | None = None) -> None:
     logs_dir = context.config.get("logs_dir", "logs")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     attempt_label = attempt if attempt is not None else context.config.get("current_attempt", "na")
+    snapshot_format = str(context.config.get("snapshot_format", "png")).lstrip(".").lower()
     snapshot_path = (
         Path(logs_dir)
         / "snapshots"
         / context.instance_id
-        / f"{timestamp}_{context.run_id}_{context.instance_id}_{step_name}_attempt{attempt_label}.png"
+        / f"{timestamp}_{context.run_id}_{context.instance_id}_{step_name}_attempt{attempt_label}.{snapshot_format}"
     )
+    prefix = f"[inst={context.instance_id}][step={step_name}][attempt={attempt_label}]"
+
+    def report(path: Path, error: Exception | None) -> None:
+        if error is None:
+            context.logger.error("%s Snapshot de falha salvo em %s", prefix, path)
+        else:
+            context.logger.warning("%s Snapshot de falha não gravado (%s): %s", prefix, path, error)
+
     try:
-        context.adb.screencap(str(snapshot_path))
-        context.logger.error(
-            "[inst=%s][step=%s][attempt=%s] Snapshot de falha salvo em %s",
-            context.instance_id,
-            step_name,
-            attempt_label,
-            snapshot_path,
-        )
+        capture_frame = getattr(context.adb, "capture_frame", None)
+        if callable(capture_frame):
+            # Captura síncrona (é o estado da falha), gravação em background;
+            # o resultado da gravação é logado pela thread do writer.
+            queued = _artifact_writer(context).submit(snapshot_path, capture_frame(), on_done=report)
+            if not queued:
+                context.logger.warning("Fila de artefatos cheia; snapshot de falha descartado (%s)", snapshot_path)
+                return
+            context.logger.error("%s Snapshot de falha enfileirado para %s", prefix, snapshot_path)
+        else:
+            # screencap grava os bytes PNG do dispositivo; a extensão acompanha.
+            snapshot_path = snapshot_path.with_suffix(".png")
+            context.adb.screencap(str(snapshot_path))
+            report(snapshot_path, None)
     except Exception as exc:  # noqa: BLE001 - best effort em falha crítica
         context.logger.warning("Não foi possível salvar snapshot de falha: %s", exc)
 
 
+def _artifact_writer(context: StepContext) -> ArtifactWriter:
+    return get_artifact_writer(
+        max_queue=int(context.config.get("artifact_queue_size", 32)),
+        drop_policy=str(context.config.get("artifact_drop_policy", "drop_newest")),
+    )
+
+
 def _safe_shutdown(context: StepContext, instance: InstanceConfig) -> None:
     context.logger.info("Iniciando safe shutdown (com retry)")
     packages_to_stop = [
@@ -74,21 +82,138 @@ def _safe_shutdown(context: StepContext, instance: InstanceConfig) -> None:
     retries = int(context.config.get("shutdown_retries", 3))
     retry_delay_s = float(context.config.get("shutdown_retry_delay_s", 0.3))
 
-    for package in packages_to_stop:
-        stopped = False
-        for attempt in range(1, retries + 1):
-            try:
-                context.adb.stop_app(package)
-                context.logger.info("Safe shutdown: app encerrado (%s) na tentativa %d/%d", package, attempt, retries)
-                stopped = True
-                break
-            except Exception as exc:  # noqa: BLE001 - best effort shutdown
+    # Each attempt stops every pending package in one batched shell call and
+    # retries only the ones whose force-stop failed.
+    pending = list(packages_to_stop)
+    for attempt in range(1, retries + 1):
+        failures: dict[str, str] = {}
+        try:
+            with adb_batch(context.adb) as batch:
+                for package in pending:
+                    batch.stop_app(package)
+            for package, result in zip(pending, batch.results):
+                if not result.ok:
+                    failures[package] = result.output or f"status {result.status}"
+        except Exception as exc:  # noqa: BLE001 - best effort shutdown
+            failures = {package: str(exc) for package in pending}
+        for package in pending:
+            if package in failures:
                 context.logger.warning(
-                    "Safe shutdown: falha ao encerrar %s na tentativa %d/%d (%s)", package, attempt, retries, exc
+                    "Safe shutdown: falha ao encerrar %s na tentativa %d/%d (%s)",
+                    package,
+                    attempt,
+                    retries,
+                    failures[package],
                 )
-                sleep(retry_delay_s)
-        if not stopped:
-            context.logger.error("Safe shutdown: não foi possível encerrar %s após %d tentativas", package, retries)
+            else:
+                context.logger.info("Safe shutdown: app encerrado (%s) na tentativa %d/%d", package, attempt, retries)
+        pending = [package for package in pending if package in failures]
+        if not pending:
+            break
+        sleep(retry_delay_s)
+    for package in pending:
+        context.logger.error("Safe shutdown: não foi possível encerrar %s após %d tentativas", package, retries)
+
+
+_VISION_STATS = (
+    "frame_cache_stats",
+    "roi_stats",
+    "wait_stats",
+    "scale_stats",
+    "prefilter_stats",
+    "backend_stats",
+    "template_cache_stats",
+    "parallel_stats",
+    "remote_stats",
+    "reload_stats",
+)
+
+
+def _log_vision_stats(context: StepContext) -> None:
+    stats = {}
+    for attr in _VISION_STATS:
+        collect = getattr(context.vision, attr, None)
+        if callable(collect):
+            stats[attr.removesuffix("_stats")] = collect()
+    if stats:
+        context.logger.info("Vision stats | %s", stats)
+
+    template_stats = getattr(context.vision, "template_stats", None)
+    if callable(template_stats):
+        context.metrics["template_stats"] = template_stats()
+        context.logger.info("Vision template stats | %s", context.metrics["template_stats"])
+
+
+def build_vision_kwargs(bot_config: dict[str, Any]) -> dict[str, Any]:
+    """Vision settings from ``bot_config`` (shared by local, remote and server-side Vision)."""
+    return {
+        "templates_dir": bot_config.get("templates_dir", "bot/assets/templates"),
+        "template_map": bot_config.get("templates", {}),
+        "default_confidence": float(bot_config.get("default_confidence", 0.88)),
+        "templates_confidence": bot_config.get("templates_confidence", {}) or {},
+        "frame_cache_size": int(bot_config.get("frame_cache_size", 4)),
+        "templates_roi": bot_config.get("templates_roi", {}) or {},
+        "roi_padding_px": int(bot_config.get("roi_padding_px", 24)),
+        "roi_learning": bool(bot_config.get("roi_learning", True)),
+        "templates_cascade": bot_config.get("templates_cascade", {}) or {},
+        "template_pack": bot_config.get("template_pack") or None,
+        "skip_unchanged_frames": bool(bot_config.get("skip_unchanged_frames", False)),
+        "unchanged_tolerance": float(bot_config.get("unchanged_tolerance", 6.0)),
+        "debug_format": str(bot_config.get("snapshot_format", "png")),
+        "template_stats": bool(bot_config.get("template_stats", True)),
+        "multi_scale": bool(bot_config.get("multi_scale", False)),
+        "scale_anchor": str(bot_config.get("scale_anchor", "home.tela_home")),
+        "scale_sweep": bot_config.get("scale_sweep") or None,
+        "scale_store": bot_config.get("scale_store") or None,
+        "appearance_store": bot_config.get("appearance_store") or None,
+        "color_prefilter": bool(bot_config.get("color_prefilter", False)),
+        "prefilter_presence_ratio": float(bot_config.get("prefilter_presence_ratio", 0.5)),
+        "prefilter_audit_rate": float(bot_config.get("prefilter_audit_rate", 0.02)),
+        "match_backend": str(bot_config.get("match_backend", "opencv")),
+        "templates_backend": bot_config.get("templates_backend", {}) or {},
+        "calibrated_confidence": load_calibrated_thresholds(bot_config.get("calibrated_thresholds", "")),
+        "template_cache_bytes": int(float(bot_config.get("template_cache_mb", 64)) * 1024 * 1024),
+        "pinned_templates": bot_config.get("pinned_templates") or None,
+        "match_workers": int(bot_config.get("match_workers", 0)),
+        "hot_reload": bool(bot_config.get("hot_reload", False)),
+        "config_path": bot_config.get("config_path") or None,
+        "reload_interval_s": float(bot_config.get("reload_interval_s", 2.0)),
+    }
+
+
+def _make_adb(instance: InstanceConfig, bot_config: dict[str, Any]) -> Any:
+    adb_bin = bot_config.get("adb_bin", "adb")
+    screencap_format = str(bot_config.get("screencap_format", "png"))
+    if bot_config.get("adb_socket", False):
+        return SocketADBClient(
+            serial=instance.serial,
+            adb_bin=adb_bin,
+            screencap_format=screencap_format,
+            host=str(bot_config.get("adb_server_host", "127.0.0.1")),
+            port=int(bot_config.get("adb_server_port", 5037)),
+            pool_size=int(bot_config.get("adb_pool_size", 2)),
+        )
+    if bot_config.get("adb_shell_session", False):
+        return ShellADBClient(
+            serial=instance.serial,
+            adb_bin=adb_bin,
+            screencap_format=screencap_format,
+            shell_timeout_s=float(bot_config.get("adb_shell_timeout_s", 10.0)),
+        )
+    return ADBClient(serial=instance.serial, adb_bin=adb_bin, screencap_format=screencap_format)
+
+
+def _start_frame_source(adb: Any, instance: InstanceConfig, bot_config: dict[str, Any]) -> FrameSource | None:
+    capture_frame = getattr(adb, "capture_frame", None)
+    if not bot_config.get("frame_stream", False) or bot_config.get("capture_mode", "frame") != "frame":
+        return None
+    if not callable(capture_frame):
+        return None
+    return FrameSource(
+        capture_frame,
+        min_interval_s=float(bot_config.get("frame_stream_interval_ms", 0)) / 1000.0,
+        name=instance.instance_id,
+    ).start()
 
 
 def _make_run_id() -> str:
@@ -100,16 +225,16 @@ def _trip_breaker(context: StepContext, reason: str) -> None:
     context.metrics["breaker_reason"] = reason
 
 
-def run_instance(instance: InstanceConfig, bot_config: dict[str, Any]) -> int:
+def run_instance(instance: InstanceConfig, bot_config: dict[str, Any], vision_client: Any = None) -> int:
     run_id = _make_run_id()
     logger = setup_instance_logger(instance.instance_id, run_id=run_id, logs_dir=bot_config.get("logs_dir", "logs"))
-    adb = ADBClient(serial=instance.serial, adb_bin=bot_config.get("adb_bin", "adb"))
-    vision = Vision(
-        templates_dir=bot_config.get("templates_dir", "bot/assets/templates"),
-        template_map=bot_config.get("templates", {}),
-        default_confidence=float(bot_config.get("default_confidence", 0.90)),
-        templates_confidence=bot_config.get("templates_confidence", {}) or {},
-    )
+    adb = _make_adb(instance, bot_config)
+    frame_source = _start_frame_source(adb, instance, bot_config)
+    if frame_source is not None:
+        # Gestures make the streamed frame stale until a newer capture lands.
+        adb = with_frame_barrier(adb, frame_source)
+    vision_kwargs = {**build_vision_kwargs(bot_config), "device_id": instance.instance_id}
+    vision = RemoteVision(vision_client, **vision_kwargs) if vision_client is not None else Vision(**vision_kwargs)
     context_config = {
         **bot_config,
         "app_package": instance.app_package,
@@ -122,7 +247,10 @@ def run_instance(instance: InstanceConfig, bot_config: dict[str, Any]) -> int:
         logger=logger,
         config=context_config,
         run_id=run_id,
+        frame_source=frame_source,
     )
+    # Cria o writer de artefatos do processo já com as configurações da instância.
+    _artifact_writer(context)
     context.metrics.setdefault("steps", {})
     context.metrics.setdefault("step_durations", {})
     context.metrics.setdefault("breaker_tripped", False)
@@ -215,4 +343,13 @@ def run_instance(instance: InstanceConfig, bot_config: dict[str, Any]) -> int:
             noko.get("recoveries", 0),
             elapsed,
         )
+        _log_vision_stats(context)
         _safe_shutdown(context, instance)
+        if frame_source is not None:
+            frame_source.stop()
+            logger.info("Frame stream stats | %s", frame_source.stats())
+        close_adb = getattr(adb, "close", None)
+        if callable(close_adb):
+            close_adb()
+        if not flush_artifacts(float(bot_config.get("artifact_flush_timeout_s", 5.0))):
+            logger.warning("Artefatos pendentes não gravados ao final da instância: %s", _artifact_writer(context).stats())
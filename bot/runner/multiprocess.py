@@ -6,11 +6,18 @@ from multiprocessing import Process, Queue
 from typing import Any
 
 from bot.config.loader import InstanceConfig
-from bot.runner.instance_runner import run_instance
+from bot.core.vision_server import VisionClient, start_vision_server
+from bot.runner.instance_runner import build_vision_kwargs, run_instance
 
 
-def _run(index: int, instance: InstanceConfig, bot_config: dict[str, Any], queue: Queue) -> None:
-    code = run_instance(instance, bot_config)
+def _run(
+    index: int,
+    instance: InstanceConfig,
+    bot_config: dict[str, Any],
+    queue: Queue,
+    vision_client: VisionClient | None = None,
+) -> None:
+    code = run_instance(instance, bot_config, vision_client=vision_client)
     queue.put((index, code))
 
 
@@ -19,10 +26,30 @@ def run_parallel(instances: list[InstanceConfig], bot_config: dict[str, Any], wo
     if not instances:
         return []
 
+    server = None
+    if bot_config.get("vision_server"):
+        # Um único processo de visão por host; cada worker recebe um slot de memória compartilhada.
+        server = start_vision_server(
+            build_vision_kwargs(bot_config),
+            workers=len(instances),
+            batch_max=int(bot_config.get("vision_server_batch_max", 8)),
+            batch_window_s=float(bot_config.get("vision_server_batch_window_ms", 2.0)) / 1000.0,
+            slot_bytes=int(float(bot_config.get("vision_server_slot_mb", 12.0)) * 1024 * 1024),
+        )
+
+    try:
+        return _run_workers(instances, bot_config, server)
+    finally:
+        if server is not None:
+            server.stop()
+
+
+def _run_workers(instances: list[InstanceConfig], bot_config: dict[str, Any], server: Any) -> list[int]:
     queue: Queue = Queue()
     processes: list[Process] = []
     for index, instance in enumerate(instances):
-        process = Process(target=_run, args=(index, instance, bot_config, queue), daemon=False)
+        client = server.client(index) if server is not None else None
+        process = Process(target=_run, args=(index, instance, bot_config, queue, client), daemon=False)
         processes.append(process)
         process.start()
 
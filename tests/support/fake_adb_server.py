@@ -0,0 +1,97 @@
+"""Minimal adb server speaking the host wire protocol, for socket client tests."""
+
+from __future__ import annotations
+
+import socket
+import socketserver
+import threading
+from typing import Callable
+
+# (service, command) -> bytes written back before the connection is closed.
+DeviceHandler = Callable[[str, str], bytes]
+
+
+def _read_request(sock: socket.socket) -> str:
+    header = _read_exact(sock, 4)
+    return _read_exact(sock, int(header, 16)).decode()
+
+
+def _read_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("client closed")
+        data += chunk
+    return data
+
+
+def _fail(sock: socket.socket, message: str) -> None:
+    data = message.encode()
+    sock.sendall(b"FAIL" + f"{len(data):04x}".encode() + data)
+
+
+class FakeAdbServer:
+    """Threaded TCP server on ``127.0.0.1:<port>`` serving ``devices``.
+
+    ``requests`` records every request payload in arrival order.
+    """
+
+    def __init__(self, devices: dict[str, DeviceHandler]) -> None:
+        self.devices = devices
+        self.requests: list[str] = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                try:
+                    server._serve(self.request)
+                except ConnectionError:
+                    pass
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _record(self, request: str) -> None:
+        with self._lock:
+            self.requests.append(request)
+
+    def _serve(self, sock: socket.socket) -> None:
+        request = _read_request(sock)
+        self._record(request)
+        if request.startswith("host-serial:") and request.endswith(":wait-for-any-device"):
+            serial = request[len("host-serial:") : -len(":wait-for-any-device")]
+            if serial not in self.devices:
+                _fail(sock, f"device '{serial}' not found")
+                return
+            sock.sendall(b"OKAYOKAY")
+            return
+        if not request.startswith("host:transport:"):
+            _fail(sock, f"unknown host service {request}")
+            return
+        serial = request[len("host:transport:") :]
+        handler = self.devices.get(serial)
+        if handler is None:
+            _fail(sock, f"device '{serial}' not found")
+            return
+        sock.sendall(b"OKAY")
+
+        request = _read_request(sock)
+        self._record(request)
+        service, _, command = request.partition(":")
+        if service not in ("shell", "exec"):
+            _fail(sock, f"unsupported service {service}")
+            return
+        sock.sendall(b"OKAY")
+        sock.sendall(handler(service, command))
+
+    def __enter__(self) -> "FakeAdbServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -5,10 +5,8 @@ import zlib
 from pathlib import Path
 
 
-def _save_png(path: Path, w: int, h: int, pixels: list[int]) -> None:
-    raw = b""
-    for y in range(h):
-        raw += b"\x00" + bytes(pixels[y * w * 3 : (y + 1) * w * 3])
+def _save_png(path: Path, w: int, h: int, pixels, level: int = 9) -> None:
+    raw = b"".join(b"\x00" + bytes(pixels[y * w * 3 : (y + 1) * w * 3]) for y in range(h))
 
     def chunk(tag: bytes, data: bytes) -> bytes:
         return (
@@ -21,7 +19,7 @@ def _save_png(path: Path, w: int, h: int, pixels: list[int]) -> None:
     png = (
         b"\x89PNG\r\n\x1a\n"
         + chunk(b"IHDR", struct.pack("!IIBBBBB", w, h, 8, 2, 0, 0, 0))
-        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IDAT", zlib.compress(raw, level))
         + chunk(b"IEND", b"")
     )
     path.write_bytes(png)
@@ -82,3 +80,77 @@ def create_mock_fixture_tree(base_dir: Path) -> tuple[Path, Path]:
     )
 
     return screens, templates
+
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "1440p": (2560, 1440)}
+
+
+def _synthetic_screen(np, rng, w: int, h: int):
+    """Emulator-like frame: vertical gradient, noisy panels and flat buttons."""
+    ramp = np.linspace(30, 90, h, dtype=np.float32)[:, None, None]
+    screen = np.broadcast_to(ramp, (h, w, 3)).astype(np.float32)
+    screen = screen + rng.normal(0, 4, size=(h, w, 3)).astype(np.float32)
+    for _ in range(24):
+        pw, ph = int(rng.integers(w // 12, w // 3)), int(rng.integers(h // 20, h // 6))
+        x, y = int(rng.integers(0, w - pw)), int(rng.integers(0, h - ph))
+        screen[y : y + ph, x : x + pw] = rng.integers(40, 220, size=3)
+        screen[y : y + ph, x : x + pw] += rng.normal(0, 10, size=(ph, pw, 3))
+    return np.clip(screen, 0, 255).astype(np.uint8)
+
+
+def create_benchmark_fixture(
+    base_dir: Path,
+    resolution: str | tuple[int, int] = "1080p",
+    templates_count: int = 8,
+    seed: int = 7,
+) -> dict[str, object]:
+    """Realistic-resolution screen plus present/absent templates for benchmarks.
+
+    Present templates are crops of the screen (exact positions are returned);
+    absent ones are crops of an unrelated screen generated with another seed.
+    """
+    import numpy as np
+
+    w, h = RESOLUTIONS[resolution] if isinstance(resolution, str) else resolution
+    rng = np.random.default_rng(seed)
+    screen = _synthetic_screen(np, rng, w, h)
+    other = _synthetic_screen(np, np.random.default_rng(seed + 1000), w, h)
+
+    screens = base_dir / "screens"
+    templates = base_dir / "templates" / "bench"
+    screens.mkdir(parents=True, exist_ok=True)
+    templates.mkdir(parents=True, exist_ok=True)
+    _save_png(screens / "screen.png", w, h, screen.reshape(-1), level=1)
+    _save_png(screens / "screen_other.png", w, h, other.reshape(-1), level=1)
+
+    present: dict[str, tuple[int, int]] = {}
+    absent: list[str] = []
+    for index in range(templates_count):
+        source, is_present = (screen, True) if index % 2 == 0 else (other, False)
+        tw, th = int(rng.integers(w // 16, w // 8)), int(rng.integers(h // 24, h // 10))
+        x, y = int(rng.integers(0, w - tw)), int(rng.integers(0, h - th))
+        crop = np.ascontiguousarray(source[y : y + th, x : x + tw])
+        name = f"bench.t{index:02d}"
+        _save_png(templates / f"t{index:02d}.png", tw, th, crop.reshape(-1), level=1)
+        if is_present:
+            present[name] = (x, y)
+        else:
+            absent.append(name)
+
+    return {
+        "size": (w, h),
+        "screen": screens / "screen.png",
+        "screen_other": screens / "screen_other.png",
+        "templates_dir": base_dir / "templates",
+        "present": present,
+        "absent": absent,
+    }
+
+
+def encode_raw_screencap(frame, header_size: int = 16) -> bytes:
+    """Bytes ``screencap`` (no ``-p``) would emit for a BGR ``frame``: header + RGBA_8888."""
+    import cv2
+
+    h, w = frame.shape[:2]
+    header = struct.pack("<III", w, h, 1) + (struct.pack("<I", 0) if header_size == 16 else b"")
+    return header + cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA).tobytes()
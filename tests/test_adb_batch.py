@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.adb import ADBClient, SequentialBatch, adb_batch
+from bot.core.adb_shell import ShellADBClient
+from bot.core.exceptions import CriticalFail
+from bot.core.fake_adb import FakeADB
+from bot.core.frame_source import FakeFrameSource, with_frame_barrier
+
+
+def _executable(path: Path, body: str) -> None:
+    path.write_text(f"#!/bin/sh\n{body}", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+
+
+@unittest.skipIf(shutil.which("sh") is None, "shell POSIX não disponível no ambiente")
+class ADBBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self.temp_dir.name)
+        self.log = base / "calls.log"
+        bin_dir = base / "bin"
+        bin_dir.mkdir()
+        # Stand-ins for the device's ``input`` and ``am`` binaries.
+        for tool in ("input", "am"):
+            _executable(
+                bin_dir / tool,
+                f'echo "{tool} $*" >> "{self.log}"\n[ "$2" != "com.falha" ] || {{ echo "erro $2" >&2; exit 2; }}\n',
+            )
+        self.path = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        # ``adb -s <serial> shell <script>`` counted and run by a local shell.
+        self.adb_bin = base / "adb"
+        _executable(self.adb_bin, f'echo x >> "{base / "adb.log"}"\nshift 3\nPATH="{self.path}" exec sh -c "$*"\n')
+        self.adb_log = base / "adb.log"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _queue(self, batch) -> None:
+        batch.stop_app("com.example.app")
+        batch.stop_app("com.falha")
+        batch.input_text("codigo bonus")
+        batch.keyevent(66)
+
+    def _assert_results(self, batch) -> None:
+        self.assertEqual([result.status for result in batch.results], [0, 2, 0, 0])
+        self.assertEqual(batch.results[1].command, "am force-stop com.falha")
+        self.assertEqual(batch.results[1].output, "erro com.falha")
+        self.assertEqual(
+            self.log.read_text(encoding="utf-8").splitlines(),
+            ["am force-stop com.example.app", "am force-stop com.falha", "input text codigo%sbonus", "input keyevent 66"],
+        )
+        with self.assertRaises(CriticalFail):
+            batch.raise_for_status()
+
+    def test_batch_runs_in_one_adb_invocation_with_per_command_status(self) -> None:
+        adb = ADBClient(serial="emu-1", adb_bin=str(self.adb_bin))
+        with adb.batch() as batch:
+            self._queue(batch)
+            self.assertEqual(batch.results, [])
+
+        self._assert_results(batch)
+        self.assertEqual(len(self.adb_log.read_text(encoding="utf-8").splitlines()), 1)
+
+    def test_batch_through_persistent_shell_session(self) -> None:
+        adb = ShellADBClient(serial="emu-1", shell_argv=["env", f"PATH={self.path}", "sh"], shell_timeout_s=5)
+        try:
+            with adb.batch() as batch:
+                self._queue(batch)
+            self._assert_results(batch)
+            self.assertEqual(adb.shell_stats()["commands"], 1)
+        finally:
+            adb.close()
+
+    def test_stop_on_error_skips_commands_after_a_failure(self) -> None:
+        adb = ADBClient(serial="emu-1", adb_bin=str(self.adb_bin))
+        with adb.batch(stop_on_error=True) as batch:
+            batch.stop_app("com.falha")
+            batch.keyevent(66)
+
+        self.assertEqual([result.status for result in batch.results], [2, -1])
+        self.assertEqual(batch.results[0].output, "erro com.falha")
+        self.assertEqual(self.log.read_text(encoding="utf-8").splitlines(), ["am force-stop com.falha"])
+
+    def test_batch_is_dropped_when_block_raises(self) -> None:
+        adb = ADBClient(serial="emu-1", adb_bin=str(self.adb_bin))
+        with self.assertRaises(RuntimeError):
+            with adb.batch() as batch:
+                batch.keyevent(4)
+                raise RuntimeError("abortado")
+        self.assertFalse(self.log.exists())
+
+
+class SequentialBatchTests(unittest.TestCase):
+    def test_clients_without_batch_run_commands_in_order(self) -> None:
+        fake = FakeADB()
+        with adb_batch(fake) as batch:
+            batch.input_text("https://bonus")
+            batch.keyevent(66)
+        self.assertIsInstance(batch, SequentialBatch)
+        self.assertEqual(fake.calls, [("input_text", ("https://bonus",)), ("keyevent", (66,))])
+        self.assertTrue(all(result.ok for result in batch.results))
+
+    def test_sequential_stop_on_error_skips_after_a_failure(self) -> None:
+        class NoKeyboardADB(FakeADB):
+            def input_text(self, text: str) -> None:
+                raise CriticalFail("sem teclado")
+
+        fake = NoKeyboardADB()
+        with adb_batch(fake, stop_on_error=True) as batch:
+            batch.input_text("https://bonus")
+            batch.keyevent(66)
+        self.assertEqual([result.status for result in batch.results], [-1, -1])
+        self.assertEqual(fake.calls, [])
+
+    def test_frame_barrier_is_raised_after_a_batch(self) -> None:
+        source = FakeFrameSource([object()])
+        adb = with_frame_barrier(ADBClient(serial="emu-1"), source)
+        with adb.batch():
+            self.assertEqual(source.barriers, 0)
+        self.assertEqual(source.barriers, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.adb_shell import ShellADBClient, ShellSession
+from bot.core.exceptions import CriticalFail
+
+
+@unittest.skipIf(shutil.which("sh") is None, "shell POSIX não disponível no ambiente")
+class ShellSessionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = ShellSession(["sh"], timeout_s=5)
+
+    def tearDown(self) -> None:
+        self.session.close()
+
+    def test_commands_share_one_process_and_keep_output_apart(self) -> None:
+        self.assertEqual(self.session.run("echo primeiro"), (0, "primeiro"))
+        self.assertEqual(self.session.run("printf 'sem quebra'"), (0, "sem quebra"))
+        self.assertEqual(self.session.run("echo erro 1>&2; false"), (1, "erro"))
+        self.assertEqual(self.session.run("printf 'a\\nb\\n'"), (0, "a\nb"))
+        self.assertEqual(self.session.counters["spawns"], 1)
+        self.assertEqual(self.session.counters["commands"], 4)
+
+    def test_timeout_drops_session_and_next_command_respawns(self) -> None:
+        with self.assertRaises(CriticalFail):
+            self.session.run("sleep 5", timeout=0.2)
+        self.assertFalse(self.session.alive)
+        self.assertEqual(self.session.run("echo ok"), (0, "ok"))
+        self.assertEqual((self.session.counters["timeouts"], self.session.counters["spawns"]), (1, 2))
+
+    def test_dead_session_is_respawned(self) -> None:
+        with self.assertRaises(CriticalFail):
+            self.session.run("exit 3")
+        self.assertEqual(self.session.run("echo de volta"), (0, "de volta"))
+
+
+@unittest.skipIf(shutil.which("sh") is None, "shell POSIX não disponível no ambiente")
+class ShellADBClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self.temp_dir.name)
+        self.log = base / "calls.log"
+        # Stand-ins for the device's ``input`` and ``am`` binaries.
+        for tool in ("input", "am"):
+            script = base / tool
+            script.write_text(f'#!/bin/sh\necho "{tool} $*" >> "{self.log}"\n[ "$1" != "falha" ]\n', encoding="utf-8")
+            script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        path = f"{base}{os.pathsep}{os.environ.get('PATH', '')}"
+        self.adb = ShellADBClient(serial="emu-1", shell_argv=["env", f"PATH={path}", "sh"], shell_timeout_s=5)
+
+    def tearDown(self) -> None:
+        self.adb.close()
+        self.temp_dir.cleanup()
+
+    def test_gestures_and_app_commands_go_through_one_session(self) -> None:
+        self.adb.tap(10, 20)
+        self.adb.keyevent(4)
+        self.adb.input_text("codigo bonus")
+        self.adb.stop_app("com.example.app")
+
+        self.assertEqual(
+            self.log.read_text(encoding="utf-8").splitlines(),
+            ["input tap 10 20", "input keyevent 4", "input text codigo%sbonus", "am force-stop com.example.app"],
+        )
+        self.assertEqual(self.adb.shell_stats()["spawns"], 1)
+
+    def test_non_zero_exit_status_is_critical(self) -> None:
+        with self.assertRaises(CriticalFail):
+            self.adb._shell("am", "falha")
+        self.adb.keyevent(3)
+        self.assertEqual(self.adb.shell_stats()["spawns"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
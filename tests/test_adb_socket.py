@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from bot.core.adb_socket import SocketADBClient
+from bot.core.exceptions import CriticalFail
+from bot.core.vision import cv2
+from tests.support.fake_adb_server import FakeAdbServer
+from tests.support.mock_images import create_mock_fixture_tree
+
+
+@unittest.skipIf(shutil.which("sh") is None, "shell POSIX não disponível no ambiente")
+class SocketADBClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self.temp_dir.name)
+        self.screens, _ = create_mock_fixture_tree(base)
+        self.log = base / "calls.log"
+        bin_dir = base / "bin"
+        bin_dir.mkdir()
+        # Stand-ins for the device's ``input`` and ``am`` binaries.
+        for tool in ("input", "am"):
+            script = bin_dir / tool
+            script.write_text(f'#!/bin/sh\necho "{tool} $*" >> "{self.log}"\n[ "$1" != "falha" ]\n', encoding="utf-8")
+            script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        self.env = {**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}
+
+        self.server = FakeAdbServer({"emu-1": self._device}).__enter__()
+        self.adb = SocketADBClient(serial="emu-1", port=self.server.port, pool_size=2, timeout_s=5)
+
+    def tearDown(self) -> None:
+        self.adb.close()
+        self.server.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def _device(self, service: str, command: str) -> bytes:
+        if service == "exec" and command == "screencap -p":
+            return (self.screens / "screen_with_home.png").read_bytes()
+        proc = subprocess.run(["sh", "-c", command], capture_output=True, env=self.env, check=False)
+        return proc.stdout + proc.stderr
+
+    def _wait_idle(self, count: int) -> None:
+        deadline = time.monotonic() + 2
+        while self.adb.pool_stats()["idle"] < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_commands_use_pooled_transport_connections(self) -> None:
+        self.adb.connect()
+        self.adb.tap(10, 20)
+        self._wait_idle(2)
+        self.adb.keyevent(4)
+        self.adb.stop_app("com.example.app")
+
+        self.assertEqual(
+            self.log.read_text(encoding="utf-8").splitlines(),
+            ["input tap 10 20", "input keyevent 4", "am force-stop com.example.app"],
+        )
+        self.assertEqual(self.server.requests[0], "host-serial:emu-1:wait-for-any-device")
+        self.assertIn("host:transport:emu-1", self.server.requests)
+        self.assertTrue(any(r.startswith("shell:input tap 10 20;") for r in self.server.requests))
+        self.assertGreaterEqual(self.adb.pool_stats()["pooled_hits"], 2)
+
+    def test_failures_are_critical(self) -> None:
+        with self.assertRaises(CriticalFail):
+            self.adb._shell("am", "falha")
+        with self.assertRaises(CriticalFail):
+            SocketADBClient(serial="emu-9", port=self.server.port, pool_size=0).tap(1, 1)
+
+    def test_batch_is_one_shell_service_with_per_command_status(self) -> None:
+        with self.adb.batch() as batch:
+            batch.keyevent(4)
+            batch.add("am", "falha")
+            batch.stop_app("com.example.app")
+
+        self.assertEqual([result.ok for result in batch.results], [True, False, True])
+        self.assertEqual(len([r for r in self.server.requests if r.startswith("shell:")]), 1)
+        self.assertEqual(
+            self.log.read_text(encoding="utf-8").splitlines(),
+            ["input keyevent 4", "am falha", "am force-stop com.example.app"],
+        )
+
+    @unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+    def test_capture_frame_streams_screencap_into_decoded_frame(self) -> None:
+        frame = self.adb.capture_frame()
+        expected = cv2.imread(str(self.screens / "screen_with_home.png"), cv2.IMREAD_COLOR)
+        self.assertEqual(frame.shape, expected.shape)
+        self.assertTrue((frame == expected).all())
+
+        written = self.adb.screencap(str(Path(self.temp_dir.name) / "out" / "screen.png"))
+        self.assertEqual(written.read_bytes(), (self.screens / "screen_with_home.png").read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
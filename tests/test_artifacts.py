@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from bot.core.artifacts import DROP_NEWEST, DROP_OLDEST, ArtifactWriter
+from bot.core.vision import cv2
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+@unittest.skipIf(cv2 is None or np is None, "opencv-python não disponível no ambiente")
+class ArtifactWriterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.out = Path(self.temp_dir.name)
+        self.frame = np.full((40, 60, 3), 30, dtype=np.uint8)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_writes_png_and_webp_in_background(self) -> None:
+        writer = ArtifactWriter()
+        self.assertTrue(writer.submit(self.out / "a" / "snap.png", self.frame))
+        self.assertTrue(writer.submit(self.out / "b" / "snap.webp", self.frame))
+        self.assertTrue(writer.flush(5))
+
+        self.assertEqual(cv2.imread(str(self.out / "a" / "snap.png")).shape, (40, 60, 3))
+        self.assertTrue((self.out / "b" / "snap.webp").exists())
+        self.assertEqual(writer.stats()["written"], 2)
+
+    def test_render_runs_on_a_copy(self) -> None:
+        writer = ArtifactWriter()
+
+        def render(canvas):
+            canvas[:] = 255
+            return canvas
+
+        writer.submit(self.out / "debug.png", self.frame, render)
+        writer.flush(5)
+
+        self.assertEqual(int(self.frame.max()), 30)
+        self.assertEqual(int(cv2.imread(str(self.out / "debug.png")).min()), 255)
+
+    def _blocked_writer(self, policy: str) -> tuple[ArtifactWriter, threading.Event]:
+        gate = threading.Event()
+        writer = ArtifactWriter(max_queue=1, drop_policy=policy)
+
+        def block(canvas):
+            gate.wait(5)
+            return canvas
+
+        writer.submit(self.out / "busy.png", self.frame, block)
+        # Espera a worker retirar o item da fila e ficar presa no render.
+        for _ in range(200):
+            if writer.stats()["pending"] == 0:
+                break
+            threading.Event().wait(0.005)
+        return writer, gate
+
+    def test_drop_newest_rejects_when_full(self) -> None:
+        writer, gate = self._blocked_writer(DROP_NEWEST)
+        self.assertTrue(writer.submit(self.out / "first.png", self.frame))
+        self.assertFalse(writer.submit(self.out / "second.png", self.frame))
+        gate.set()
+        writer.flush(5)
+
+        self.assertTrue((self.out / "first.png").exists())
+        self.assertFalse((self.out / "second.png").exists())
+        self.assertEqual(writer.stats()["dropped"], 1)
+
+    def test_drop_oldest_replaces_pending(self) -> None:
+        writer, gate = self._blocked_writer(DROP_OLDEST)
+        writer.submit(self.out / "first.png", self.frame)
+        self.assertTrue(writer.submit(self.out / "second.png", self.frame))
+        gate.set()
+        writer.flush(5)
+
+        self.assertFalse((self.out / "first.png").exists())
+        self.assertTrue((self.out / "second.png").exists())
+        self.assertEqual(writer.stats()["dropped"], 1)
+
+    def test_on_done_reports_written_and_dropped_artifacts(self) -> None:
+        outcomes: list[tuple[str, bool]] = []
+
+        def on_done(path: Path, error) -> None:
+            outcomes.append((path.name, error is None))
+
+        writer, gate = self._blocked_writer(DROP_OLDEST)
+        writer.submit(self.out / "first.png", self.frame, on_done=on_done)
+        writer.submit(self.out / "second.png", self.frame, on_done=on_done)
+        gate.set()
+        writer.flush(5)
+
+        self.assertEqual(outcomes, [("first.png", False), ("second.png", True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
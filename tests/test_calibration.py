@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.calibration import calibrate, load_calibrated_thresholds, load_labels, suggest_threshold, write_thresholds
+from bot.core.vision import Vision, cv2
+from tests.support.mock_images import create_mock_fixture_tree
+
+
+class SuggestThresholdTests(unittest.TestCase):
+    def test_separable_scores_use_gap_midpoint(self) -> None:
+        suggestion = suggest_threshold([0.97, 0.99], [0.41, 0.83])
+        self.assertEqual(suggestion["threshold"], 0.9)
+        self.assertEqual(suggestion["margin"], 0.07)
+        self.assertFalse(suggestion["overlap"])
+
+    def test_overlap_minimises_errors_and_flags_it(self) -> None:
+        suggestion = suggest_threshold([0.86, 0.95, 0.97], [0.5, 0.9])
+        self.assertEqual(suggestion["threshold"], 0.86)
+        self.assertTrue(suggestion["overlap"])
+        self.assertLess(suggestion["margin"], 0)
+
+    def test_without_positives_there_is_no_suggestion(self) -> None:
+        self.assertIsNone(suggest_threshold([], [0.3]))
+
+    def test_without_negatives_there_is_no_suggestion(self) -> None:
+        self.assertIsNone(suggest_threshold([0.97, 0.99], []))
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class CalibrationCorpusTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.screens, self.templates = create_mock_fixture_tree(self.base)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_calibrate_labelled_corpus_and_load_output(self) -> None:
+        labels = self.base / "labels.yaml"
+        labels.write_text(
+            "screens/screen_with_home.png: [home.tela_home]\n"
+            "screens/screen_home_and_button.png: [home.tela_home, home.botao_home]\n"
+            "screens/screen_with_c*.png: []\n"
+            "screens/screen_blank.png: []\n",
+            encoding="utf-8",
+        )
+        samples = load_labels(labels)
+        self.assertEqual(len(samples), 5)
+
+        vision = Vision(str(self.templates), frame_cache_size=0, roi_learning=False, color_prefilter=False)
+        report = calibrate(vision, samples)
+
+        self.assertEqual(sorted(report["templates_confidence"]), ["home.botao_home", "home.tela_home"])
+        home = report["calibration"]["home.tela_home"]
+        self.assertEqual((home["present"], home["absent"]), (2, 3))
+        self.assertFalse(home["overlap"])
+        self.assertGreater(home["present_min"], home["threshold"])
+
+        output = write_thresholds(report, self.base / "out" / "thresholds.yaml")
+        loaded = load_calibrated_thresholds(output)
+        self.assertEqual(loaded, report["templates_confidence"])
+        self.assertEqual(load_calibrated_thresholds(self.base / "missing.yaml"), {})
+
+        calibrated = Vision(
+            str(self.templates),
+            calibrated_confidence={"home.tela_home": 0.999},
+            templates_confidence={"home.tela_home": 0.1},
+        )
+        screen = str(self.screens / "screen_blank.png")
+        self.assertFalse(calibrated.exists(screen, "home.tela_home"))
+        # An explicit threshold at the call site still wins over the calibrated one.
+        self.assertTrue(calibrated.exists(screen, "home.tela_home", threshold=-1.0))
+
+    def test_templates_without_absent_samples_stay_uncalibrated(self) -> None:
+        labels = self.base / "labels.yaml"
+        labels.write_text("screens/screen_with_home.png: [home.tela_home]\n", encoding="utf-8")
+        vision = Vision(str(self.templates), frame_cache_size=0, roi_learning=False)
+
+        report = calibrate(vision, load_labels(labels))
+
+        self.assertEqual(report["templates_confidence"], {})
+        self.assertEqual(report["uncalibrated"], ["home.tela_home"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from bot.core.device_scale import DeviceScaleStore
+
+
+class DeviceScaleStoreTests(unittest.TestCase):
+    def test_concurrent_writers_keep_every_entry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "scales" / "device_scales.json"
+            start = threading.Barrier(8)
+
+            def calibrate(index: int) -> None:
+                store = DeviceScaleStore(path)
+                start.wait()
+                for round_ in range(10):
+                    store.set(f"emu-{index}", 1.0 + index / 100 + round_ / 1000)
+
+            threads = [threading.Thread(target=calibrate, args=(index,)) for index in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            store = DeviceScaleStore(path)
+            self.assertEqual(
+                {f"emu-{index}": store.get(f"emu-{index}") for index in range(8)},
+                {f"emu-{index}": round(1.0 + index / 100 + 9 / 1000, 4) for index in range(8)},
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
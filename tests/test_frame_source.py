@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import itertools
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from bot.core.exceptions import SoftFail
+from bot.core.fake_adb import FakeADB
+from bot.core.frame_source import FakeFrameSource, FrameSource, with_frame_barrier
+from bot.core.vision import Vision, cv2
+from tests.support.mock_images import create_mock_fixture_tree
+
+
+class FrameSourceTests(unittest.TestCase):
+    def test_serves_latest_frame_with_sequence(self) -> None:
+        counter = itertools.count(1)
+        source = FrameSource(lambda: next(counter), min_interval_s=0.01).start()
+        try:
+            first = source()
+            first_sequence = source.sequence
+            time.sleep(0.05)
+            second = source()
+            self.assertGreater(second, first)
+            self.assertGreater(source.sequence, first_sequence)
+        finally:
+            source.stop()
+
+    def test_barrier_waits_for_capture_started_after_it(self) -> None:
+        release = threading.Event()
+        counter = itertools.count(1)
+
+        def capture() -> int:
+            release.wait()
+            return next(counter)
+
+        source = FrameSource(capture, wait_timeout_s=2).start()
+        try:
+            release.set()
+            before = source()
+            release.clear()
+            source.barrier()
+            threading.Timer(0.05, release.set).start()
+            after = source()
+            self.assertGreater(after, before)
+            self.assertEqual(source.stats()["barrier_waits"], 1)
+        finally:
+            release.set()
+            source.stop()
+
+    def test_failing_capture_surfaces_as_soft_fail(self) -> None:
+        def capture() -> None:
+            raise RuntimeError("device offline")
+
+        source = FrameSource(capture, wait_timeout_s=0.1).start()
+        try:
+            with self.assertRaises(SoftFail):
+                source()
+            self.assertGreater(source.stats()["errors"], 0)
+        finally:
+            source.stop()
+
+    def test_input_through_barrier_adb_invalidates_frames(self) -> None:
+        fake = FakeFrameSource([object()])
+        adb = with_frame_barrier(FakeADB(), fake)
+        adb.tap(1, 2)
+        adb.keyevent(4)
+        self.assertEqual(adb.serial, "fake-serial")
+        self.assertEqual(fake.barriers, 2)
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class FrameSourceVisionTests(unittest.TestCase):
+    def test_wait_for_skips_frames_it_already_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            screens, templates = create_mock_fixture_tree(Path(tmp))
+            blank = cv2.imread(str(screens / "screen_blank.png"), cv2.IMREAD_COLOR)
+            home = cv2.imread(str(screens / "screen_with_home.png"), cv2.IMREAD_COLOR)
+            source = FakeFrameSource([blank, home], repeat=3)
+            vision = Vision(str(templates), skip_unchanged_frames=False)
+
+            result = vision.wait_for(source, "home.tela_home", timeout_s=2, interval_s=0.01, threshold=0.88)
+
+        self.assertEqual(result["top_left"], (160, 120))
+        self.assertEqual(vision.wait_stats(), {"matches": 2, "skipped_matches": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.exceptions import SoftFail
+from bot.core.frames import decode_screencap, parse_raw_header, raw_pixels
+from bot.core.vision import cv2
+from tests.support.mock_images import create_benchmark_fixture, encode_raw_screencap
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class RawScreencapTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        fixture = create_benchmark_fixture(Path(self.temp_dir.name), (320, 180), 2)
+        self.png = fixture["screen"].read_bytes()
+        self.frame = cv2.imread(str(fixture["screen"]), cv2.IMREAD_COLOR)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_raw_headers_of_both_android_layouts_decode_to_same_frame(self) -> None:
+        for header_size in (12, 16):
+            data = encode_raw_screencap(self.frame, header_size)
+            header = parse_raw_header(data)
+            self.assertEqual((header.width, header.height, header.header_size), (320, 180, header_size))
+            self.assertTrue((decode_screencap(data) == self.frame).all())
+
+    def test_raw_pixels_are_a_view_over_the_payload(self) -> None:
+        data = bytearray(encode_raw_screencap(self.frame))
+        _, pixels = raw_pixels(data)
+        data[16] ^= 0xFF  # first red byte
+        self.assertEqual(int(pixels[0, 0, 0]), data[16])
+
+    def test_gzip_and_png_payloads_are_detected(self) -> None:
+        compressed = gzip.compress(encode_raw_screencap(self.frame), compresslevel=1)
+        self.assertTrue((decode_screencap(compressed) == self.frame).all())
+        self.assertTrue((decode_screencap(self.png) == self.frame).all())
+
+    def test_truncated_raw_payload_is_soft_fail(self) -> None:
+        with self.assertRaises(SoftFail):
+            decode_screencap(encode_raw_screencap(self.frame)[:-10])
+
+
+if __name__ == "__main__":
+    unittest.main()
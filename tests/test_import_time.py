@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import unittest
+
+from benchmarks.import_time import measure_imports, parse_importtime
+from bot.core.dependency_check import validate_runtime_dependencies
+from bot.core.lazy_import import LazyModule, is_loaded, module_available, resolve
+
+
+class ImportTimeTests(unittest.TestCase):
+    def test_entrypoint_does_not_import_heavy_dependencies(self) -> None:
+        report = measure_imports("bot.main", top=5)
+        self.assertEqual(report["heavy_loaded"], [])
+        self.assertNotIn("bot.flow.step_04_amigos", dict(report["slowest"]))
+        self.assertGreater(report["total_ms"], 0)
+
+    def test_parse_importtime_skips_header(self) -> None:
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+        )
+        self.assertEqual(parse_importtime(stderr), {"json.decoder": (120, 120), "json": (300, 420)})
+
+    def test_lazy_module_defers_import_and_reports_missing(self) -> None:
+        lazy = LazyModule("json")
+        self.assertFalse(is_loaded(lazy))
+        self.assertEqual(lazy.dumps([1]), "[1]")
+        self.assertTrue(is_loaded(lazy))
+
+        missing = LazyModule("modulo_que_nao_existe")
+        self.assertFalse(missing)
+        self.assertIsNone(resolve(missing))
+        with self.assertRaises(ImportError):
+            missing.anything
+        self.assertFalse(module_available("modulo_que_nao_existe"))
+
+    def test_dependency_check_passes_without_importing(self) -> None:
+        validate_runtime_dependencies()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.polling import (
+    AppearanceHistory,
+    AppearanceStore,
+    BackoffSchedule,
+    FixedSchedule,
+    HistorySchedule,
+    HotStartSchedule,
+    build_schedule,
+)
+
+
+class PollingScheduleTests(unittest.TestCase):
+    def test_default_spec_is_fixed_interval(self) -> None:
+        schedule = build_schedule(None, 0.5)
+        self.assertIsInstance(schedule, FixedSchedule)
+        self.assertEqual(schedule.interval(10, 5.0), 0.5)
+
+    def test_backoff_grows_and_caps(self) -> None:
+        schedule = build_schedule({"mode": "backoff", "initial_s": 0.1, "factor": 2, "max_s": 0.5}, 0.5)
+        self.assertIsInstance(schedule, BackoffSchedule)
+        self.assertEqual([schedule.interval(i, 0.0) for i in range(4)], [0.1, 0.2, 0.4, 0.5])
+
+    def test_hot_start_slows_after_window(self) -> None:
+        schedule = build_schedule("hot_start", 0.5)
+        self.assertIsInstance(schedule, HotStartSchedule)
+        self.assertEqual(schedule.interval(0, 0.2), schedule.fast_s)
+        self.assertEqual(schedule.interval(8, 5.0), schedule.slow_s)
+
+    def test_history_schedule_polls_densely_in_usual_window(self) -> None:
+        history = AppearanceHistory()
+        schedule = build_schedule({"mode": "history", "min_s": 0.1, "max_s": 1.0}, 0.5, history, "roleta.resultado")
+        self.assertIsInstance(schedule, HistorySchedule)
+        self.assertEqual(schedule.interval(0, 0.0), schedule.fallback.interval(0, 0.0))
+
+        for elapsed in (3.0, 3.2, 3.5, 4.0):
+            history.record("roleta.resultado", elapsed)
+
+        self.assertEqual(schedule.interval(0, 0.0), 1.0)
+        self.assertAlmostEqual(schedule.interval(1, 2.6), 0.4)
+        self.assertEqual(schedule.interval(2, 3.3), 0.1)
+        self.assertEqual(schedule.interval(3, 6.0), 1.0)
+
+    def test_history_persists_across_runs_per_instance(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "appearance_history.json"
+            first_run = AppearanceHistory(store=AppearanceStore(path), key="emu-1")
+            for elapsed in (3.0, 3.2, 3.5):
+                first_run.record("roleta.resultado", elapsed)
+            AppearanceHistory(store=AppearanceStore(path), key="emu-2").record("roleta.resultado", 9.0)
+
+            next_run = AppearanceHistory(store=AppearanceStore(path), key="emu-1")
+            schedule = build_schedule({"mode": "history"}, 0.5, next_run, "roleta.resultado")
+
+            self.assertEqual(next_run.count("roleta.resultado"), 3)
+            self.assertEqual(next_run.quantile("roleta.resultado", 1.0), 3.5)
+            self.assertNotEqual(schedule.interval(0, 0.0), schedule.fallback.interval(0, 0.0))
+
+    def test_unknown_mode_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            build_schedule({"mode": "turbo"}, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
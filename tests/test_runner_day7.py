@@ -14,8 +14,9 @@ from bot.runner import instance_runner
 class FakeADBForRunner:
     stop_failures_left = 0
 
-    def __init__(self, serial: str, adb_bin: str = "adb") -> None:
+    def __init__(self, serial: str, adb_bin: str = "adb", screencap_format: str = "png") -> None:
         self.serial = serial
+        self.screencap_format = screencap_format
         self.calls = []
 
     def connect(self) -> None:
@@ -117,6 +118,14 @@ class RunnerDay7Tests(unittest.TestCase):
         self.assertIn("Reason.UNKNOWN", summary)
         self.assertIn("Reason.VPN_ERROR", summary)
 
+    def test_screencap_snapshot_fallback_keeps_png_extension(self) -> None:
+        instance_runner.default_steps = lambda: [CriticalVPNErrorStep()]
+        code = instance_runner.run_instance(self.instance, {**self.bot_config, "snapshot_format": "webp"})
+        self.assertEqual(code, 2)
+        snapshots = list((Path(self.tmp.name) / "snapshots" / "inst_test").iterdir())
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(snapshots[0].suffix, ".png")
+
     def test_safe_shutdown_retries_until_success(self) -> None:
         instance_runner.default_steps = lambda: [OkStep()]
         FakeADBForRunner.stop_failures_left = 2
@@ -6,8 +6,10 @@ import unittest
 from pathlib import Path
 
 from bot.core.exceptions import CriticalFail, SoftFail
+from bot.core.vision import Vision, cv2
 from bot.flow.step_01_home import Step01Home
 from bot.flow.step_base import StepContext
+from tests.support.mock_images import create_mock_fixture_tree
 
 
 class FakeVisionForStep01:
@@ -17,7 +19,7 @@ class FakeVisionForStep01:
         self.crash_attempts = set(crash_attempts or [])
         self.current_attempt = 0
 
-    def wait_for(self, capture_fn, template_name: str, timeout_s: int = 0):
+    def wait_for(self, capture_fn, template_name: str, timeout_s: int = 0, **kwargs):
         self.current_attempt += 1
         capture_fn()
         if self.home_on_attempt == self.current_attempt:
@@ -33,6 +35,9 @@ class FakeVisionForStep01:
             return self.home_on_attempt == self.current_attempt
         return False
 
+    def classify(self, screen, candidates, threshold=None):
+        return next((name for name in candidates if self.exists(screen, name)), None)
+
     def click_template(self, *args, **kwargs):
         return {"score": 0.95, "center": (10, 10)}
 
@@ -118,5 +123,42 @@ class Step01HomeTests(unittest.TestCase):
             Step01Home().run(self._context(adb, vision))
 
 
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class Step01HomeThresholdTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.screens, self.templates = create_mock_fixture_tree(Path(self.temp_dir.name))
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _run_on_crash_screen(self, vision: Vision) -> FakeADBRecorder:
+        adb = FakeADBRecorder(self.screens / "screen_with_crash.png")
+        context = StepContext(
+            instance_id="inst_test",
+            adb=adb,
+            vision=vision,
+            logger=logging.getLogger("tests.step01"),
+            config={
+                "app_package": "com.example",
+                "app_activity": ".Main",
+                "step_01": {"max_attempts": 1, "home_timeout_s": 0, "recovery_back_limit": 1},
+            },
+        )
+        with self.assertRaises(CriticalFail):
+            Step01Home().run(context)
+        return adb
+
+    def test_error_classification_uses_calibrated_threshold(self) -> None:
+        configured = self._run_on_crash_screen(Vision(str(self.templates), default_confidence=0.88))
+        self.assertIn(("stop_app", "com.example"), configured.calls)
+
+        # Calibrated above any reachable score: the step must not see the crash.
+        calibrated = self._run_on_crash_screen(
+            Vision(str(self.templates), default_confidence=0.88, calibrated_confidence={"erros.app_crash": 1.01})
+        )
+        self.assertNotIn(("stop_app", "com.example"), calibrated.calls)
+
+
 if __name__ == "__main__":
     unittest.main()
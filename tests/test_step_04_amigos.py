@@ -73,6 +73,9 @@ class FakeVisionAmigos:
             return True
         return False
 
+    def classify(self, screen, candidates, threshold=None):
+        return next((name for name in candidates if self.exists(screen, name)), None)
+
 
 class Step04AmigosTests(unittest.TestCase):
     def setUp(self) -> None:
@@ -57,6 +57,9 @@ class FakeVisionVPN:
             return self.error
         return False
 
+    def classify(self, screen, candidates, threshold=None):
+        return next((name for name in candidates if self.exists(screen, name)), None)
+
 
 class Step07VPNTests(unittest.TestCase):
     def setUp(self) -> None:
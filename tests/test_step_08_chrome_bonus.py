@@ -102,5 +102,18 @@ class Step08ChromeBonusTests(unittest.TestCase):
             Step08ChromeBonus().run(self._context(adb, vision))
         self.assertEqual(err.exception.reason, Reason.BONUS_PAGE_NOT_FOUND)
 
+    def test_input_text_failure_skips_enter(self) -> None:
+        class NoKeyboardADB(FakeADBRecorder):
+            def input_text(self, text: str) -> None:
+                raise CriticalFail("input text falhou")
+
+        adb = NoKeyboardADB(self.fixture)
+        context = self._context(adb, FakeVisionChrome(page_ok=True))
+        context.config["step_08"]["navigation_mode"] = "input_text"
+        with self.assertRaises(CriticalFail):
+            Step08ChromeBonus().run(context)
+        self.assertNotIn(("keyevent", 66), adb.calls)
+
+
 if __name__ == "__main__":
     unittest.main()
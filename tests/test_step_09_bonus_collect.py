@@ -55,6 +55,9 @@ class FakeVisionBonus:
             return True
         return False
 
+    def classify(self, screen, candidates, threshold=None):
+        return next((name for name in candidates if self.exists(screen, name)), None)
+
 
 class Step09BonusCollectTests(unittest.TestCase):
     def setUp(self) -> None:
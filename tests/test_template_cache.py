@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.template_cache import TemplateCache
+from bot.core.vision import Vision, cv2
+from tests.support.mock_images import create_mock_fixture_tree
+
+
+class _Blob:
+    def __init__(self, nbytes: int) -> None:
+        self.nbytes = nbytes
+
+
+class TemplateCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_over_budget(self) -> None:
+        cache = TemplateCache(max_bytes=250)
+        cache.put("a", _Blob(100))
+        cache.put("b", _Blob(100))
+        cache.get("a")
+        cache.put("c", _Blob(100))
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        stats = cache.stats()
+        self.assertEqual((stats["bytes"], stats["evictions"]), (200, 1))
+
+    def test_pinned_and_shared_entries_survive(self) -> None:
+        cache = TemplateCache(max_bytes=150, pinned=["home"])
+        cache.put("home", _Blob(100))
+        cache.put(("home", "scaled", 0.5), _Blob(25))
+        cache.put("pack", _Blob(500), size=0)
+        cache.put("other", _Blob(100))
+
+        self.assertIn("home", cache)
+        self.assertIn(("home", "scaled", 0.5), cache)
+        self.assertIn("pack", cache)
+        self.assertIn("other", cache)
+        self.assertEqual(cache.stats()["pinned"], 2)
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class VisionTemplateBudgetTests(unittest.TestCase):
+    def test_budget_bounds_bytes_and_reloads_evicted_templates(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            screens, templates = create_mock_fixture_tree(Path(tmp))
+            vision = Vision(str(templates), template_cache_bytes=25_000, pinned_templates=["home.tela_home"])
+            screen = str(screens / "screen_home_and_button.png")
+            names = ["home.tela_home", "home.botao_home", "erros.app_crash", "erros.popup_erro_conexao"]
+
+            for _ in range(2):
+                matches = vision.match_many(screen, names, threshold=0.88)
+                self.assertEqual(matches.hits, ["home.tela_home", "home.botao_home"])
+
+            stats = vision.template_cache_stats()
+            self.assertLessEqual(stats["bytes"], 25_000)
+            self.assertGreater(stats["evictions"], 0)
+            self.assertIn("home.tela_home", vision._templates)
+
+
+if __name__ == "__main__":
+    unittest.main()
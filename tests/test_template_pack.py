@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.template_ids import T_HOME_BUTTON, T_HOME_SCREEN
+from bot.core.template_pack import TemplatePack, build_template_pack, known_template_ids
+from bot.core.vision import Vision, cv2
+from tests.support.mock_images import create_mock_fixture_tree
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class TemplatePackTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.screens, self.templates = create_mock_fixture_tree(Path(self.temp_dir.name))
+        self.pack_path = Path(self.temp_dir.name) / "pack" / "templates.pack.npy"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_build_covers_declared_ids_and_reports_missing(self) -> None:
+        report = build_template_pack(self.templates, {}, self.pack_path)
+
+        self.assertIn(T_HOME_SCREEN, report["packed"])
+        self.assertIn(T_HOME_BUTTON, report["packed"])
+        self.assertIn("amigos.botao_entrar", report["missing"])
+        self.assertEqual(sorted(report["packed"] + report["missing"]), sorted(known_template_ids()))
+
+    def test_pack_views_match_png_pixels(self) -> None:
+        build_template_pack(self.templates, {}, self.pack_path)
+        pack = TemplatePack.open(self.pack_path)
+
+        view = pack.get(T_HOME_SCREEN)
+        original = cv2.imread(str(self.templates / "home" / "tela_home.png"), cv2.IMREAD_COLOR)
+        self.assertEqual(view.shape, original.shape)
+        self.assertTrue((view == original).all())
+        self.assertFalse(view.flags.writeable)
+
+    def test_vision_preloads_pack_and_matches(self) -> None:
+        build_template_pack(self.templates, {}, self.pack_path)
+        vision = Vision(str(self.templates), template_pack=str(self.pack_path))
+
+        self.assertIn(T_HOME_SCREEN, vision._templates)
+        self.assertTrue(vision.exists(str(self.screens / "screen_with_home.png"), T_HOME_SCREEN, threshold=0.88))
+
+    def test_edited_png_is_loaded_instead_of_stale_pack_entry(self) -> None:
+        build_template_pack(self.templates, {}, self.pack_path)
+        edited = self.templates / "home" / "tela_home.png"
+        image = cv2.imread(str(edited), cv2.IMREAD_COLOR)
+        cv2.imwrite(str(edited), 255 - image)
+
+        with self.assertLogs("bot.core.vision", level="WARNING") as logs:
+            vision = Vision(str(self.templates), template_pack=str(self.pack_path))
+
+        self.assertNotIn(T_HOME_SCREEN, vision._templates)
+        self.assertIn(T_HOME_BUTTON, vision._templates)
+        self.assertTrue(any(T_HOME_SCREEN in line for line in logs.output))
+        self.assertTrue((vision.load_template(T_HOME_SCREEN) == 255 - image).all())
+
+    def test_missing_pack_falls_back_to_png(self) -> None:
+        vision = Vision(str(self.templates), template_pack=str(self.pack_path))
+
+        self.assertIsNone(vision.template_pack)
+        self.assertTrue(vision.exists(str(self.screens / "screen_with_home.png"), T_HOME_SCREEN, threshold=0.88))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 import tempfile
+import threading
 import unittest
+from unittest import mock
 from pathlib import Path
 
 from bot.core.fake_adb import FakeADB
@@ -106,6 +108,293 @@ class VisionTests(unittest.TestCase):
         self.assertIn("top_left", result)
         self.assertIn("bottom_right", result)
 
+    def test_find_best_accepts_in_memory_frame(self) -> None:
+        adb = FakeADB([self.screens / "screen_with_home.png"])
+        frame = adb.capture_frame()
+        from_frame = self.vision.find_best(frame, "home.tela_home")
+        from_file = self.vision.find_best(str(self.screens / "screen_with_home.png"), "home.tela_home")
+        self.assertEqual(from_frame["top_left"], from_file["top_left"])
+        self.assertAlmostEqual(from_frame["score"], from_file["score"], places=5)
+
+    def test_wait_for_with_frame_capture_writes_no_file(self) -> None:
+        seq = [self.screens / "screen_blank.png", self.screens / "screen_with_home.png"]
+        adb = FakeADB(seq)
+
+        result = self.vision.wait_for(adb.capture_frame, "home.tela_home", timeout_s=2, interval_s=0.01, threshold=0.88)
+
+        self.assertGreater(result["score"], 0.88)
+        self.assertFalse(any(call[0] == "screencap" for call in adb.calls))
+        self.assertGreaterEqual(len([c for c in adb.calls if c[0] == "capture_frame"]), 2)
+
+    def test_match_many_scores_all_templates_in_one_pass(self) -> None:
+        screen = str(self.screens / "screen_home_and_button.png")
+        matches = self.vision.match_many(
+            screen,
+            ["erros.app_crash", "home.tela_home", "home.botao_home"],
+            threshold=0.88,
+        )
+        self.assertEqual(list(matches.results), ["erros.app_crash", "home.tela_home", "home.botao_home"])
+        self.assertEqual(matches.hits, ["home.tela_home", "home.botao_home"])
+        self.assertEqual(matches.first_hit, "home.tela_home")
+        self.assertFalse(matches.hit("erros.app_crash"))
+        self.assertGreater(matches.score("home.botao_home"), 0.88)
+
+    def test_classify_stops_at_first_hit(self) -> None:
+        screen = str(self.screens / "screen_home_and_button.png")
+        matches = self.vision.match_many(screen, ["home.tela_home", "home.botao_home"], threshold=0.88, first_hit=True)
+        self.assertEqual(list(matches.results), ["home.tela_home"])
+        self.assertEqual(self.vision.classify(screen, ["erros.app_crash", "home.botao_home"], threshold=0.88), "home.botao_home")
+        self.assertIsNone(self.vision.classify(screen, ["erros.app_crash"], threshold=0.88))
+
+    def test_missing_template_scores_zero_instead_of_aborting(self) -> None:
+        screen = str(self.screens / "screen_home_and_button.png")
+        self.assertFalse(self.vision.exists(screen, "amigos.sem_presentes", threshold=0.88))
+        matches = self.vision.match_many(screen, ["amigos.sem_presentes", "home.tela_home"], threshold=0.88)
+        self.assertFalse(matches.hit("amigos.sem_presentes"))
+        self.assertIn("error", matches.results["amigos.sem_presentes"])
+        self.assertEqual(matches.hits, ["home.tela_home"])
+        self.assertEqual(
+            self.vision.classify(screen, ["amigos.sem_presentes", "home.tela_home"], threshold=0.88), "home.tela_home"
+        )
+
+    def test_frame_cache_reuses_decode_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            capture = Path(tmp) / "screen.png"
+            capture.write_bytes((self.screens / "screen_with_home.png").read_bytes())
+
+            self.assertTrue(self.vision.exists(str(capture), "home.tela_home", threshold=0.88))
+            self.assertFalse(self.vision.exists(str(capture), "erros.app_crash", threshold=0.88))
+            stats = self.vision.frame_cache_stats()
+            self.assertEqual((stats["misses"], stats["hits"]), (1, 1))
+
+            capture.write_bytes((self.screens / "screen_with_crash.png").read_bytes())
+            self.assertTrue(self.vision.exists(str(capture), "erros.app_crash", threshold=0.88))
+            self.assertEqual(self.vision.frame_cache_stats()["misses"], 2)
+
+    def test_learned_roi_is_used_after_first_match(self) -> None:
+        screen = str(self.screens / "screen_with_home.png")
+        first = self.vision.find_best(screen, "home.tela_home", threshold=0.88)
+        second = self.vision.find_best(screen, "home.tela_home", threshold=0.88)
+
+        self.assertEqual(first["top_left"], second["top_left"])
+        stats = self.vision.roi_stats()
+        self.assertEqual(stats["full_frame"], 1)
+        self.assertEqual(stats["roi_hits"], 1)
+
+    def test_static_roi_falls_back_to_full_frame_on_miss(self) -> None:
+        vision = Vision(str(self.templates), templates_roi={"home.tela_home": [0, 0, 90, 50]}, roi_padding_px=4)
+        result = vision.find_best(str(self.screens / "screen_with_home.png"), "home.tela_home", threshold=0.88)
+
+        self.assertEqual(result["top_left"], (160, 120))
+        stats = vision.roi_stats()
+        self.assertEqual((stats["roi_misses"], stats["full_frame"]), (1, 1))
+
+    def test_cascade_mode_matches_like_full_resolution(self) -> None:
+        cascade = {"scale": 0.5, "channels": "gray", "candidates": 2}
+        vision = Vision(
+            str(self.templates),
+            templates_cascade={"home.tela_home": cascade, "erros.app_crash": cascade},
+            roi_learning=False,
+        )
+        screen = str(self.screens / "screen_with_home.png")
+
+        result = vision.find_best(screen, "home.tela_home", threshold=0.88)
+        reference = self.vision.find_best(screen, "home.tela_home", threshold=0.88)
+        self.assertEqual(result["top_left"], reference["top_left"])
+        self.assertAlmostEqual(result["score"], reference["score"], places=4)
+        self.assertFalse(vision.exists(screen, "erros.app_crash", threshold=0.88))
+
+    def test_cascade_downscales_the_frame_once_for_all_templates(self) -> None:
+        cascade = {"scale": 0.5, "channels": "gray", "candidates": 2}
+        names = ["erros.app_crash", "home.botao_home", "home.tela_home"]
+        vision = Vision(str(self.templates), templates_cascade={name: cascade for name in names}, roi_learning=False)
+        screen = str(self.screens / "screen_home_and_button.png")
+        frame_shape = cv2.imread(screen, cv2.IMREAD_COLOR).shape
+
+        with mock.patch.object(Vision, "_downscale", side_effect=Vision._downscale) as downscale:
+            matches = vision.match_many(screen, names, threshold=0.88)
+
+        self.assertEqual(matches.hits, ["home.botao_home", "home.tela_home"])
+        frame_calls = [call for call in downscale.call_args_list if call.args[0].shape == frame_shape]
+        self.assertEqual(len(frame_calls), 1)
+
+    def test_wait_for_skips_matching_on_unchanged_frames(self) -> None:
+        vision = Vision(str(self.templates), skip_unchanged_frames=True)
+        adb = FakeADB([self.screens / "screen_blank.png"] * 4 + [self.screens / "screen_with_home.png"])
+
+        result = vision.wait_for(adb.capture_frame, "home.tela_home", timeout_s=2, interval_s=0.01, threshold=0.88)
+
+        self.assertGreater(result["score"], 0.88)
+        stats = vision.wait_stats()
+        self.assertEqual(stats["skipped_matches"], 3)
+        self.assertEqual(stats["matches"], 2)
+
+    def test_wait_for_without_skip_matches_every_poll(self) -> None:
+        vision = Vision(str(self.templates))
+        adb = FakeADB([self.screens / "screen_blank.png"] * 3 + [self.screens / "screen_with_home.png"])
+
+        vision.wait_for(adb.capture_frame, "home.tela_home", timeout_s=2, interval_s=0.01, threshold=0.88)
+
+        self.assertEqual(vision.wait_stats(), {"matches": 4, "skipped_matches": 0})
+
+    def test_template_stats_track_calls_hits_and_histogram(self) -> None:
+        screen = str(self.screens / "screen_with_home.png")
+        self.vision.exists(screen, "home.tela_home", threshold=0.88)
+        self.vision.match_many(screen, ["home.tela_home", "erros.app_crash"], threshold=0.88)
+
+        stats = self.vision.template_stats()
+        home = stats["home.tela_home"]
+        self.assertEqual((home["calls"], home["hits"], home["misses"]), (2, 2, 0))
+        self.assertEqual(home["histogram"], {"0.98-1.00": 2})
+        self.assertEqual(stats["erros.app_crash"]["hit_ratio"], 0.0)
+        self.assertGreater(home["match_ms"], 0.0)
+
+    def test_multi_scale_detects_and_persists_device_scale(self) -> None:
+        native = cv2.imread(str(self.screens / "screen_home_and_button.png"), cv2.IMREAD_COLOR)
+        h, w = native.shape[:2]
+        small = cv2.resize(native, (int(w * 0.75), int(h * 0.75)), interpolation=cv2.INTER_AREA)
+        store = self.fixtures / "scales.json"
+
+        vision = Vision(str(self.templates), multi_scale=True, scale_store=str(store), device_id="emu-1")
+        self.assertFalse(vision.exists(small, "home.botao_home", threshold=0.88))
+        self.assertTrue(vision.exists(small, "home.tela_home", threshold=0.88))
+        self.assertEqual(vision.device_scale, 0.75)
+        self.assertTrue(vision.exists(small, "home.botao_home", threshold=0.88))
+
+        restored = Vision(str(self.templates), multi_scale=True, scale_store=str(store), device_id="emu-1")
+        self.assertEqual(restored.device_scale, 0.75)
+        self.assertTrue(restored.exists(small, "home.botao_home", threshold=0.88))
+        self.assertEqual(restored.scale_stats(), {"scale": 0.75, "variants": 1})
+
+    def test_color_prefilter_rejects_absent_templates_and_reports_rate(self) -> None:
+        vision = Vision(str(self.templates), color_prefilter=True, prefilter_audit_rate=1.0)
+        screen = str(self.screens / "screen_with_home.png")
+
+        self.assertFalse(vision.exists(screen, "erros.app_crash", threshold=0.88))
+        self.assertTrue(vision.exists(screen, "home.tela_home", threshold=0.88))
+
+        stats = vision.prefilter_stats()
+        self.assertEqual((stats["checked"], stats["rejected"], stats["false_rejects"]), (2, 1, 0))
+        self.assertEqual(stats["audited"], 1)
+        self.assertEqual(stats["reject_rate"], 0.5)
+
+    def test_fft_backend_matches_opencv_and_reuses_template_spectrum(self) -> None:
+        vision = Vision(str(self.templates), match_backend="fft", roi_learning=False, color_prefilter=False)
+        screen = str(self.screens / "screen_home_and_button.png")
+
+        matches = vision.match_many(screen, ["home.tela_home", "home.botao_home", "erros.app_crash"], threshold=0.88)
+        opencv = Vision(str(self.templates), roi_learning=False, color_prefilter=False)
+        reference = opencv.match_many(screen, ["home.tela_home", "home.botao_home", "erros.app_crash"], threshold=0.88)
+        for name, result in reference.results.items():
+            self.assertEqual(matches.results[name]["top_left"], result["top_left"])
+            self.assertAlmostEqual(matches.score(name), result["score"], places=3)
+
+        vision.find_best(screen, "home.tela_home")
+        self.assertEqual(vision.backend_stats()["fft"], {"spectra": 3, "hits": 1, "misses": 3})
+
+    def test_auto_backend_selects_once_per_template(self) -> None:
+        vision = Vision(str(self.templates), templates_backend={"home.tela_home": "auto"})
+        screen = str(self.screens / "screen_with_home.png")
+
+        self.assertTrue(vision.exists(screen, "home.tela_home", threshold=0.88))
+        self.assertTrue(vision.exists(screen, "home.tela_home", threshold=0.88))
+        selected = vision.backend_stats()["selected"]
+        self.assertEqual(list(selected), ["home.tela_home"])
+        self.assertIn(selected["home.tela_home"], ("opencv", "fft"))
+
+    def test_parallel_match_many_keeps_order_and_first_hit_semantics(self) -> None:
+        vision = Vision(str(self.templates), match_workers=4, color_prefilter=False)
+        screen = str(self.screens / "screen_home_and_button.png")
+        names = ["erros.app_crash", "home.tela_home", "home.botao_home", "erros.popup_erro_conexao"]
+
+        matches = vision.match_many(screen, names, threshold=0.88)
+        sequential = Vision(str(self.templates), color_prefilter=False).match_many(screen, names, threshold=0.88)
+        self.assertEqual(list(matches.results), names)
+        self.assertEqual(matches.hits, sequential.hits)
+        for name in names:
+            self.assertAlmostEqual(matches.score(name), sequential.score(name), places=5)
+
+        first = vision.match_many(screen, names, threshold=0.88, first_hit=True)
+        self.assertEqual(list(first.results), ["erros.app_crash", "home.tela_home"])
+        self.assertEqual(vision.parallel_stats()["fanouts"], 2)
+
+    def test_parallel_first_hit_does_not_record_discarded_matches(self) -> None:
+        second_started, release, second_done = threading.Event(), threading.Event(), threading.Event()
+
+        class SlowSecondVision(Vision):
+            def _score_frame(self, screen, frame, template_name, threshold, decode_s=0.0):
+                if template_name == "home.botao_home":
+                    second_started.set()
+                    release.wait(5)
+                    try:
+                        return super()._score_frame(screen, frame, template_name, threshold, decode_s)
+                    finally:
+                        second_done.set()
+                second_started.wait(5)
+                return super()._score_frame(screen, frame, template_name, threshold, decode_s)
+
+        vision = SlowSecondVision(str(self.templates), match_workers=4, color_prefilter=False)
+        screen = str(self.screens / "screen_home_and_button.png")
+
+        first = vision.match_many(screen, ["home.tela_home", "home.botao_home"], threshold=0.88, first_hit=True)
+        release.set()
+        self.assertTrue(second_done.wait(5))
+
+        self.assertEqual(list(first.results), ["home.tela_home"])
+        self.assertEqual(list(vision.template_stats()), ["home.tela_home"])
+        self.assertEqual(vision.roi_stats()["learned"], 1)
+
+    def test_hot_reload_swaps_changed_template_and_config(self) -> None:
+        config = self.fixtures / "bot.yaml"
+        config.write_text("default_confidence: 0.9\n", encoding="utf-8")
+        vision = Vision(str(self.templates), hot_reload=True, config_path=str(config), reload_interval_s=0)
+        screen = str(self.screens / "screen_with_home.png")
+        self.assertTrue(vision.exists(screen, "home.tela_home", threshold=0.88))
+        self.assertEqual(vision.roi_stats()["learned"], 1)
+
+        tela_home = self.templates / "home" / "tela_home.png"
+        tela_home.write_bytes((self.templates / "erros" / "app_crash.png").read_bytes())
+        config.write_text("default_confidence: 0.9\ntemplates_confidence:\n  home.botao_home: 0.5\n", encoding="utf-8")
+        self.assertFalse(vision.exists(screen, "home.tela_home", threshold=0.88))
+        self.assertEqual(vision.templates_confidence, {"home.botao_home": 0.5})
+        self.assertEqual(vision.roi_stats()["learned"], 0)
+        stats = vision.reload_stats()
+        self.assertEqual((stats["generation"], stats["templates_reloaded"], stats["config_reloads"]), (1, 1, 1))
+
+        tela_home.write_bytes(b"not a png")
+        self.assertFalse(vision.reload_if_changed())
+        self.assertEqual(vision.load_template("home.tela_home").shape[:2], (35, 100))
+        self.assertEqual(vision.reload_stats()["rejected"], 1)
+
+    def test_hot_reload_waits_for_running_match_and_warns_on_calibrated_thresholds(self) -> None:
+        config = self.fixtures / "bot.yaml"
+        config.write_text("default_confidence: 0.9\n", encoding="utf-8")
+        vision = Vision(
+            str(self.templates),
+            hot_reload=True,
+            config_path=str(config),
+            reload_interval_s=0,
+            calibrated_confidence={"home.tela_home": 0.95},
+        )
+        screen = str(self.screens / "screen_with_home.png")
+        vision.exists(screen, "home.tela_home")
+        config.write_text("default_confidence: 0.9\ntemplates_confidence:\n  home.tela_home: 0.5\n", encoding="utf-8")
+
+        # A match in progress on another thread holds the lock: the swap waits for it.
+        with vision._reload_lock:
+            reloader = threading.Thread(target=vision.reload_if_changed)
+            with self.assertLogs("bot.core.vision", level="WARNING") as logs:
+                reloader.start()
+                reloader.join(0.2)
+                self.assertTrue(reloader.is_alive())
+                self.assertEqual(vision.templates_confidence, {})
+        reloader.join(5)
+
+        self.assertEqual(vision.templates_confidence, {"home.tela_home": 0.5})
+        self.assertEqual(vision.reload_stats()["generation"], 1)
+        self.assertTrue(any("calibrated" in line for line in logs.output))
+        self.assertEqual(vision._resolve_threshold("home.tela_home", None), 0.95)
+
     def test_template_confidence_override(self) -> None:
         strict = Vision(
             str(self.templates),
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from bot.core.vision import cv2
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class VisionBenchTests(unittest.TestCase):
+    def test_small_run_writes_comparable_baseline(self) -> None:
+        from benchmarks.vision_bench import compare, main
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "baseline.json"
+            args = ["--resolutions", "320x180", "--templates", "2", "--repeats", "1", "--output", str(output)]
+            self.assertEqual(main(args), 0)
+            report = json.loads(output.read_text(encoding="utf-8"))
+
+        self.assertIn("320x180/find_best_frame", report["results"])
+        self.assertIn("opencv", report["meta"])
+        rows = compare(report, report)
+        self.assertTrue(rows)
+        self.assertTrue(all(ratio == 1.0 for *_, ratio in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import queue
+import tempfile
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from unittest import mock
+
+from bot.core.exceptions import SoftFail
+from bot.core.vision import cv2
+from bot.core.vision_server import RemoteVision, VisionClient, VisionRequest, VisionServer, start_vision_server
+from tests.support.mock_images import create_mock_fixture_tree
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class VisionServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.screens, self.templates = create_mock_fixture_tree(Path(self.temp_dir.name))
+        self.kwargs = {"templates_dir": str(self.templates)}
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _request(self, worker_id: int, screen: str, names: tuple[str, ...], **kwargs) -> VisionRequest:
+        frame = cv2.imread(str(self.screens / screen), cv2.IMREAD_COLOR)
+        return VisionRequest(
+            worker_id, 1, f"emu-{worker_id}", "match", names, 0.88, shape=frame.shape, inline=frame.tobytes(), **kwargs
+        )
+
+    def test_batch_groups_same_templates_and_keeps_first_hit_semantics(self) -> None:
+        server = VisionServer(self.kwargs)
+        names = ("home.tela_home", "home.botao_home")
+        batch = [
+            self._request(0, "screen_home_and_button.png", names, first_hit=True),
+            self._request(1, "screen_with_home_button.png", names),
+            self._request(2, "screen_blank.png", ("home.inexistente",)),
+        ]
+
+        replies = dict(server.handle_batch(batch))
+
+        self.assertEqual(list(replies[0][2]), ["home.tela_home"])
+        self.assertFalse(replies[1][2]["home.tela_home"]["matched"])
+        self.assertTrue(replies[1][2]["home.botao_home"]["matched"])
+        self.assertTrue(replies[2][1])
+        self.assertFalse(replies[2][2]["home.inexistente"]["matched"])
+        self.assertIn("Template not found", replies[2][2]["home.inexistente"]["error"])
+        self.assertEqual(server.counters["grouped"], 2)
+        self.assertEqual(sorted(server._visions), ["emu-0", "emu-1", "emu-2"])
+
+    def test_slot_frames_are_copied_before_matching(self) -> None:
+        frame = cv2.imread(str(self.screens / "screen_with_home.png"), cv2.IMREAD_COLOR)
+        slot = SharedMemory(create=True, size=frame.nbytes)
+        try:
+            slot.buf[: frame.nbytes] = frame.tobytes()
+            server = VisionServer({**self.kwargs, "color_prefilter": True, "match_backend": "fft"}, [slot.name])
+            request = VisionRequest(0, 1, "emu-0", "match", ("home.tela_home",), 0.88, shape=frame.shape)
+
+            replies = dict(server.handle_batch([request]))
+            self.assertTrue(replies[0][2]["home.tela_home"]["matched"])
+
+            # The worker reuses the slot for its next frame; frames the Vision
+            # kept (here the prefilter histogram cache) must not change with it.
+            slot.buf[: frame.nbytes] = bytes(frame.nbytes)
+            kept, _ = server._visions["emu-0"]._frame_histogram
+            self.assertTrue((kept == frame).all())
+
+            requests: queue.Queue = queue.Queue()
+            requests.put(None)
+            with mock.patch("bot.core.vision_server.flush_artifacts") as flush:
+                server.serve(requests, [queue.Queue()])
+            flush.assert_called_once()
+        finally:
+            slot.close()
+            slot.unlink()
+
+    def test_remote_vision_keeps_vision_api_over_shared_memory(self) -> None:
+        handle = start_vision_server(self.kwargs, workers=1, slot_bytes=1024 * 1024)
+        try:
+            vision = RemoteVision(handle.client(0, timeout_s=10), device_id="emu-0", **self.kwargs)
+            screen = str(self.screens / "screen_home_and_button.png")
+
+            self.assertTrue(vision.exists(screen, "home.tela_home", threshold=0.88))
+            self.assertFalse(vision.exists(screen, "erros.app_crash", threshold=0.88))
+            self.assertEqual(vision.classify(screen, ["erros.app_crash", "home.botao_home"]), "home.botao_home")
+            self.assertEqual(vision.find_best(screen, "home.tela_home")["top_left"], (160, 120))
+
+            stats = vision.remote_stats()
+            self.assertEqual(stats["client"]["requests"], 5)  # 4 matches + this stats call
+            self.assertEqual(stats["client"]["inline_frames"], 0)
+            self.assertGreaterEqual(stats["server"]["requests"], 4)
+            self.assertIn("home.tela_home", vision.template_stats())
+            # Matching stats come from the server-side Vision, not the idle local one.
+            self.assertGreater(vision.roi_stats()["full_frame"], 0)
+            vision.client.close()
+        finally:
+            handle.stop()
+
+    def test_server_benchmark_reports_both_models(self) -> None:
+        from benchmarks.vision_server_bench import run_server_benchmark
+
+        report = run_server_benchmark(workers=2, requests=2, resolution=(320, 180), templates_count=2)
+
+        self.assertEqual(report["per_process"]["requests"], 4)
+        self.assertGreater(report["server"]["requests_per_s"], 0)
+
+
+@unittest.skipIf(cv2 is None, "opencv-python não disponível no ambiente")
+class VisionClientSlotTests(unittest.TestCase):
+    def setUp(self) -> None:
+        import numpy as np
+
+        self.np = np
+        self.slot = SharedMemory(create=True, size=4096)
+        self.requests: queue.Queue = queue.Queue()
+        self.responses: queue.Queue = queue.Queue()
+        self.client = VisionClient(0, self.requests, self.responses, self.slot.name, self.slot.size, timeout_s=0.05)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.slot.close()
+        self.slot.unlink()
+
+    def _slot_value(self) -> int:
+        return int(self.slot.buf[0])
+
+    def _frame(self, value: int):
+        return self.np.full((8, 8, 3), value, dtype=self.np.uint8)
+
+    def test_timed_out_request_keeps_its_slot_until_the_late_reply(self) -> None:
+        with self.assertRaises(SoftFail):
+            self.client.call("match", "emu-0", self._frame(7), ("home.tela_home",))
+        late = self.requests.get_nowait()
+        self.assertIsNone(late.inline)
+
+        # Server still owes the late reply: the next frame must not overwrite the slot.
+        with self.assertRaises(SoftFail):
+            self.client.call("match", "emu-0", self._frame(8), ("home.tela_home",))
+        self.assertIsNotNone(self.requests.get_nowait().inline)
+        self.assertEqual(self._slot_value(), 7)
+
+        self.responses.put((late.request_id, True, {}))
+        self.responses.put((3, True, {"home.tela_home": {"matched": False}}))
+        result = self.client.call("match", "emu-0", self._frame(9), ("home.tela_home",))
+
+        self.assertEqual(result, {"home.tela_home": {"matched": False}})
+        self.assertIsNone(self.requests.get_nowait().inline)
+        self.assertEqual(self._slot_value(), 9)
+        self.assertEqual((self.client.counters["slot_busy"], self.client.counters["late_replies"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()